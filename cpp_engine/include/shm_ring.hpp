@@ -0,0 +1,54 @@
+#ifndef SHM_RING_HPP
+#define SHM_RING_HPP
+
+// Fixed-width integer types for the shared layout
+#include <cstdint>
+// Lock-free head/tail counters
+#include <atomic>
+using namespace std;
+
+// Memory layout of the single-producer/single-consumer ring buffer created by
+// integration/shared_memory.py (SharedMemoryIPC). Records are wire::TickRecord or
+// wire::SignalRecord from wire_protocol.hpp.
+//
+//   offset   0: ShmRingHeader (64 bytes)
+//   offset  64: head - total records written, owned by the producer
+//   offset 128: tail - total records read, owned by the consumer
+//   offset 192: record slots; record with sequence s lives in slot (s & (capacity - 1))
+//
+// Producer: write slots, then head.store(new_head, memory_order_release).
+// Consumer: head.load(memory_order_acquire), copy slots, then tail.store(new_tail, memory_order_release).
+// Free space is capacity - (head - tail); the ring is empty when head == tail.
+
+namespace shm {
+
+const uint32_t RING_MAGIC = 0x48465242; // "HFRB"
+const uint16_t RING_VERSION = 2;
+
+// record_type values (wire::MSG_TICK / wire::MSG_SIGNAL)
+const uint16_t RECORD_OTHER = 0;
+const uint16_t RECORD_TICK = 1;
+const uint16_t RECORD_SIGNAL = 2;
+
+struct ShmRingHeader {
+    uint32_t magic;
+    uint16_t version;
+    uint16_t record_size;
+    uint32_t capacity;      // power of two
+    uint16_t record_type;   // RECORD_TICK / RECORD_SIGNAL; check it (and record_size) on attach
+    uint8_t pad[50];
+};
+
+struct ShmRing {
+    ShmRingHeader header;
+    alignas(64) atomic<uint64_t> head;
+    alignas(64) atomic<uint64_t> tail;
+    alignas(64) unsigned char data[1]; // capacity * record_size bytes
+};
+
+static_assert(sizeof(ShmRingHeader) == 64, "ShmRingHeader layout mismatch");
+static_assert(sizeof(atomic<uint64_t>) == 8, "head/tail must be plain 8-byte counters");
+
+} // namespace shm
+
+#endif // SHM_RING_HPP
@@ -0,0 +1,66 @@
+#ifndef WIRE_PROTOCOL_HPP
+#define WIRE_PROTOCOL_HPP
+
+// Fixed-width integer types for the on-wire layout
+#include <cstdint>
+// memcmp for magic detection
+#include <cstring>
+using namespace std;
+
+// Binary wire format shared with integration/wire_protocol.py.
+// All fields are little-endian. A datagram is one WireHeader followed by
+// `count` records of `record_size` bytes. Datagrams that do not start with
+// the "HF" magic are JSON (the fallback encoding).
+
+namespace wire {
+
+const uint8_t VERSION = 1;
+const uint8_t MSG_TICK = 1;
+const uint8_t MSG_SIGNAL = 2;
+
+// Signal action codes
+const uint8_t ACTION_SELL = 0;
+const uint8_t ACTION_HOLD = 1;
+const uint8_t ACTION_BUY = 2;
+
+#pragma pack(push, 1)
+struct WireHeader {
+    char magic[2];          // "HF"
+    uint8_t version;        // VERSION
+    uint8_t msg_type;       // MSG_TICK / MSG_SIGNAL
+    uint16_t count;         // number of records in this datagram
+    uint16_t record_size;   // sizeof(TickRecord) / sizeof(SignalRecord)
+};
+
+struct TickRecord {
+    uint64_t seq;           // per-sender sequence number
+    int64_t ts_ns;          // exchange timestamp, ns since epoch
+    double price;
+    double volume;
+    uint32_t symbol_id;     // CRC-32 of the upper-case symbol
+    uint32_t flags;
+};
+
+struct SignalRecord {
+    uint64_t seq;
+    int64_t ts_ns;
+    double price;
+    double quantity;
+    uint32_t symbol_id;
+    uint8_t action;         // ACTION_*
+    uint8_t pad[3];
+};
+#pragma pack(pop)
+
+static_assert(sizeof(WireHeader) == 8, "WireHeader layout mismatch");
+static_assert(sizeof(TickRecord) == 40, "TickRecord layout mismatch");
+static_assert(sizeof(SignalRecord) == 40, "SignalRecord layout mismatch");
+
+// True if the buffer holds a binary datagram (otherwise treat as JSON).
+inline bool isBinary(const char* buf, int len) {
+    return len >= (int)sizeof(WireHeader) && memcmp(buf, "HF", 2) == 0;
+}
+
+} // namespace wire
+
+#endif // WIRE_PROTOCOL_HPP
@@ -0,0 +1,183 @@
+# asyncio counterpart of LiveDataLoader.
+# One event loop can multiplex hundreds of symbol streams: the source reads the
+# combined websocket stream and fans ticks out to per-symbol asyncio queues.
+# LocalFeedServer is a stand-in for the Binance endpoint so everything can be
+# exercised without network access.
+
+import asyncio
+import json
+import random
+import time
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# Faster JSON parser when available
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+BINANCE_URL = "wss://stream.binance.com:9443/stream?streams={streams}"
+
+
+def _require_websockets():
+    if websockets is None:
+        raise ImportError("The asyncio feed requires the 'websockets' package (pip install websockets)")
+
+
+class AsyncTickSource:
+    def __init__(self, symbols=None, url=None, queue_size=10_000, conflate=False):
+        # :param url: Stream URL; defaults to the Binance combined trade stream for symbols.
+        # :param queue_size: Capacity of each subscriber queue.
+        # :param conflate: When a subscriber queue is full, drop its oldest tick instead of
+        #                  pausing the reader (the reader never blocks on a slow consumer).
+        if symbols is None:
+            symbols = ["btcusdt", "ethusdt", "solusdt"]
+        self.symbols = [s.lower() for s in symbols]
+        streams = "/".join(f"{s}@trade" for s in self.symbols)
+        self.url = url or BINANCE_URL.format(streams=streams)
+        self.queue_size = queue_size
+        self.conflate = conflate
+        self._subscribers = {}   # symbol (upper) or None -> list of queues
+        self._ws = None
+        self._running = False
+        self.stats = {"frames": 0, "decode_errors": 0, "dropped": 0}
+
+    def subscribe(self, symbol: str | None = None) -> asyncio.Queue:
+        # Queue of tick dicts for one symbol, or for every symbol if None.
+        queue = asyncio.Queue(self.queue_size)
+        key = None if symbol is None else symbol.upper()
+        self._subscribers.setdefault(key, []).append(queue)
+        return queue
+
+    @staticmethod
+    def decode(message):
+        data = _loads(message)
+        # Combined streams wrap payload in "data"
+        payload = data.get("data", data) if isinstance(data, dict) else data
+        if not isinstance(payload, dict):
+            raise ValueError(f"Unexpected frame: {type(payload).__name__}")
+        return {
+            "symbol": payload["s"],
+            "price": float(payload["p"]),
+            "volume": float(payload["q"]),
+            "timestamp": float(payload["T"]),
+        }
+
+    async def _publish(self, tick):
+        for key in (tick["symbol"], None):
+            for queue in self._subscribers.get(key, ()):
+                if self.conflate and queue.full():
+                    queue.get_nowait()
+                    self.stats["dropped"] += 1
+                await queue.put(tick)
+
+    async def run(self):
+        # Read frames until stop() is called or the server closes the stream.
+        _require_websockets()
+        self._running = True
+        async with websockets.connect(self.url, max_queue=None) as ws:
+            self._ws = ws
+            print(f"[INFO] Async feed connected to {self.url}")
+            async for message in ws:
+                self.stats["frames"] += 1
+                try:
+                    tick = self.decode(message)
+                except (ValueError, KeyError, TypeError):
+                    self.stats["decode_errors"] += 1
+                    continue
+                await self._publish(tick)
+                if not self._running:
+                    break
+        self._ws = None
+
+    async def stop(self):
+        self._running = False
+        if self._ws is not None:
+            await self._ws.close()
+
+
+class LocalFeedServer:
+    # Local websocket server that emits Binance-style combined-stream trade frames
+    # for a random walk per symbol. Use as the url of AsyncTickSource in tests.
+    def __init__(self, symbols, host="127.0.0.1", port=8765, rate=1000.0, duration=None, seed=0):
+        # :param rate: Frames per second per connection, across all symbols.
+        # :param duration: Seconds after which the server closes each stream (None = forever).
+        self.symbols = [s.upper() for s in symbols]
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.duration = duration
+        self.seed = seed
+        self._server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/stream"
+
+    async def _handler(self, ws, *args):
+        rng = random.Random(self.seed)
+        prices = {s: 100.0 + 10 * i for i, s in enumerate(self.symbols)}
+        interval = 1.0 / self.rate
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        n = 0
+        while self.duration is None or loop.time() - start < self.duration:
+            symbol = self.symbols[n % len(self.symbols)]
+            prices[symbol] *= 1.0 + rng.gauss(0.0, 1e-4)
+            frame = {
+                "stream": f"{symbol.lower()}@trade",
+                "data": {"e": "trade", "s": symbol, "p": f"{prices[symbol]:.2f}",
+                         "q": f"{rng.uniform(0.001, 1.0):.6f}", "T": int(time.time() * 1000)},
+            }
+            await ws.send(json.dumps(frame))
+            n += 1
+            # Absolute deadlines keep the emitted rate from drifting
+            delay = start + n * interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await ws.close()
+
+    async def start(self):
+        _require_websockets()
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        print(f"[INFO] Local feed server on {self.url}")
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+# Example usage: 200 synthetic symbols through one event loop
+if __name__ == "__main__":
+    async def main():
+        symbols = [f"SYM{i:03d}USDT" for i in range(200)]
+        server = await LocalFeedServer(symbols, rate=20_000, duration=3.0).start()
+        source = AsyncTickSource(symbols, url=server.url)
+        counts = {s: 0 for s in symbols}
+
+        async def consume(symbol):
+            queue = source.subscribe(symbol)
+            while True:
+                tick = await queue.get()
+                counts[tick["symbol"]] += 1
+
+        consumers = [asyncio.create_task(consume(s)) for s in symbols]
+        await source.run()
+        for task in consumers:
+            task.cancel()
+        await server.stop()
+        print(f"[INFO] {sum(counts.values()):,} ticks across {len(symbols)} symbols | {source.stats}")
+
+    asyncio.run(main())
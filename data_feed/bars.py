@@ -0,0 +1,192 @@
+# Streaming and vectorised bar aggregation (time, tick, volume and dollar bars).
+# BarBuilder updates in O(1) per tick for live feeds; build_bars produces the same
+# bars from stored tick arrays in a single vectorised pass.
+#
+# Bar rules (shared by both paths):
+#   time   - one bar per interval bucket (ts // interval); a tick in a new bucket starts a new bar
+#   tick   - every `threshold` ticks
+#   volume - closes on the tick where cumulative volume first reaches the next multiple of threshold
+#   dollar - as volume, on cumulative price * volume
+# Thresholds for volume/dollar bars are applied to the running total since the first
+# tick, so an overshooting tick does not shift every later boundary.
+
+import numpy as np
+import pandas as pd
+
+BAR_KINDS = ("time", "tick", "volume", "dollar")
+BAR_FIELDS = ["start_ts", "end_ts", "open", "high", "low", "close", "volume", "dollar", "vwap", "count"]
+
+
+def _threshold(kind, threshold):
+    if kind not in BAR_KINDS:
+        raise ValueError(f"Unknown bar kind: {kind}")
+    if kind == "time" and not isinstance(threshold, (int, np.integer)):
+        # Accept "1s", "5min", pd.Timedelta, ...
+        threshold = pd.Timedelta(threshold).value
+    if threshold <= 0:
+        raise ValueError("threshold must be positive")
+    return threshold
+
+
+class BarBuilder:
+    def __init__(self, kind: str = "time", threshold=1_000_000_000):
+        # :param kind: "time", "tick", "volume" or "dollar".
+        # :param threshold: Interval (ns or a pandas offset like "1s") for time bars,
+        #                   ticks per bar, volume per bar or notional per bar.
+        self.kind = kind
+        self.threshold = _threshold(kind, threshold)
+        self._cum = 0.0       # running volume / dollar total since the first tick
+        self._level = 0       # index of the current volume/dollar bucket
+        self._bar = None
+
+    def _new_bar(self, ts, price):
+        self._bar = {"start_ts": ts, "end_ts": ts, "open": price, "high": price, "low": price,
+                     "close": price, "volume": 0.0, "dollar": 0.0, "count": 0}
+        if self.kind == "time":
+            self._bucket = ts // self.threshold
+
+    def _finish(self):
+        bar = self._bar
+        self._bar = None
+        bar["vwap"] = bar["dollar"] / bar["volume"] if bar["volume"] > 0 else bar["close"]
+        return bar
+
+    def update(self, ts: int, price: float, volume: float):
+        # Add one tick. :return: the completed bar (dict) if this tick closed one, else None.
+        done = None
+        if self._bar is not None and self.kind == "time" and ts // self.threshold != self._bucket:
+            done = self._finish()
+        if self._bar is None:
+            self._new_bar(ts, price)
+
+        bar = self._bar
+        bar["end_ts"] = ts
+        if price > bar["high"]:
+            bar["high"] = price
+        if price < bar["low"]:
+            bar["low"] = price
+        bar["close"] = price
+        bar["volume"] += volume
+        bar["dollar"] += price * volume
+        bar["count"] += 1
+
+        if self.kind == "tick":
+            if bar["count"] >= self.threshold:
+                done = self._finish()
+        elif self.kind in ("volume", "dollar"):
+            self._cum += volume if self.kind == "volume" else price * volume
+            level = int(self._cum // self.threshold)
+            if level > self._level:
+                self._level = level
+                done = self._finish()
+        return done
+
+    def update_tick(self, tick: dict):
+        # Convenience for LiveDataLoader callbacks (timestamp in epoch ms).
+        return self.update(int(tick["timestamp"] * 1_000_000), tick["price"], tick.get("volume", tick.get("quantity", 0.0)))
+
+    def flush(self):
+        # Close and return the in-progress bar (None if empty).
+        return self._finish() if self._bar is not None else None
+
+
+class BarAggregator:
+    # One BarBuilder per symbol for a multi-symbol tick stream (e.g. LiveDataLoader
+    # or JournalReplaySource); completed bars are passed to on_bar(symbol, bar).
+    def __init__(self, kind: str = "time", threshold=1_000_000_000, on_bar=None):
+        self.kind = kind
+        self.threshold = threshold
+        self.on_bar = on_bar
+        self.builders = {}
+
+    def record(self, tick: dict):
+        builder = self.builders.get(tick["symbol"])
+        if builder is None:
+            builder = self.builders[tick["symbol"]] = BarBuilder(self.kind, self.threshold)
+        bar = builder.update_tick(tick)
+        if bar is not None and self.on_bar is not None:
+            self.on_bar(tick["symbol"], bar)
+        return bar
+
+    def attach(self, loader):
+        loader.register_callback(self.record)
+        return self
+
+    def flush(self):
+        # Close every in-progress bar; returns {symbol: bar}.
+        bars = {s: b.flush() for s, b in self.builders.items()}
+        return {s: bar for s, bar in bars.items() if bar is not None}
+
+
+def build_bars(timestamps_ns, prices, volumes, kind: str = "time", threshold=1_000_000_000,
+               include_partial: bool = True) -> pd.DataFrame:
+    # Vectorised equivalent of feeding every tick through BarBuilder (plus flush() if
+    # include_partial). Accepts tick store columns directly.
+    threshold = _threshold(kind, threshold)
+    ts = np.asarray(timestamps_ns, dtype=np.int64)
+    price = np.asarray(prices, dtype=np.float64)
+    vol = np.asarray(volumes, dtype=np.float64)
+    n = len(price)
+    if n == 0:
+        return pd.DataFrame(columns=BAR_FIELDS)
+
+    complete_last = False
+    if kind == "time":
+        bucket = ts // threshold
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    elif kind == "tick":
+        starts = np.arange(0, n, threshold)
+        complete_last = n % threshold == 0
+    else:
+        flow = vol if kind == "volume" else price * vol
+        # np.cumsum accumulates left to right, exactly like the streaming running total
+        level = np.floor_divide(np.cumsum(flow), threshold).astype(np.int64)
+        closes = np.flatnonzero(np.diff(np.concatenate(([0], level))) > 0)
+        starts = np.concatenate(([0], closes[closes < n - 1] + 1))
+        complete_last = len(closes) > 0 and closes[-1] == n - 1
+
+    ends = np.concatenate((starts[1:], [n]))
+    dollar_flow = price * vol
+    volume = np.add.reduceat(vol, starts)
+    dollar = np.add.reduceat(dollar_flow, starts)
+    close = price[ends - 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = np.where(volume > 0, dollar / volume, close)
+
+    bars = pd.DataFrame({
+        "start_ts": ts[starts],
+        "end_ts": ts[ends - 1],
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": close,
+        "volume": volume,
+        "dollar": dollar,
+        "vwap": vwap,
+        "count": ends - starts,
+    })
+    if not include_partial and not complete_last:
+        bars = bars.iloc[:-1]
+    return bars
+
+
+def bars_to_frame(bars) -> pd.DataFrame:
+    # Collect streaming bars (list of dicts) into the same frame layout as build_bars.
+    return pd.DataFrame(list(bars), columns=BAR_FIELDS)
+
+
+# Example Usage
+if __name__ == "__main__":
+    from data_feed.tick_store import load_columns
+
+    cols = load_columns("data_feed/raw_data/btc_usdt.csv")
+    for kind, threshold in [("time", "10s"), ("tick", 7), ("volume", 1.0), ("dollar", 25_000.0)]:
+        batch = build_bars(cols["timestamp"], cols["price"], cols["volume"], kind, threshold)
+
+        builder = BarBuilder(kind, threshold)
+        streamed = [b for b in (builder.update(t, p, v) for t, p, v in zip(cols["timestamp"].tolist(), cols["price"].tolist(), cols["volume"].tolist())) if b]
+        last = builder.flush()
+        streamed = bars_to_frame(streamed + ([last] if last else []))
+
+        same = len(batch) == len(streamed) and np.allclose(batch.to_numpy(float), streamed.to_numpy(float), rtol=1e-12)
+        print(f"[INFO] {kind:<6} bars: {len(batch):>3} from {len(cols['price'])} ticks | stream/batch parity: {same}")
@@ -14,20 +14,57 @@ import numpy as np
 # Ensure project root is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from data_feed.pipeline import BoundedQueue
+
+# Faster JSON parser when available
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
 
 class LiveDataLoader:
-    def __init__(self, symbols=None):
+    def __init__(self, symbols=None, pipelined=True, policy="block", raw_queue_size=100_000, dispatch_queue_size=10_000,
+                 per_symbol_dispatch=False):
+        # :param pipelined: Receive, decode and dispatch on separate threads. If False,
+        #                   callbacks run inline on the websocket thread (legacy behaviour).
+        #                   Either way callbacks are called from one thread at a time.
+        # :param per_symbol_dispatch: Opt-in: one dispatcher thread per symbol, so a slow
+        #                   callback only delays its own symbol. Callbacks registered for
+        #                   several symbols then run concurrently with themselves and must
+        #                   be thread-safe (a shared LSTMPredictor is not).
+        # :param policy: Backpressure for the per-symbol dispatch queues:
+        #                "block", "drop_oldest" or "conflate" (latest tick per symbol only).
+        # :param raw_queue_size: Capacity of the raw frame queue (always blocking, so frames are never lost).
+        # :param dispatch_queue_size: Capacity of each per-symbol dispatch queue.
         if symbols is None:
             symbols = ["btcusdt", "ethusdt", "solusdt"]
         self.symbols = [s.lower() for s in symbols]
         self.ws = None
         self.callbacks = []
 
-    def _on_message(self, ws, message):
-        data = json.loads(message)
+        self.pipelined = pipelined
+        self.policy = policy
+        self.dispatch_queue_size = dispatch_queue_size
+        self.raw_queue = BoundedQueue(raw_queue_size, "block")
+        self.dispatch_queues = {}
+        self._threads = []
+        self._decoder = None
+        self._lock = threading.Lock()
+        self.per_symbol_dispatch = per_symbol_dispatch
+        self._stopped = False
+        self.decode_errors = 0
+        self.callback_errors = 0
+
+    def _decode(self, message):
+        data = _loads(message)
 
         # Combined streams wrap payload in "data"
-        payload = data.get("data", data)
+        payload = data.get("data", data) if isinstance(data, dict) else data
+        if not isinstance(payload, dict):
+            raise ValueError(f"Unexpected frame: {type(payload).__name__}")
 
         tick = {
             "symbol": payload["s"],       # e.g. BTCUSDT
@@ -35,9 +72,79 @@ class LiveDataLoader:
             "volume": float(payload["q"]),# trade volume
             "timestamp": float(payload["T"])
         }
+        return tick
 
+    def _dispatch(self, tick):
+        # A failing callback must not take the dispatcher down: with "block" queues a dead
+        # dispatcher would back up the decoder and then the websocket thread.
         for cb in self.callbacks:
-            cb(tick)
+            try:
+                cb(tick)
+            except Exception as exc:
+                self.callback_errors += 1
+                if self.callback_errors <= 10 or self.callback_errors % 1000 == 0:
+                    print(f"[ERROR] Callback {getattr(cb, '__name__', cb)} failed on {tick.get('symbol')} "
+                          f"({self.callback_errors} failures so far): {exc!r}")
+
+    def _on_message(self, ws, message):
+        if self.pipelined:
+            # Receive stage: enqueue the raw frame and return to the socket immediately
+            self.raw_queue.put(message)
+            return
+        self._dispatch(self._decode(message))
+
+    # Pipeline stages
+    def _decode_loop(self):
+        while True:
+            message = self.raw_queue.get()
+            if message is None:
+                break
+            try:
+                tick = self._decode(message)
+            except (ValueError, KeyError, TypeError):
+                self.decode_errors += 1
+                continue
+            queue = self._queue_for(tick["symbol"])
+            if queue is None:
+                break
+            queue.put(tick, key=tick["symbol"])
+
+    def _queue_for(self, symbol):
+        # Dispatch queue for symbol (one shared queue unless per_symbol_dispatch); None once stopped.
+        name = symbol if self.per_symbol_dispatch else "all"
+        queue = self.dispatch_queues.get(name)
+        if queue is None:
+            with self._lock:
+                if self._stopped:
+                    return None
+                queue = self.dispatch_queues.get(name)
+                if queue is None:
+                    queue = BoundedQueue(self.dispatch_queue_size, self.policy)
+                    self.dispatch_queues[name] = queue
+                    self._spawn(self._dispatch_loop, queue)
+        return queue
+
+    def _dispatch_loop(self, queue):
+        while True:
+            tick = queue.get()
+            if tick is None:
+                break
+            self._dispatch(tick)
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def metrics(self):
+        # Queue depth, drops/conflations and queueing lag for every stage.
+        return {
+            "raw": self.raw_queue.metrics(),
+            "decode_errors": self.decode_errors,
+            "callback_errors": self.callback_errors,
+            "dispatch": {sym: q.metrics() for sym, q in list(self.dispatch_queues.items())},
+        }
 
     def _on_error(self, ws, error):
         print(f"[ERROR] WebSocket error: {error}")
@@ -48,7 +155,13 @@ class LiveDataLoader:
     def _on_open(self, ws):
         print("[INFO] WebSocket connection established")
 
+    def _start_pipeline(self):
+        if self.pipelined and self._decoder is None:
+            self._decoder = self._spawn(self._decode_loop)
+
     def start(self):
+        self._start_pipeline()
+
         # Build combined stream URL
         streams = "/".join([f"{s}@trade" for s in self.symbols])
         url = f"wss://stream.binance.com:9443/stream?streams={streams}"
@@ -69,6 +182,16 @@ class LiveDataLoader:
     def stop(self):
         if self.ws:
             self.ws.close()
+        # Drain what was already received, then let the stage threads exit
+        self.raw_queue.close()
+        if self._decoder:
+            self._decoder.join(timeout=1.0)
+        with self._lock:
+            # A decoder still running past the join can no longer create queues or threads
+            self._stopped = True
+            queues = list(self.dispatch_queues.values())
+        for queue in queues:
+            queue.close()
 
 
 # === Example usage with lightweight live metrics ===
@@ -110,6 +233,7 @@ if __name__ == "__main__":
     time.sleep(60)
     loader.stop()
     print("[INFO] Stopped after 60 seconds.")
+    print("[INFO] Pipeline metrics:", loader.metrics())
 
     # Plot equity curves for each symbol
     plt.figure(figsize=(10, 6))
@@ -0,0 +1,103 @@
+# Bounded queues with backpressure policies for the staged feed pipeline.
+# Used by LiveDataLoader to decouple frame reception, decoding and callback dispatch.
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+POLICIES = ("block", "drop_oldest", "conflate")
+
+
+class BoundedQueue:
+    # Thread-safe FIFO with a fixed capacity and a policy for when it is full:
+    #   "block"       - producer waits for space (backpressure reaches the source)
+    #   "drop_oldest" - evict the oldest queued item
+    #   "conflate"    - keep only the latest item per key; a new key on a full
+    #                   queue evicts the oldest key
+    # Tracks depth, drops/conflations and queueing lag (enqueue -> dequeue).
+    def __init__(self, maxsize: int = 10_000, policy: str = "block"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items = OrderedDict() if policy == "conflate" else deque()
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"enqueued": 0, "dequeued": 0, "dropped": 0, "conflated": 0,
+                      "max_depth": 0, "lag_ns_total": 0, "lag_ns_max": 0}
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item, key=None) -> bool:
+        # :return: False if the queue is closed.
+        now = time.perf_counter_ns()
+        with self._cond:
+            if self._closed:
+                return False
+            if self.policy == "conflate":
+                if key in self._items:
+                    # Replace the pending value but keep its original enqueue time and position
+                    enq_ns, _ = self._items[key]
+                    self._items[key] = (enq_ns, item)
+                    self.stats["conflated"] += 1
+                    return True
+                if len(self._items) >= self.maxsize:
+                    self._items.popitem(last=False)
+                    self.stats["dropped"] += 1
+                self._items[key] = (now, item)
+            else:
+                if len(self._items) >= self.maxsize:
+                    if self.policy == "block":
+                        while len(self._items) >= self.maxsize and not self._closed:
+                            self._cond.wait()
+                        if self._closed:
+                            return False
+                    else:
+                        self._items.popleft()
+                        self.stats["dropped"] += 1
+                self._items.append((now, item))
+            self.stats["enqueued"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float | None = None):
+        # :return: Next item, or None once the queue is closed and empty (or on timeout).
+        with self._cond:
+            while not self._items:
+                if self._closed:
+                    return None
+                if not self._cond.wait(timeout):
+                    return None
+            if self.policy == "conflate":
+                _, (enq_ns, item) = self._items.popitem(last=False)
+            else:
+                enq_ns, item = self._items.popleft()
+            lag = time.perf_counter_ns() - enq_ns
+            self.stats["dequeued"] += 1
+            self.stats["lag_ns_total"] += lag
+            self.stats["lag_ns_max"] = max(self.stats["lag_ns_max"], lag)
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            s = dict(self.stats)
+            depth = len(self._items)
+        dequeued = max(s["dequeued"], 1)
+        return {
+            "depth": depth,
+            "max_depth": s["max_depth"],
+            "enqueued": s["enqueued"],
+            "dropped": s["dropped"],
+            "conflated": s["conflated"],
+            "avg_lag_ms": s["lag_ns_total"] / dequeued / 1e6,
+            "max_lag_ms": s["lag_ns_max"] / 1e6,
+        }
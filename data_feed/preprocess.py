@@ -1,24 +1,92 @@
 # Data Cleaning
 
+import shutil
+import time
+from pathlib import Path
+
 import pandas as pd
 
+# Raw exchange column names -> simulator column names
+COLUMN_MAP = {
+    "time" : "timestamp",
+    "symbol" : "symbol",
+    "price" : "price",
+    "qty" : "volume"
+}
+
+def clean_chunk(df):
+    # Basic Cleaning
+    df = df.dropna()
+    df = df.rename(columns=COLUMN_MAP)
+    return df
+
 def preprocess_tick_data(input_path, output_path):
     df = pd.read_csv(input_path)
-    
-    # Basic Cleaning
-    df.dropna(inplace=True)
-    df = df.rename(columns= {
-        "time" : "timestamp",
-        "symbol" : "symbol",
-        "price" : "price",
-        "qty" : "volume"
-    })
-    
+
+    df = clean_chunk(df)
+
     # Optional: filter for specific symbol or time range
     df = df[df["symbol"] == "BTCUSDT"]
-    
+
     df.to_csv(output_path, index=False)
     print(f"Preprocessed data saved to {output_path}")
 
+def preprocess_tick_stream(input_path, output_dir, symbols=None, chunksize=500_000, report_every=10):
+    # Out-of-core preprocessing: reads the raw CSV in bounded chunks, cleans each chunk
+    # and fans rows out to one CSV per symbol in a single pass. Memory is bounded by chunksize
+    # regardless of file size or symbol count.
+    # :param symbols: Optional iterable of symbols to keep (default: all symbols).
+    # :param report_every: Print progress every N chunks.
+    # :return: Dict with rows read/written, per-symbol counts and rows/sec.
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    keep = None if symbols is None else {s.upper() for s in symbols}
+
+    outputs = {}   # symbol -> open file handle
+    counts = {}
+    rows_in = 0
+    start = time.perf_counter()
+
+    try:
+        for n, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize), start=1):
+            rows_in += len(chunk)
+            chunk = clean_chunk(chunk)
+            if keep is not None:
+                chunk = chunk[chunk["symbol"].isin(keep)]
+
+            for symbol, group in chunk.groupby("symbol", sort=False):
+                f = outputs.get(symbol)
+                if f is None:
+                    f = open(output_dir / f"{str(symbol).lower()}.csv", "w", newline="", encoding="utf-8")
+                    outputs[symbol] = f
+                    group.to_csv(f, index=False)
+                else:
+                    group.to_csv(f, index=False, header=False)
+                counts[symbol] = counts.get(symbol, 0) + len(group)
+
+            if n % report_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"[INFO] {rows_in:,} rows read | {rows_in / elapsed:,.0f} rows/sec")
+    finally:
+        for f in outputs.values():
+            f.close()
+
+    elapsed = time.perf_counter() - start
+    rows_out = sum(counts.values())
+    rate = rows_in / elapsed if elapsed > 0 else float("inf")
+    print(f"[INFO] Preprocessed {rows_in:,} rows -> {rows_out:,} rows across {len(counts)} symbols "
+          f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return {
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "symbols": counts,
+        "elapsed": elapsed,
+        "rows_per_sec": rate,
+    }
+
 if __name__ == "__main__":
-    preprocess_tick_data("raw_data/raw_ticks.csv", "raw_data/btc_usdt.csv")
\ No newline at end of file
+    stats = preprocess_tick_stream("raw_data/raw_ticks.csv", "raw_data/by_symbol")
+    # Training, backtests and walk-forward read the BTCUSDT ticks from raw_data/btc_usdt.csv
+    if "BTCUSDT" in stats["symbols"]:
+        shutil.copyfile("raw_data/by_symbol/btcusdt.csv", "raw_data/btc_usdt.csv")
+        print("Preprocessed data saved to raw_data/btc_usdt.csv")
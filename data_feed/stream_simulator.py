@@ -1,31 +1,207 @@
 # Real-time feed emulator
 
 import pandas as pd
+import numpy as np
 import time
 import socket
-import json
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_feed.tick_store import load_frame
+from integration.wire_protocol import WireCodec, ENCODING_JSON
+
+
+def wait_until(deadline_ns, spin_ns=200_000):
+    # Sleep until shortly before deadline_ns (perf_counter_ns clock), then busy-spin
+    # the remainder: time.sleep alone overshoots by up to a scheduler quantum.
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > spin_ns:
+        time.sleep((remaining - spin_ns) / 1e9)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+
+class ReplayEngine:
+    # Paces the emission of n pre-encoded ticks.
+    # Modes:
+    #   "fast"     - as fast as possible, in batches of batch_size
+    #   "realtime" - honour recorded timestamp deltas, scaled by speed (2.0 = twice as fast)
+    #   "rate"     - fixed target rate in ticks/sec
+    # Deadlines are absolute offsets from the start of the run, so a late tick never
+    # pushes back the ones after it; ticks that are already due are emitted together.
+    MODES = ("fast", "realtime", "rate")
+
+    def __init__(self, mode="fast", timestamps_ns=None, speed=1.0, rate=None, batch_size=4096, spin_ns=200_000):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if mode == "realtime" and timestamps_ns is None:
+            raise ValueError("realtime mode requires timestamps_ns")
+        if mode == "rate" and not rate:
+            raise ValueError("rate mode requires rate > 0")
+        self.mode = mode
+        self.timestamps_ns = None if timestamps_ns is None else np.asarray(timestamps_ns, dtype=np.int64)
+        self.speed = speed
+        self.rate = rate
+        self.batch_size = batch_size
+        self.spin_ns = spin_ns
+        self._running = False
+
+    def schedule(self, n):
+        # Emission offsets (ns from start) for each tick, or None in fast mode.
+        if self.mode == "realtime":
+            ts = self.timestamps_ns[:n]
+            if n == 0:
+                return ts
+            # Clamp out-of-order timestamps so deadlines never go backwards
+            return (np.maximum.accumulate(ts - ts[0]) / self.speed).astype(np.int64)
+        if self.mode == "rate":
+            return (np.arange(n, dtype=np.float64) * (1e9 / self.rate)).astype(np.int64)
+        return None
+
+    def stop(self):
+        self._running = False
+
+    def run(self, n, emit):
+        # Call emit(start, stop) for consecutive slices covering ticks [0, n).
+        # :return: Dict with ticks sent, elapsed seconds, achieved ticks/sec and max lag.
+        offsets = self.schedule(n)
+        max_lag_ns = 0
+        sent = 0
+        self._running = True
+        t0 = time.perf_counter_ns()
+
+        while sent < n and self._running:
+            if offsets is None:
+                stop = min(sent + self.batch_size, n)
+            else:
+                due = t0 + offsets[sent]
+                if time.perf_counter_ns() < due:
+                    wait_until(due, self.spin_ns)
+                now = time.perf_counter_ns() - t0
+                max_lag_ns = max(max_lag_ns, now - offsets[sent])
+                # Everything already due goes out in this slice
+                stop = min(int(np.searchsorted(offsets, now, side="right")), sent + self.batch_size, n)
+                stop = max(stop, sent + 1)
+            emit(sent, stop)
+            sent = stop
+
+        elapsed = (time.perf_counter_ns() - t0) / 1e9
+        self._running = False
+        return {
+            "mode": self.mode,
+            "ticks": sent,
+            "elapsed": elapsed,
+            "ticks_per_sec": sent / elapsed if elapsed > 0 else float("inf"),
+            "max_lag_ms": max_lag_ns / 1e6,
+        }
+
+
+def _json_numbers(values: pd.Series) -> pd.Series:
+    # Number column -> the text json.dumps writes for each value (ints stay ints).
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype(str)
+    # numpy's float -> str is the shortest round-trip repr, like json; only non-finite differ
+    text = pd.Series(values.to_numpy(np.float64).astype(str), index=values.index)
+    return text.replace({"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"})
+
+
+def _timestamp_text(ts: pd.Series) -> pd.Series:
+    # Same text as str(pd.Timestamp): fractional seconds only when present (6 or 9 digits).
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        return ts.astype(str)
+    us, ns = ts.dt.microsecond, ts.dt.nanosecond
+    frac = np.where(ns != 0, "." + (us * 1000 + ns).astype(str).str.zfill(9),
+                    np.where(us != 0, "." + us.astype(str).str.zfill(6), ""))
+    return ts.dt.strftime("%Y-%m-%d %H:%M:%S") + frac
+
+
+def encode_json_batch(df):
+    # Vectorised JSON encoding of a [timestamp, symbol, price, volume] frame.
+    # Produces the same text as json.dumps(tick) per row, without a per-row dict.
+    ts = _timestamp_text(df["timestamp"])
+    sym = df["symbol"].astype(str)
+    price = _json_numbers(df["price"])
+    volume = _json_numbers(df["volume"])
+    text = '{"timestamp": "' + ts + '", "symbol": "' + sym + '", "price": ' + price + ', "volume": ' + volume + '}'
+    return [m.encode("utf-8") for m in text.tolist()]
+
 
 class MarketDataStreamer:
-    def __init__(self, data_path, interval_ms=100):
-        self.data = pd.read_csv(data_path)
+    def __init__(self, data_path, interval_ms=100, mode=None, speed=1.0, rate=None, batch_size=4096, encoding=ENCODING_JSON):
+        # :param interval_ms: Legacy fixed spacing between ticks; 0 means as fast as possible.
+        # :param mode: "fast", "realtime" or "rate" (default derived from interval_ms).
+        # :param speed: Speed multiplier for realtime mode.
+        # :param rate: Target ticks/sec for rate mode.
+        # :param encoding: "json" (one tick per datagram) or "binary" (ticks due together share datagrams).
+        self.data = load_frame(data_path)
         # Convert to seconds
-        self.interval = interval_ms / 1000.0 
+        self.interval = interval_ms / 1000.0
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         # C++ engine listener
-        self.target = ("localhost", 9999) 
-        
+        self.target = ("localhost", 9999)
+
+        if mode is None:
+            mode = "rate" if interval_ms > 0 else "fast"
+        if mode == "rate" and rate is None:
+            # interval_ms=0 leaves no rate to derive; ReplayEngine rejects it
+            rate = 1.0 / self.interval if self.interval > 0 else None
+        self.codec = WireCodec(encoding)
+        timestamps_ns = None
+        if mode == "realtime" or self.codec.binary:
+            timestamps_ns = pd.to_datetime(self.data["timestamp"]).to_numpy("datetime64[ns]").astype(np.int64)
+        if self.codec.binary:
+            # Column arrays the binary records are packed from
+            symbols = self.data["symbol"].astype(str)
+            ids = {s: self.codec.symbols.register(s) for s in symbols.unique()}
+            self._columns = (
+                timestamps_ns,
+                symbols.map(ids).to_numpy(np.uint32),
+                self.data["price"].to_numpy(np.float64),
+                self.data["volume"].to_numpy(np.float64),
+            )
+        self.engine = ReplayEngine(mode, timestamps_ns=timestamps_ns, speed=speed, rate=rate, batch_size=batch_size)
+        self.batch_size = batch_size
+        self._block_start = -1
+        self._block = []
+
+    def _encoded(self, start, stop):
+        # Ticks are encoded a block at a time, ahead of when they are sent.
+        out = []
+        i = start
+        while i < stop:
+            block_start = (i // self.batch_size) * self.batch_size
+            if block_start != self._block_start:
+                self._block = encode_json_batch(self.data.iloc[block_start:block_start + self.batch_size])
+                self._block_start = block_start
+            j = min(stop, block_start + self.batch_size)
+            out.extend(self._block[i - block_start:j - block_start])
+            i = j
+        return out
+
+    def _emit(self, start, stop):
+        sendto = self.sock.sendto
+        target = self.target
+        if self.codec.binary:
+            messages = self.codec.encode_tick_columns(*(col[start:stop] for col in self._columns))
+        else:
+            messages = self._encoded(start, stop)
+        for message in messages:
+            sendto(message, target)
+
     def stream(self):
-        for _, row in self.data.iterrows():
-            tick = {
-                "timestamp" : row["timestamp"],
-                "symbol" : row["symbol"],
-                "price" : row["price"],
-                "volume" : row["volume"]
-            }
-            message = json.dumps(tick).encode("utf-8")
-            self.sock.sendto(message, self.target)
-            time.sleep(self.interval)
-    
+        # Encode the first block before the clock starts so it doesn't count as lag
+        if not self.codec.binary:
+            self._encoded(0, min(1, len(self.data)))
+        stats = self.engine.run(len(self.data), self._emit)
+        print(f"[INFO] Replayed {stats['ticks']} ticks in {stats['elapsed']:.3f}s "
+              f"({stats['ticks_per_sec']:,.0f} ticks/sec, mode={stats['mode']}, max lag {stats['max_lag_ms']:.3f} ms)")
+        return stats
+
+    def stop(self):
+        self.engine.stop()
+
 if __name__ == "__main__":
     streamer = MarketDataStreamer("raw_data/btc_usdt.csv", interval_ms=100)
     streamer.stream()
@@ -0,0 +1,270 @@
+# Append-only binary tick journal with record/replay.
+# The recorder plugs into LiveDataLoader as a callback; the replay source exposes the
+# same register_callback/start/stop API, so predictors can be driven from a recording.
+#
+# Layout of a journal directory:
+#   journal-000000.bin, journal-000001.bin, ...  8-byte header ("HFJ1" + record size u32)
+#                                                followed by wire_protocol TICK records
+#   journal.idx    sparse index, one entry every index_every records:
+#                  (max ts_ns of all earlier records, file number, record number in file)
+#   symbols.json   symbol id -> name
+
+import json
+import struct
+import threading
+import time
+from pathlib import Path
+import os, sys
+
+import numpy as np
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import TICK_DTYPE, SymbolTable, symbol_id, to_ns
+from data_feed.stream_simulator import ReplayEngine
+
+FILE_MAGIC = b"HFJ1"
+FILE_HEADER = struct.Struct("<4sI")
+INDEX_DTYPE = np.dtype([("max_ts_ns", "<i8"), ("file", "<u4"), ("record", "<u4")])
+
+
+class JournalRecorder:
+    def __init__(self, directory, max_file_bytes: int = 64 * 1024 * 1024, index_every: int = 1024,
+                 flush_every: int = 1024, flush_interval: float = 1.0):
+        # :param max_file_bytes: Rotate to a new journal file past this size.
+        # :param index_every: Records between sparse index entries.
+        # :param flush_every: Buffered records written per batch.
+        # :param flush_interval: Max seconds a record stays buffered in memory.
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_records = max(1, (max_file_bytes - FILE_HEADER.size) // TICK_DTYPE.itemsize)
+        self.index_every = index_every
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.symbols = SymbolTable(())
+
+        self._buffer = np.zeros(flush_every, dtype=TICK_DTYPE)
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._max_ts = np.iinfo(np.int64).min
+        self._seq = 0
+
+        # Continue an existing journal rather than overwriting it
+        existing = sorted(self.directory.glob("journal-*.bin"))
+        self._file_no = int(existing[-1].stem.split("-")[1]) if existing else 0
+        self._open(self._file_no)
+        if (self.directory / "symbols.json").exists():
+            for name in json.loads((self.directory / "symbols.json").read_text()).values():
+                self.symbols.register(name)
+        self._resume()
+        self._index = open(self.directory / "journal.idx", "ab")
+
+    def _resume(self):
+        # Restore the running max timestamp and sequence number of an existing journal.
+        # Every file has an index entry at record 0, so the last entry plus the last
+        # file cover everything written so far.
+        index_path = self.directory / "journal.idx"
+        if index_path.exists() and index_path.stat().st_size >= INDEX_DTYPE.itemsize:
+            last = np.fromfile(index_path, dtype=INDEX_DTYPE)[-1]
+            self._max_ts = max(self._max_ts, int(last["max_ts_ns"]))
+        recs = TickJournal(self.directory)._records(self.directory / f"journal-{self._file_no:06d}.bin")
+        if len(recs):
+            self._max_ts = max(self._max_ts, int(recs["ts_ns"].max()))
+            self._seq = int(recs["seq"][-1]) + 1
+
+    def _open(self, file_no):
+        path = self.directory / f"journal-{file_no:06d}.bin"
+        new = not path.exists() or path.stat().st_size == 0
+        self._file = open(path, "ab")
+        if new:
+            self._file.write(FILE_HEADER.pack(FILE_MAGIC, TICK_DTYPE.itemsize))
+            self._file.flush()
+        self._file_records = (self._file.tell() - FILE_HEADER.size) // TICK_DTYPE.itemsize
+
+    def record(self, tick: dict):
+        # Callback for LiveDataLoader.register_callback.
+        with self._lock:
+            sid = symbol_id(tick["symbol"])
+            if sid not in self.symbols.names:
+                self.symbols.register(tick["symbol"])
+                self._save_symbols()
+            rec = self._buffer[self._buffered]
+            rec["seq"] = self._seq
+            rec["ts_ns"] = to_ns(tick.get("timestamp"))
+            rec["price"] = tick["price"]
+            rec["volume"] = tick.get("volume", tick.get("quantity", 0.0))
+            rec["symbol_id"] = sid
+            self._seq += 1
+            self._buffered += 1
+            if self._buffered == self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def attach(self, loader):
+        loader.register_callback(self.record)
+        return self
+
+    def _save_symbols(self):
+        tmp = self.directory / "symbols.json.tmp"
+        tmp.write_text(json.dumps({str(k): v for k, v in self.symbols.names.items()}))
+        os.replace(tmp, self.directory / "symbols.json")
+
+    def _flush(self):
+        records = self._buffer[:self._buffered]
+        written = 0
+        while written < len(records):
+            if self._file_records >= self.max_records:
+                self._file.close()
+                self._file_no += 1
+                self._open(self._file_no)
+            n = min(len(records) - written, self.max_records - self._file_records)
+            chunk = records[written:written + n]
+            # Index entries fall on every index_every-th record of a file
+            first = self._file_records
+            running_max = np.maximum.accumulate(chunk["ts_ns"])
+            for pos in range(-(-first // self.index_every) * self.index_every, first + n, self.index_every):
+                k = pos - first
+                max_before = max(self._max_ts, int(running_max[k - 1])) if k > 0 else self._max_ts
+                entry = np.array([(max_before, self._file_no, pos)], dtype=INDEX_DTYPE)
+                self._index.write(entry.tobytes())
+            self._max_ts = max(self._max_ts, int(running_max[-1]))
+            self._file.write(chunk.tobytes())
+            self._file_records += n
+            written += n
+        self._file.flush()
+        self._index.flush()
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._buffered:
+                self._flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+
+class TickJournal:
+    # Read side of a journal directory.
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.symbols = SymbolTable(())
+        path = self.directory / "symbols.json"
+        if path.exists():
+            for name in json.loads(path.read_text()).values():
+                self.symbols.register(name)
+
+    def files(self):
+        return sorted(self.directory.glob("journal-*.bin"))
+
+    def _records(self, path):
+        with open(path, "rb") as f:
+            magic, record_size = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != FILE_MAGIC or record_size != TICK_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a v1 tick journal")
+        count = (path.stat().st_size - FILE_HEADER.size) // TICK_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=FILE_HEADER.size, shape=(count,))
+
+    def _seek(self, start_ns):
+        # (file number, record number) before which every record is older than start_ns.
+        path = self.directory / "journal.idx"
+        if start_ns is None or not path.exists():
+            return 0, 0
+        index = np.fromfile(path, dtype=INDEX_DTYPE)
+        k = int(np.searchsorted(index["max_ts_ns"], start_ns, side="left")) - 1
+        if k < 0:
+            return 0, 0
+        return int(index["file"][k]), int(index["record"][k])
+
+    def read(self, start=None, end=None) -> np.ndarray:
+        # All records with start <= ts < end, in recording order.
+        start_ns = None if start is None else to_ns(start)
+        end_ns = None if end is None else to_ns(end)
+        file_no, record_no = self._seek(start_ns)
+        pieces = []
+        for path in self.files():
+            n = int(path.stem.split("-")[1])
+            if n < file_no:
+                continue
+            recs = self._records(path)
+            if n == file_no:
+                recs = recs[record_no:]
+            mask = np.ones(len(recs), dtype=bool)
+            if start_ns is not None:
+                mask &= recs["ts_ns"] >= start_ns
+            if end_ns is not None:
+                mask &= recs["ts_ns"] < end_ns
+            pieces.append(recs[mask])
+        if not pieces:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.concatenate(pieces)
+
+
+class JournalReplaySource:
+    # Drop-in stand-in for LiveDataLoader that replays a journal without any network.
+    def __init__(self, directory, speed: float | None = None, start=None, end=None, batch_size: int = 4096):
+        # :param speed: None replays as fast as possible; otherwise real-time pacing
+        #               scaled by speed (1.0 = recorded pace).
+        self.journal = TickJournal(directory)
+        self.records = self.journal.read(start, end)
+        self.callbacks = []
+        mode = "fast" if speed is None else "realtime"
+        self.engine = ReplayEngine(mode, timestamps_ns=self.records["ts_ns"], speed=speed or 1.0, batch_size=batch_size)
+        self._thread = None
+        self.stats = None
+
+    def register_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def _emit(self, start, stop):
+        recs = self.records[start:stop]
+        names = [self.journal.symbols.name(sid) for sid in recs["symbol_id"].tolist()]
+        # Same tick shape as LiveDataLoader (timestamp in epoch ms)
+        for name, price, volume, ts in zip(names, recs["price"].tolist(), recs["volume"].tolist(), (recs["ts_ns"] / 1e6).tolist()):
+            tick = {"symbol": name, "price": price, "volume": volume, "timestamp": ts}
+            for cb in self.callbacks:
+                cb(tick)
+
+    def _run(self):
+        self.stats = self.engine.run(len(self.records), self._emit)
+        print(f"[INFO] Replayed {self.stats['ticks']} journal ticks ({self.stats['ticks_per_sec']:,.0f} ticks/sec)")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        # Wait for the replay to finish.
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stop(self):
+        self.engine.stop()
+        self.join()
+
+
+# Example usage
+if __name__ == "__main__":
+    from data_feed.live_data_loader import LiveDataLoader
+
+    journal_dir = Path(__file__).resolve().parent / "journal"
+
+    # Record 30 seconds of live ticks
+    loader = LiveDataLoader(symbols=["btcusdt", "ethusdt"])
+    recorder = JournalRecorder(journal_dir).attach(loader)
+    loader.start()
+    time.sleep(30)
+    loader.stop()
+    recorder.close()
+
+    # Replay them at 10x speed
+    source = JournalReplaySource(journal_dir, speed=10.0)
+    source.register_callback(lambda tick: print(f"[REPLAY] {tick}"))
+    source.start()
+    source.join()
@@ -0,0 +1,293 @@
+# Columnar, memory-mapped tick store.
+# Converts tick CSVs once into raw binary column files partitioned by symbol and date,
+# so training, backtests and replay can read prices/volumes without re-parsing text.
+#
+# Layout:
+#   <root>/<SYMBOL>/<YYYY-MM-DD>/timestamp.i8   int64 nanoseconds since epoch (sorted)
+#   <root>/<SYMBOL>/<YYYY-MM-DD>/price.f8       float64
+#   <root>/<SYMBOL>/<YYYY-MM-DD>/volume.f8      float64
+#   <root>/_manifest.json                       source CSV -> size/mtime/symbols/partitions
+#   <root>/_sources/<digest>/...                 per-CSV stores used by load_columns / load_frame
+#
+# Partitions are keyed by (symbol, date), so two CSVs ingested into the same store that
+# cover the same symbol and day replace each other; the manifest entry of the CSV whose
+# data was replaced is dropped, so it is re-ingested on its next ensure_csv(). The
+# read-through helpers give every CSV its own store under _sources/ instead, so e.g.
+# btc_usdt.csv and btc_usdt_labeled.csv never shadow each other.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STORE_ROOT = Path(__file__).resolve().parent / "tick_store"
+
+# Column name -> (file suffix, dtype)
+COLUMNS = {
+    "timestamp": ("i8", np.dtype("<i8")),
+    "price": ("f8", np.dtype("<f8")),
+    "volume": ("f8", np.dtype("<f8")),
+}
+
+MANIFEST = "_manifest.json"
+SOURCES = "_sources"
+
+
+def to_ns(values) -> np.ndarray:
+    # Convert a timestamp column (datetime strings or epoch milliseconds) to int64 nanoseconds.
+    series = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series):
+        # Binance and the live loader report epoch milliseconds
+        return pd.to_datetime(series, unit="ms").to_numpy("datetime64[ns]").astype(np.int64)
+    return pd.to_datetime(series).to_numpy("datetime64[ns]").astype(np.int64)
+
+
+def bound_ns(value):
+    # Normalise a time-range bound (str, datetime, pd.Timestamp or int ns) to int ns.
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return pd.Timestamp(value).value
+
+
+class TickStore:
+    def __init__(self, root: str | Path = DEFAULT_STORE_ROOT):
+        # :param root: Directory holding the partitioned column files.
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # Catalog
+    def symbols(self):
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and not p.name.startswith((".", "_")))
+
+    def dates(self, symbol: str):
+        sym_dir = self.root / symbol.upper()
+        if not sym_dir.exists():
+            return []
+        return sorted(p.name for p in sym_dir.iterdir() if p.is_dir())
+
+    def _partition(self, symbol: str, date: str) -> Path:
+        return self.root / symbol.upper() / date
+
+    def source_store(self, csv_path: str | Path) -> "TickStore":
+        # Private store for one CSV, keyed by its resolved path.
+        key = hashlib.blake2b(str(Path(csv_path).resolve()).encode(), digest_size=8).hexdigest()
+        return TickStore(self.root / SOURCES / key)
+
+    # Writing
+    def append(self, symbol: str, timestamps_ns, prices, volumes):
+        # Append ticks for one symbol, splitting them into daily partitions.
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        columns = {
+            "timestamp": timestamps_ns,
+            "price": np.asarray(prices, dtype=np.float64),
+            "volume": np.asarray(volumes, dtype=np.float64),
+        }
+        days = timestamps_ns.astype("datetime64[ns]").astype("datetime64[D]")
+        for day in np.unique(days):
+            mask = days == day
+            part = self._partition(symbol, str(day))
+            part.mkdir(parents=True, exist_ok=True)
+            for name, (suffix, dtype) in COLUMNS.items():
+                with open(part / f"{name}.{suffix}", "ab") as f:
+                    f.write(columns[name][mask].astype(dtype, copy=False).tobytes())
+
+    def append_frame(self, df: pd.DataFrame):
+        # Append a [timestamp, symbol, price, volume] frame (any number of symbols).
+        ts = to_ns(df["timestamp"])
+        for symbol, idx in df.groupby("symbol", sort=False).indices.items():
+            self.append(str(symbol), ts[idx], df["price"].to_numpy()[idx], df["volume"].to_numpy()[idx])
+
+    def finalize(self):
+        # Sort any partition whose timestamps are not monotonic (e.g. out-of-order input).
+        for symbol in self.symbols():
+            for date in self.dates(symbol):
+                cols = self._read_partition(symbol, date)
+                ts = cols["timestamp"]
+                if len(ts) > 1 and (np.diff(ts) < 0).any():
+                    order = np.argsort(ts, kind="stable")
+                    sorted_cols = {name: np.array(col[order]) for name, col in cols.items()}
+                    del cols, ts
+                    part = self._partition(symbol, date)
+                    for name, (suffix, dtype) in COLUMNS.items():
+                        sorted_cols[name].astype(dtype, copy=False).tofile(part / f"{name}.{suffix}")
+
+    def ingest_csv(self, csv_path: str | Path, chunksize: int = 1_000_000):
+        # Convert a tick CSV into the store. Partitions written by this CSV replace
+        # existing ones, so re-ingesting a changed file never duplicates rows.
+        csv_path = Path(csv_path).resolve()
+        staging = TickStore(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+        try:
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                chunk = chunk.dropna(subset=["timestamp", "price", "volume"])
+                if "symbol" not in chunk.columns:
+                    chunk["symbol"] = csv_path.stem.replace("_", "").upper()
+                staging.append_frame(chunk)
+            staging.finalize()
+
+            symbols = staging.symbols()
+            partitions = [f"{symbol}/{date}" for symbol in symbols for date in staging.dates(symbol)]
+            for symbol in symbols:
+                for date in staging.dates(symbol):
+                    target = self._partition(symbol, date)
+                    if target.exists():
+                        shutil.rmtree(target)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(staging._partition(symbol, date), target)
+        finally:
+            shutil.rmtree(staging.root, ignore_errors=True)
+
+        stat = csv_path.stat()
+        manifest = self._load_manifest()
+        # Other sources that had data in a partition we just replaced are no longer complete
+        written = set(partitions)
+        for source, entry in list(manifest.items()):
+            if source == str(csv_path):
+                continue
+            theirs = entry.get("partitions")
+            overlap = written.intersection(theirs) if theirs is not None else \
+                {p for p in written if p.split("/")[0] in entry["symbols"]}
+            if overlap:
+                del manifest[source]
+                print(f"[WARN] {csv_path.name} replaced {len(overlap)} partition(s) of {Path(source).name}; "
+                      f"it will be re-ingested on next use")
+        manifest[str(csv_path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "symbols": symbols,
+                                   "partitions": partitions}
+        self._save_manifest(manifest)
+        print(f"[INFO] Ingested {csv_path.name} into tick store ({', '.join(symbols)})")
+        return symbols
+
+    # Manifest
+    def _load_manifest(self):
+        path = self.root / MANIFEST
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest):
+        tmp = self.root / (MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.root / MANIFEST)
+
+    def source_symbols(self, csv_path: str | Path):
+        # Symbols ingested from csv_path, or None if the CSV is missing from the store or stale.
+        csv_path = Path(csv_path).resolve()
+        entry = self._load_manifest().get(str(csv_path))
+        if entry is None:
+            return None
+        stat = csv_path.stat()
+        if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        return entry["symbols"]
+
+    def ensure_csv(self, csv_path: str | Path):
+        # Ingest csv_path only if it is new or has changed since the last ingest.
+        symbols = self.source_symbols(csv_path)
+        if symbols is None:
+            symbols = self.ingest_csv(csv_path)
+        return symbols
+
+    # Reading
+    def _read_partition(self, symbol: str, date: str):
+        part = self._partition(symbol, date)
+        cols = {}
+        for name, (suffix, dtype) in COLUMNS.items():
+            path = part / f"{name}.{suffix}"
+            if path.stat().st_size == 0:
+                cols[name] = np.empty(0, dtype=dtype)
+            else:
+                cols[name] = np.memmap(path, dtype=dtype, mode="r")
+        return cols
+
+    def read(self, symbol: str, start=None, end=None):
+        # Return {"timestamp", "price", "volume"} arrays for symbol within [start, end).
+        # A range inside a single partition is returned as read-only memory-mapped views;
+        # ranges spanning several days are concatenated from the pruned partitions only.
+        start_ns, end_ns = bound_ns(start), bound_ns(end)
+        start_day = None if start_ns is None else str(np.datetime64(start_ns, "ns").astype("datetime64[D]"))
+        end_day = None if end_ns is None else str(np.datetime64(end_ns, "ns").astype("datetime64[D]"))
+
+        pieces = []
+        for date in self.dates(symbol):
+            if start_day is not None and date < start_day:
+                continue
+            if end_day is not None and date > end_day:
+                continue
+            cols = self._read_partition(symbol, date)
+            ts = cols["timestamp"]
+            lo = 0 if start_ns is None else int(np.searchsorted(ts, start_ns, side="left"))
+            hi = len(ts) if end_ns is None else int(np.searchsorted(ts, end_ns, side="left"))
+            if hi > lo:
+                pieces.append({name: col[lo:hi] for name, col in cols.items()})
+
+        if not pieces:
+            return {name: np.empty(0, dtype=dtype) for name, (_, dtype) in COLUMNS.items()}
+        if len(pieces) == 1:
+            return pieces[0]
+        return {name: np.concatenate([p[name] for p in pieces]) for name in COLUMNS}
+
+    def to_frame(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        # DataFrame view with the same columns as the raw CSVs: [timestamp, symbol, price, volume].
+        cols = self.read(symbol, start, end)
+        return pd.DataFrame({
+            "timestamp": np.asarray(cols["timestamp"]).astype("datetime64[ns]"),
+            "symbol": symbol.upper(),
+            "price": np.asarray(cols["price"]),
+            "volume": np.asarray(cols["volume"]),
+        })
+
+
+def _is_tick_csv(csv_path: Path) -> bool:
+    # Only CSVs with exactly the tick columns (plus an optional symbol) can be routed
+    # through the store; anything else (labels, features) would be lost on the way.
+    header = set(pd.read_csv(csv_path, nrows=0).columns)
+    return header - {"symbol"} == set(COLUMNS)
+
+
+def load_columns(csv_path: str | Path, symbol: str | None = None, start=None, end=None, store: TickStore | None = None):
+    # Read-through helper: ingest csv_path into the store on first use, then return
+    # memory-mapped column arrays for symbol (defaults to the CSV's only symbol).
+    store = (store or TickStore()).source_store(csv_path)
+    symbols = store.ensure_csv(csv_path)
+    if symbol is None:
+        if len(symbols) != 1:
+            raise ValueError(f"{csv_path} holds several symbols {symbols}; pass symbol=")
+        symbol = symbols[0]
+    return store.read(symbol, start, end)
+
+
+def load_frame(csv_path: str | Path, symbol: str | None = None, start=None, end=None, store: TickStore | None = None) -> pd.DataFrame:
+    # Drop-in replacement for pd.read_csv on tick files. CSVs that aren't plain tick
+    # files (no tick columns like tmp_live.csv, or extra columns like *_labeled.csv)
+    # fall back to a plain pandas read so no column is dropped.
+    csv_path = Path(csv_path)
+    if not _is_tick_csv(csv_path):
+        if symbol is not None or start is not None or end is not None:
+            raise ValueError(f"{csv_path} is not a plain tick file; symbol/start/end are not supported for it")
+        return pd.read_csv(csv_path)
+    store = (store or TickStore()).source_store(csv_path)
+    symbols = store.ensure_csv(csv_path)
+    if symbol is None:
+        if len(symbols) != 1:
+            return pd.concat([store.to_frame(s, start, end) for s in symbols]).sort_values("timestamp", kind="stable").reset_index(drop=True)
+        symbol = symbols[0]
+    return store.to_frame(symbol, start, end)
+
+
+# Example Usage
+if __name__ == "__main__":
+    store = TickStore()
+    store.ingest_csv(Path(__file__).resolve().parent / "raw_data" / "btc_usdt.csv")
+    print("Symbols:", store.symbols())
+
+    cols = store.read("BTCUSDT", start="2025-09-12 09:00:10", end="2025-09-12 09:00:20")
+    print("Ticks in range:", len(cols["price"]), "| first price:", cols["price"][0])
+    print(store.to_frame("BTCUSDT").head())
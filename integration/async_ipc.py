@@ -0,0 +1,117 @@
+# asyncio UDP endpoints for the engine ports (9000 market data, 9001 signals).
+# Counterpart of IPCSocket for code running on a single event loop: sends never
+# block, and received datagrams are decoded into an asyncio queue.
+
+import asyncio
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import WireCodec, ENCODING_JSON, DECODE_ERRORS
+
+MARKET_DATA_PORT = 9000
+SIGNAL_PORT = 9001
+
+
+class _EndpointProtocol(asyncio.DatagramProtocol):
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+    def datagram_received(self, data, addr):
+        self.endpoint._on_datagram(data)
+
+    def error_received(self, exc):
+        # ICMP port-unreachable etc. on a connected endpoint; the peer may not be up yet
+        self.endpoint.stats["send_errors"] += 1
+
+
+class AsyncDatagramEndpoint:
+    def __init__(self, codec: WireCodec, queue_size: int):
+        self.codec = codec
+        self.queue = asyncio.Queue(queue_size)
+        self.transport = None
+        self.stats = {"sent": 0, "received": 0, "decoded": 0, "dropped": 0, "bad": 0, "send_errors": 0}
+
+    @classmethod
+    async def create(cls, local_port: int | None = None, remote_port: int | None = None, host: str = "127.0.0.1",
+                     encoding: str = ENCODING_JSON, queue_size: int = 100_000):
+        # :param local_port: Bind here to receive (e.g. 9000 for a market-data consumer).
+        # :param remote_port: Default destination for sends (e.g. SIGNAL_PORT).
+        endpoint = cls(WireCodec(encoding), queue_size)
+        loop = asyncio.get_running_loop()
+        endpoint.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _EndpointProtocol(endpoint),
+            local_addr=(host, local_port) if local_port is not None else None,
+            remote_addr=(host, remote_port) if remote_port is not None else None,
+        )
+        return endpoint
+
+    def _on_datagram(self, data):
+        self.stats["received"] += 1
+        try:
+            messages = self.codec.decode(data)
+        except DECODE_ERRORS:
+            self.stats["bad"] += 1
+            self.stats["dropped"] += 1
+            return
+        for message in messages:
+            try:
+                self.queue.put_nowait(message)
+                self.stats["decoded"] += 1
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+
+    def _send(self, datagrams):
+        for data in datagrams:
+            self.transport.sendto(data)
+            self.stats["sent"] += 1
+
+    def send_tick(self, tick: dict):
+        self._send(self.codec.encode_ticks([tick]))
+
+    def send_ticks(self, ticks):
+        self._send(self.codec.encode_ticks(ticks))
+
+    def send_signal(self, signal: dict):
+        self._send(self.codec.encode_signals([signal]))
+
+    def send_signals(self, signals):
+        self._send(self.codec.encode_signals(signals))
+
+    async def recv(self):
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def market_data_endpoint(encoding: str = ENCODING_JSON, host: str = "127.0.0.1"):
+    # Sender for the engine's market-data port.
+    return await AsyncDatagramEndpoint.create(remote_port=MARKET_DATA_PORT, host=host, encoding=encoding)
+
+
+async def signal_endpoint(encoding: str = ENCODING_JSON, host: str = "127.0.0.1"):
+    # Sender for the engine's signal port.
+    return await AsyncDatagramEndpoint.create(remote_port=SIGNAL_PORT, host=host, encoding=encoding)
+
+
+# Example usage: loop a signal back through a local listener on 9001
+if __name__ == "__main__":
+    async def main():
+        listener = await AsyncDatagramEndpoint.create(local_port=SIGNAL_PORT)
+        sender = await signal_endpoint(encoding="binary")
+        sender.send_signals([{"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1}] * 3)
+        for _ in range(3):
+            print("[ENGINE MSG]", await asyncio.wait_for(listener.recv(), 1.0))
+        sender.close()
+        listener.close()
+
+    asyncio.run(main())
@@ -2,9 +2,14 @@
 # Provides a clean API for strategies to interact with the backend.
 
 import subprocess
-import socket
-import json
 from pathlib import Path
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import ENCODING_JSON, DEFAULT_MTU
+from integration.transport import UDPTransport
 
 # Default Configuration
 ENGINE_EXECUTABLE = Path(__file__).resolve().parent.parent / "cpp_engine" / "src" / "hft_simulator.exe"
@@ -12,9 +17,15 @@ MARKET_DATA_PORT = 9000
 SIGNAL_PORT = 9001
 
 class HFTInterface:
-    def __init__(self, engine_path: Path = ENGINE_EXECUTABLE):
+    def __init__(self, engine_path: Path = ENGINE_EXECUTABLE, encoding: str = ENCODING_JSON,
+                 mtu: int = DEFAULT_MTU, max_delay_ms: float = 0.0, verbose: bool = False):
+        # :param encoding: Wire encoding ("json" until the engine is built with binary decoding).
+        # :param max_delay_ms: Latency budget for batching binary sends (0 = send immediately); call flush() to drain.
+        # :param verbose: Print every message sent (slow; for debugging only).
         self.engine_path = engine_path
         self.engine_process = None
+        self.verbose = verbose
+        self.transport = UDPTransport(encoding, mtu=mtu, max_delay_ms=max_delay_ms)
     
     def start_engine(self):
         # Launched the compiled C++ engine as a subprocess.
@@ -25,6 +36,7 @@ class HFTInterface:
         
     def stop_engine(self):
         # Terminate the C++ engine subprocess.
+        self.close()
         if self.engine_process:
             self.engine_process.terminate()
             self.engine_process.wait()
@@ -34,21 +46,31 @@ class HFTInterface:
         # Sends market tick data to the C++ engine via UDP.
         # Tick Format: {"symbol": "BTCUSDT", "price": 42000.5, "quantity": 0.25}
         
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        message = json.dumps(tick).encode("utf-8")
-        sock.sendto(message, ("127.0.0.1", MARKET_DATA_PORT))
-        sock.close()
-        print(f"[DEBUG] Market tick sent: {tick}")
+        self.transport.send_tick(tick, ("127.0.0.1", MARKET_DATA_PORT))
+        if self.verbose:
+            print(f"[DEBUG] Market tick sent: {tick}")
         
     def send_trade_signal(self, signal: dict):
         # Sends trade signal to the C++ engine via UDP.
         # Signal Format: {"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1}
         
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        message = json.dumps(signal).encode("utf-8")
-        sock.sendto(message, ("127.0.0.1", SIGNAL_PORT))
-        sock.close()
-        print(f"[DEBUG] Trade signal sent: {signal}")
+        self.transport.send_signal(signal, ("127.0.0.1", SIGNAL_PORT))
+        if self.verbose:
+            print(f"[DEBUG] Trade signal sent: {signal}")
+
+    def flush(self):
+        # Send any batched messages now.
+        self.transport.flush()
+
+    def close(self):
+        # Flush and close the transport's sockets (reopened on the next send).
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
         
     def read_engine_output(self):
         # Reads stdout from the C++ engine process (non-blocking).
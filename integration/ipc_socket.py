@@ -2,43 +2,182 @@
 # Provides a lightweight communication layer using UPD sockets.
 
 import socket
-import json
+import selectors
+import struct
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import ENCODING_JSON, DEFAULT_MTU, DECODE_ERRORS, WireCodec
+from integration.transport import UDPTransport
+
+ENGINE_FEEDBACK_PORT = 9100
+
+# Linux reports the kernel's per-socket drop counter as ancillary data when SO_RXQ_OVFL is set
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+
+class MultiplexListener:
+    # Serves several UDP ports from one thread. Each wakeup drains every pending
+    # datagram on a ready socket (up to max_batch), decodes them, and hands the
+    # whole batch to that port's callback as a list of messages.
+    def __init__(self, host: str = "127.0.0.1", codec: WireCodec | None = None, rcvbuf: int | None = None,
+                 max_batch: int = 1024, bufsize: int = 65536):
+        # :param rcvbuf: SO_RCVBUF in bytes for every bound socket (None = OS default).
+        # :param max_batch: Max datagrams drained from one socket per wakeup.
+        self.host = host
+        self.codec = codec or WireCodec()
+        self.rcvbuf = rcvbuf
+        self.max_batch = max_batch
+        self.bufsize = bufsize
+        self.selector = selectors.DefaultSelector()
+        self.stats = {}
+        self._running = False
+        # Self-pipe so stop() can wake a blocked select()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def add(self, port: int, callback):
+        # Bind port and route its message batches to callback(list_of_messages).
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        overflow = False
+        if SO_RXQ_OVFL is not None and hasattr(sock, "recvmsg"):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                overflow = True
+            except OSError:
+                pass
+        sock.bind((self.host, port))
+        sock.setblocking(False)
+        self.stats[port] = {
+            "received": 0, "decoded": 0, "dropped": 0, "bad": 0, "overruns": 0, "batches": 0,
+            "rcvbuf": sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+        }
+        self.selector.register(sock, selectors.EVENT_READ, (port, callback, overflow))
+        print(f"[IPC] Listening on {self.host}:{port}")
+
+    def _drain(self, sock, port, overflow):
+        stats = self.stats[port]
+        datagrams = []
+        for _ in range(self.max_batch):
+            try:
+                if overflow:
+                    data, ancdata, _, _ = sock.recvmsg(self.bufsize, socket.CMSG_SPACE(4))
+                    for level, ctype, cdata in ancdata:
+                        if level == socket.SOL_SOCKET and ctype == SO_RXQ_OVFL and len(cdata) >= 4:
+                            # Cumulative count of datagrams the kernel dropped for this socket,
+                            # as of when this datagram was queued
+                            stats["overruns"] = struct.unpack("=I", cdata[:4])[0]
+                else:
+                    data = sock.recv(self.bufsize)
+            except BlockingIOError:
+                break
+            datagrams.append(data)
+
+        stats["received"] += len(datagrams)
+        messages = []
+        for data in datagrams:
+            try:
+                messages.extend(self.codec.decode(data))
+            except DECODE_ERRORS:
+                stats["bad"] += 1
+                stats["dropped"] += 1
+        stats["decoded"] += len(messages)
+        return messages
+
+    def poll(self, timeout: float | None = None):
+        # Wait once for readable sockets and dispatch one batch per ready port.
+        for key, _ in self.selector.select(timeout):
+            if key.data is None:
+                try:
+                    self._wake_r.recv(64)
+                except BlockingIOError:
+                    pass
+                continue
+            port, callback, overflow = key.data
+            messages = self._drain(key.fileobj, port, overflow)
+            if messages:
+                self.stats[port]["batches"] += 1
+                callback(messages)
+
+    def serve_forever(self):
+        self._running = True
+        while self._running:
+            self.poll()
+
+    def stop(self):
+        self._running = False
+        self._wake_w.send(b"\0")
+
+    def close(self):
+        for key in list(self.selector.get_map().values()):
+            self.selector.unregister(key.fileobj)
+            key.fileobj.close()
+        self.selector.close()
+        self._wake_w.close()
+
 
 class IPCSocket:
-    def __init__(self, host: str = "127.0.0.1", market_port: int = 9000, signal_port: int = 9001):
+    def __init__(self, host: str = "127.0.0.1", market_port: int = 9000, signal_port: int = 9001, encoding: str = ENCODING_JSON,
+                 mtu: int = DEFAULT_MTU, max_delay_ms: float = 0.0, verbose: bool = False):
+        # :param encoding: Wire encoding for outgoing messages ("json" or "binary"); listeners accept both.
+        # :param max_delay_ms: Latency budget for batching binary sends (0 = send immediately); call flush() to drain.
+        # :param verbose: Print every message sent (slow; for debugging only).
         self.host = host
         self.market_port = market_port
         self.signal_port = signal_port
+        self.verbose = verbose
+        self.transport = UDPTransport(encoding, mtu=mtu, max_delay_ms=max_delay_ms)
+        self.codec = self.transport.codec
         
     def send_market_tick(self, tick: dict):
         # Send market tick data to the C++ engine.
         # Tick format: {"symbol": "BTCUSDT", "price": 42000.5, "quantity": 0.25}
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            message = json.dumps(tick).encode("utf-8")
-            sock.sendto(message, (self.host, self.market_port))
-        print(f"[IPC] Market tick sent: {tick}")
+        self.transport.send_tick(tick, (self.host, self.market_port))
+        if self.verbose:
+            print(f"[IPC] Market tick sent: {tick}")
         
     def send_trade_signal(self, signal: dict):
         # Send trade signal to the C++ engine.
         # Signal Format: {"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1}
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            message = json.dumps(signal).encode("utf-8")
-            sock.sendto(message, (self.host, self.signal_port))
-        print(f"[IPC] Trade signal sent: {signal}")
+        self.transport.send_signal(signal, (self.host, self.signal_port))
+        if self.verbose:
+            print(f"[IPC] Trade signal sent: {signal}")
+
+    def flush(self):
+        # Send any batched messages now.
+        self.transport.flush()
+
+    def close(self):
+        self.transport.close()
         
     def listen(self, port: int, callback):
         # Listen fro message from the C++ engine.
-        # Callback: function to process received messages.
-        with socket.socket(socket.AF_INET,socket.SOCK_DGRAM) as sock:
-            sock.bind((self.host, port))
-            print(f"[IPC] Listening on {self.host}:{port}")
-            while True:
-                data, addr = sock.recvfrom(4096)
-                try:
-                    message = json.loads(data.decode("utf-8"))
-                    callback(message)
-                except json.JSONDecodeError:
-                    print(f"[ERROR] Failed to decode message: {data}")
+        # Callback: function to process received messages (called once per message).
+        def per_message(messages):
+            for message in messages:
+                callback(message)
+        self.listen_many({port: per_message})
+
+    def listen_many(self, handlers: dict, rcvbuf: int | None = None, max_batch: int = 1024):
+        # Serve several ports (e.g. market, signal, engine feedback) from this thread.
+        # :param handlers: {port: callback(list_of_messages)}
+        # Blocks forever; use make_listener() for a listener that can be polled or stopped.
+        listener = self.make_listener(handlers, rcvbuf, max_batch)
+        try:
+            listener.serve_forever()
+        finally:
+            listener.close()
+
+    def make_listener(self, handlers: dict, rcvbuf: int | None = None, max_batch: int = 1024) -> MultiplexListener:
+        listener = MultiplexListener(self.host, self.codec, rcvbuf=rcvbuf, max_batch=max_batch)
+        for port, callback in handlers.items():
+            listener.add(port, callback)
+        return listener
 
 # Example usage
 if __name__ == "__main__":
@@ -49,10 +188,18 @@ if __name__ == "__main__":
 
     # Send a sample trade signal
     ipc.send_trade_signal({"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1})
+    ipc.flush()
 
     # Example listener (prints messages from engine)
     def handle_message(msg):
         print(f"[ENGINE MSG] {msg}")
 
     # Uncomment to run listener (blocks execution)
-    # ipc.listen(port=9100, callback=handle_message)
\ No newline at end of file
+    # ipc.listen(port=ENGINE_FEEDBACK_PORT, callback=handle_message)
+
+    # Or serve market, signal and engine feedback ports from one thread, in batches:
+    # ipc.listen_many({
+    #     ipc.market_port: lambda batch: print(f"[MARKET] {len(batch)} ticks"),
+    #     ipc.signal_port: lambda batch: print(f"[SIGNAL] {len(batch)} signals"),
+    #     ENGINE_FEEDBACK_PORT: lambda batch: [handle_message(m) for m in batch],
+    # }, rcvbuf=4 * 1024 * 1024)
\ No newline at end of file
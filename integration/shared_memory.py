@@ -1,64 +1,193 @@
 # Alternative IPC method
 # Shared memory IPC between Python ML strategies and the C++ HFT engine.
 # Uses Python's multiprocessing.shared_memory for fast data exchange.
+#
+# The segment is a single-producer/single-consumer ring buffer of fixed-size
+# records (mirrored in cpp_engine/include/shm_ring.hpp). All fields little-endian:
+#
+#   offset   0: magic u32 ("HFRB") | version u16 | record_size u16 | capacity u32 |
+#               record_type u16 (MSG_TICK / MSG_SIGNAL, 0 = other) | pad to 64
+#   offset  64: head u64  - total records ever written (producer-owned cache line)
+#   offset 128: tail u64  - total records ever read    (consumer-owned cache line)
+#   offset 192: records[capacity], record i lives in slot (seq % capacity)
+#
+# capacity is a power of two. The producer writes records first and then publishes
+# them by storing the new head; the consumer copies records out and then stores the
+# new tail. Each counter has exactly one writer, so no locks are needed. On the C++
+# side head/tail must be std::atomic<uint64_t> with acquire loads / release stores;
+# on the Python side the aligned 8-byte numpy stores are single instructions.
 
-import json
 import struct
+import time
 from multiprocessing import shared_memory
+import os, sys
+
+import numpy as np
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import (
+    TICK_DTYPE, SIGNAL_DTYPE, MSG_TICK, MSG_SIGNAL, SymbolTable,
+    ticks_to_records, signals_to_records, records_to_dicts,
+)
+
+RING_MAGIC = 0x48465242  # "HFRB"
+RING_VERSION = 2
+HEADER = struct.Struct("<IHHIH")
+HEAD_OFFSET = 64
+TAIL_OFFSET = 128
+DATA_OFFSET = 192
 
 class SharedMemoryIPC:
-    def __init__(self, name: str = "hft_shared_mem", size: int = 4096):
+    def __init__(self, name: str = "hft_shared_mem", capacity: int = 4096, dtype: np.dtype = TICK_DTYPE):
         # Initialize shared memory segment.
         # :param name: Shared memory block name (must match C++ side).
-        # :param size: Size of the memory block in bytes.
+        # :param capacity: Number of record slots (rounded up to a power of two).
+        # :param dtype: Record layout; TICK_DTYPE or SIGNAL_DTYPE from wire_protocol.
         self.name = name
-        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.capacity = 1 << max(0, int(capacity) - 1).bit_length()
+        self.size = DATA_OFFSET + self.capacity * self.dtype.itemsize
+        self.symbols = SymbolTable()
         try:
             # Try to attach to existing shared memory
             self.shm = shared_memory.SharedMemory(name = self.name)
+            try:
+                self._validate()
+            except ValueError:
+                self.shm.close()
+                raise
             print(f"[IPC] Attached to existing shared memory: {self.name}")
         except FileNotFoundError:
             # Create new shared memory block
             self.shm = shared_memory.SharedMemory(name = self.name, create=True, size=self.size)
+            self.shm.buf[:DATA_OFFSET] = bytes(DATA_OFFSET)
+            HEADER.pack_into(self.shm.buf, 0, RING_MAGIC, RING_VERSION, self.dtype.itemsize, self.capacity,
+                             self.record_type)
             print(f"[IPC] Created new shared memory: {self.name}")
-        
-    def write_message(self, message: dict):
-        # Write a JSON message into shared memory.
-        # :param message: Python dict to serialize and store.
-        
-        data = json.dumps(message).encode("utf-8")
-        
-        if len(data) > self.size:
-            raise ValueError("Message too large for shared memory block")
-        
-        # Pack length + data
-        packed = struct.pack(f"{len(data)}s", data)
-        self.shm.buf[:len(packed)] = packed
-        print(f"[IPC] Wrote message: {message}")
-    
+
+        buf = self.shm.buf
+        self._head = np.ndarray((1,), dtype="<u8", buffer=buf, offset=HEAD_OFFSET)
+        self._tail = np.ndarray((1,), dtype="<u8", buffer=buf, offset=TAIL_OFFSET)
+        self._slots = np.ndarray((self.capacity,), dtype=self.dtype, buffer=buf, offset=DATA_OFFSET)
+        self._mask = self.capacity - 1
+
+    @property
+    def record_type(self) -> int:
+        # Type tag stored in the header, so a tick ring can't be attached as a signal ring
+        # (both records are 40 bytes).
+        if self.dtype == TICK_DTYPE:
+            return MSG_TICK
+        if self.dtype == SIGNAL_DTYPE:
+            return MSG_SIGNAL
+        return 0
+
+    def _validate(self):
+        magic, version, record_size, capacity, record_type = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            raise ValueError(f"Shared memory {self.name} is not a v{RING_VERSION} ring buffer")
+        if record_size != self.dtype.itemsize:
+            raise ValueError(f"Record size mismatch: segment has {record_size}, expected {self.dtype.itemsize}")
+        if record_type != self.record_type:
+            raise ValueError(f"Record type mismatch: segment has {record_type}, expected {self.record_type}")
+        # The creator decides the capacity
+        self.capacity = capacity
+        self.size = DATA_OFFSET + capacity * record_size
+
+    # Counters
+    def __len__(self):
+        # Records written but not yet read.
+        return int(self._head[0] - self._tail[0])
+
+    def free(self) -> int:
+        return self.capacity - len(self)
+
+    # Producer side
+    def write_batch(self, records: np.ndarray) -> int:
+        # Copy up to len(records) records into the ring without blocking.
+        # :return: Number of records written (less than requested if the ring is full).
+        head = int(self._head[0])
+        n = min(len(records), self.capacity - (head - int(self._tail[0])))
+        if n <= 0:
+            return 0
+        start = head & self._mask
+        first = min(n, self.capacity - start)
+        self._slots[start:start + first] = records[:first]
+        if n > first:
+            self._slots[:n - first] = records[first:n]
+        # Publish only after the records are in place
+        self._head[0] = head + n
+        return n
+
+    def write_message(self, message: dict) -> bool:
+        # Write a tick (or signal, for SIGNAL_DTYPE rings) dict as one record.
+        # :return: False if the ring is full.
+        if self.dtype == SIGNAL_DTYPE:
+            record = signals_to_records([message], seq_start=int(self._head[0]))
+        else:
+            record = ticks_to_records([message], seq_start=int(self._head[0]))
+        self.symbols.register(message["symbol"])
+        return self.write_batch(record) == 1
+
+    # Consumer side
+    def read_batch(self, max_records: int | None = None) -> np.ndarray:
+        # Copy out up to max_records unread records without blocking (empty array if none).
+        tail = int(self._tail[0])
+        n = int(self._head[0]) - tail
+        if max_records is not None:
+            n = min(n, max_records)
+        if n <= 0:
+            return np.empty(0, dtype=self.dtype)
+        start = tail & self._mask
+        first = min(n, self.capacity - start)
+        if n > first:
+            out = np.concatenate([self._slots[start:], self._slots[:n - first]])
+        else:
+            out = self._slots[start:start + n].copy()
+        # Release the slots only after copying them out
+        self._tail[0] = tail + n
+        return out
+
     def read_message(self) -> dict:
-        # Read JSON message from shared memory.
-        # :return: Python dict parsed from shared memory.
-        
-        raw = bytes(self.shm.buf[:self.size]).rstrip(b"\x00")
-        
-        if not raw:
+        # Read the next record as a dict ({} if the ring is empty).
+        records = self.read_batch(1)
+        if len(records) == 0:
             return {}
-        try:
-            message = json.loads(raw.decode("utf-8"))
-            print(f"[IPC] Read message: {message}")
-            return message
-        except json.JSONDecodeError:
-            print("[ERROR] Failed to decode shared memory contents")
-            return {}
-    
+        msg_type = MSG_SIGNAL if self.dtype == SIGNAL_DTYPE else MSG_TICK
+        return records_to_dicts(msg_type, records, self.symbols)[0]
+
+    def wait(self, min_records: int = 1, timeout: float | None = None, strategy: str = "spin_then_sleep",
+             spin_iters: int = 2000, sleep_s: float = 50e-6) -> bool:
+        # Wait until at least min_records are readable.
+        # :param strategy: "spin" (lowest latency, burns a core), "sleep" (yields the CPU),
+        #                  or "spin_then_sleep" (spin spin_iters polls, then sleep between polls).
+        # :return: False on timeout.
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        polls = 0
+        while len(self) < min_records:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            polls += 1
+            if strategy == "sleep" or (strategy == "spin_then_sleep" and polls > spin_iters):
+                time.sleep(sleep_s)
+        return True
+
     def close(self):
         # Close shared memory handle.
+        # Drop numpy views first; the buffer cannot be released while they exist.
+        # Safe to call more than once (a pool that failed to start is stopped twice).
+        if self._slots is None:
+            return
+        self._head = self._tail = self._slots = None
         self.shm.close()
-        
+
     def unlink(self):
-        # Destroy shared memory block (cleanup).
-        self.shm.unlink()
+        # Destroy shared memory block (cleanup); a no-op once it is gone.
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
 
 # Example usage
 if __name__ == "__main__":
@@ -71,6 +200,12 @@ if __name__ == "__main__":
     msg = ipc.read_message()
     print("Message received:", msg)
 
+    # Batch round trip
+    batch = ticks_to_records([{"symbol": "BTCUSDT", "price": 42000.0 + i, "volume": 0.1} for i in range(1000)])
+    written = ipc.write_batch(batch)
+    ipc.wait(min_records=written, timeout=1.0)
+    print(f"Wrote {written} records, read back {len(ipc.read_batch())}")
+
     # Cleanup
     ipc.close()
-    ipc.unlink()
\ No newline at end of file
+    ipc.unlink()
@@ -0,0 +1,165 @@
+# Persistent, batching UDP transport for the integration layer.
+# Keeps one connected socket per destination and, for the binary encoding, coalesces
+# messages into datagrams of up to `mtu` bytes, flushed when full, when the oldest
+# queued message exceeds the latency budget, or explicitly via flush().
+# JSON is always sent one object per datagram: that is what the C++ receivers parse.
+
+import json
+import socket
+import threading
+import time
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from integration.wire_protocol import WireCodec, ENCODING_JSON, DEFAULT_MTU, MSG_TICK, MSG_SIGNAL, max_records
+
+
+class _Batch:
+    # Messages queued for one (destination, message type).
+    __slots__ = ("items", "first_ns")
+
+    def __init__(self):
+        self.items = []
+        self.first_ns = 0
+
+
+class UDPTransport:
+    def __init__(self, encoding: str = ENCODING_JSON, mtu: int = DEFAULT_MTU, max_delay_ms: float = 0.0,
+                 sndbuf: int | None = None, background_flush: bool = False):
+        # :param encoding: "json" or "binary" (see wire_protocol).
+        # :param mtu: Maximum datagram payload in bytes.
+        # :param max_delay_ms: Latency budget for a queued binary message; 0 sends every message
+        #                      immediately. Ignored for JSON, which is never batched.
+        # :param sndbuf: Optional SO_SNDBUF for each socket.
+        # :param background_flush: Run a thread that enforces max_delay_ms when the caller goes idle.
+        self.codec = WireCodec(encoding, mtu=mtu)
+        self.mtu = mtu
+        self.max_delay_ns = int(max_delay_ms * 1e6) if self.codec.binary else 0
+        self.sndbuf = sndbuf
+        self._sockets = {}
+        self._batches = {}
+        self._lock = threading.Lock()
+        self.stats = {"messages": 0, "datagrams": 0, "bytes": 0, "send_errors": 0}
+
+        self._flusher = None
+        self._running = False
+        if background_flush and self.max_delay_ns > 0:
+            self._running = True
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _socket(self, dest):
+        sock = self._sockets.get(dest)
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if self.sndbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+            # Connected UDP skips the per-send route/address lookup
+            sock.connect(dest)
+            self._sockets[dest] = sock
+        return sock
+
+    def _send(self, dest, datagrams):
+        sock = self._socket(dest)
+        for data in datagrams:
+            try:
+                sock.send(data)
+                self.stats["datagrams"] += 1
+                self.stats["bytes"] += len(data)
+            except OSError:
+                # e.g. ECONNREFUSED reported by a previous datagram when nobody is listening
+                self.stats["send_errors"] += 1
+
+    def _encode(self, msg_type, items):
+        if self.codec.binary:
+            if msg_type == MSG_TICK:
+                return self.codec.encode_ticks(items)
+            return self.codec.encode_signals(items)
+        # One JSON object per datagram
+        return [json.dumps(item).encode("utf-8") for item in items]
+
+    def _capacity_reached(self, msg_type, batch):
+        return len(batch.items) >= max_records(msg_type, self.mtu)
+
+    def _enqueue(self, msg_type, message, dest):
+        key = (dest, msg_type)
+        with self._lock:
+            self.stats["messages"] += 1
+            if self.max_delay_ns == 0:
+                self._send(dest, self._encode(msg_type, [message]))
+                return
+
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch()
+            if not batch.items:
+                batch.first_ns = time.perf_counter_ns()
+            batch.items.append(message)
+
+            if self._capacity_reached(msg_type, batch) or time.perf_counter_ns() - batch.first_ns >= self.max_delay_ns:
+                self._flush_batch(key, batch)
+
+    def _flush_batch(self, key, batch):
+        if not batch.items:
+            return
+        dest, msg_type = key
+        self._send(dest, self._encode(msg_type, batch.items))
+        batch.items = []
+
+    # Public API
+    def send_tick(self, tick: dict, dest):
+        self._enqueue(MSG_TICK, tick, dest)
+
+    def send_signal(self, signal: dict, dest):
+        self._enqueue(MSG_SIGNAL, signal, dest)
+
+    def flush(self, dest=None):
+        # Send everything queued (for one destination, or all).
+        with self._lock:
+            for key, batch in self._batches.items():
+                if dest is None or key[0] == dest:
+                    self._flush_batch(key, batch)
+
+    def poll(self):
+        # Flush only batches whose oldest message has exceeded the latency budget.
+        now = time.perf_counter_ns()
+        with self._lock:
+            for key, batch in self._batches.items():
+                if batch.items and now - batch.first_ns >= self.max_delay_ns:
+                    self._flush_batch(key, batch)
+
+    def _flush_loop(self):
+        interval = max(self.max_delay_ns / 2e9, 0.0001)
+        while self._running:
+            time.sleep(interval)
+            self.poll()
+
+    def close(self):
+        self._running = False
+        if self._flusher:
+            self._flusher.join()
+        self.flush()
+        for sock in self._sockets.values():
+            sock.close()
+        self._sockets.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Example usage
+if __name__ == "__main__":
+    dest = ("127.0.0.1", 9001)
+    with UDPTransport(encoding="binary", max_delay_ms=1.0) as transport:
+        start = time.perf_counter()
+        for i in range(50_000):
+            transport.send_signal({"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1}, dest)
+        transport.flush()
+        elapsed = time.perf_counter() - start
+        print(f"[INFO] {transport.stats['messages']:,} signals in {transport.stats['datagrams']:,} datagrams, "
+              f"{transport.stats['messages'] / elapsed:,.0f} msg/sec")
@@ -0,0 +1,261 @@
+# Fixed-layout binary wire protocol for market ticks and trade signals.
+# JSON stays available as a fallback: each sender picks its encoding when it is built
+# (JSON by default, which the C++ receivers parse), and receivers auto-detect every
+# datagram by its first bytes, so binary and JSON senders can share a port.
+#
+# Datagram layout (little-endian), mirrored in cpp_engine/include/wire_protocol.hpp:
+#   Header (8 bytes): magic "HF" | version u8 | msg_type u8 | count u16 | record_size u16
+#   Body:             count fixed-size records of record_size bytes
+#
+# TICK record (40 bytes):   seq u64 | ts_ns i64 | price f64 | volume f64   | symbol_id u32 | flags u32
+# SIGNAL record (40 bytes): seq u64 | ts_ns i64 | price f64 | quantity f64 | symbol_id u32 | action u8 | pad[3]
+
+import json
+import struct
+import time
+import zlib
+
+import numpy as np
+
+MAGIC = b"HF"
+VERSION = 1
+
+MSG_TICK = 1
+MSG_SIGNAL = 2
+
+HEADER = struct.Struct("<2sBBHH")
+
+# Everything decode() can raise on a malformed datagram; listeners catch these, count the
+# datagram as bad and keep serving
+DECODE_ERRORS = (ValueError, struct.error, KeyError)
+
+TICK_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("ts_ns", "<i8"),
+    ("price", "<f8"),
+    ("volume", "<f8"),
+    ("symbol_id", "<u4"),
+    ("flags", "<u4"),
+])
+
+SIGNAL_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("ts_ns", "<i8"),
+    ("price", "<f8"),
+    ("quantity", "<f8"),
+    ("symbol_id", "<u4"),
+    ("action", "u1"),
+    ("pad", "V3"),
+])
+
+DTYPES = {MSG_TICK: TICK_DTYPE, MSG_SIGNAL: SIGNAL_DTYPE}
+
+# Signal action codes (same ordering as the LSTM classes)
+ACTIONS = {"SELL": 0, "HOLD": 1, "BUY": 2}
+ACTION_NAMES = {v: k for k, v in ACTIONS.items()}
+
+# Encodings in order of preference
+ENCODING_BINARY = f"binary/{VERSION}"
+ENCODING_JSON = "json"
+SUPPORTED_ENCODINGS = [ENCODING_BINARY, ENCODING_JSON]
+
+DEFAULT_MTU = 1400
+
+
+def symbol_id(symbol: str) -> int:
+    # Stable 32-bit id for a symbol, identical in every process without coordination.
+    return zlib.crc32(symbol.upper().encode("ascii"))
+
+
+class SymbolTable:
+    # Maps symbol ids back to names on the decoding side.
+    def __init__(self, symbols=("BTCUSDT", "ETHUSDT", "SOLUSDT", "AAPL")):
+        self.names = {}
+        for s in symbols:
+            self.register(s)
+
+    def register(self, symbol: str) -> int:
+        sid = symbol_id(symbol)
+        self.names[sid] = symbol.upper()
+        return sid
+
+    def name(self, sid: int) -> str:
+        return self.names.get(int(sid), f"#{int(sid)}")
+
+
+# Epoch magnitude -> unit: values below each bound are taken to be in that unit.
+# Any date between 1973 and 2286 is classified correctly (e.g. now is ~1.8e9 s,
+# ~1.8e12 ms, ~1.8e15 us, ~1.8e18 ns).
+EPOCH_UNITS = ((1e11, 1_000_000_000), (1e14, 1_000_000), (1e17, 1_000))
+
+
+def to_ns(value) -> int:
+    # Normalise a tick timestamp to int nanoseconds.
+    # Accepts datetime strings or epoch s / ms (Binance "T" field) / us / ns, told apart by
+    # magnitude; None -> now.
+    if value is None:
+        return time.time_ns()
+    if isinstance(value, str):
+        return int(np.datetime64(value.replace(" ", "T"), "ns").astype(np.int64))
+    if not isinstance(value, (int, np.integer)):
+        value = float(value)
+    for bound, scale in EPOCH_UNITS:
+        if abs(value) < bound:
+            return int(value * scale) if isinstance(value, float) else int(value) * scale
+    return int(value)   # already ns
+
+
+def max_records(msg_type: int, mtu: int = DEFAULT_MTU) -> int:
+    return max(1, (mtu - HEADER.size) // DTYPES[msg_type].itemsize)
+
+
+# Batch pack / unpack
+def pack_records(msg_type: int, records: np.ndarray) -> bytes:
+    # Pack a structured array of records into a single datagram.
+    return HEADER.pack(MAGIC, VERSION, msg_type, len(records), records.dtype.itemsize) + records.tobytes()
+
+
+def pack_datagrams(msg_type: int, records: np.ndarray, mtu: int = DEFAULT_MTU):
+    # Split records into as few datagrams as fit within mtu bytes.
+    step = max_records(msg_type, mtu)
+    return [pack_records(msg_type, records[i:i + step]) for i in range(0, len(records), step)]
+
+
+def unpack_records(datagram: bytes):
+    # :return: (msg_type, structured array view over the datagram body)
+    # Raises ValueError on anything that isn't a well-formed datagram.
+    if len(datagram) < HEADER.size:
+        raise ValueError(f"Datagram too short for a header ({len(datagram)} bytes)")
+    magic, version, msg_type, count, record_size = HEADER.unpack_from(datagram)
+    if magic != MAGIC:
+        raise ValueError("Not a binary datagram")
+    if version != VERSION:
+        raise ValueError(f"Unsupported wire version {version}")
+    dtype = DTYPES.get(msg_type)
+    if dtype is None or record_size != dtype.itemsize:
+        raise ValueError(f"Unknown record type {msg_type} / size {record_size}")
+    if len(datagram) < HEADER.size + count * record_size:
+        raise ValueError("Truncated datagram")
+    return msg_type, np.frombuffer(datagram, dtype=dtype, count=count, offset=HEADER.size)
+
+
+def is_binary(datagram: bytes) -> bool:
+    return datagram[:2] == MAGIC
+
+
+# Dict <-> record conversion
+def ticks_to_records(ticks, seq_start: int = 0) -> np.ndarray:
+    records = np.zeros(len(ticks), dtype=TICK_DTYPE)
+    records["seq"] = np.arange(seq_start, seq_start + len(ticks), dtype=np.uint64)
+    records["ts_ns"] = [to_ns(t.get("timestamp")) for t in ticks]
+    records["price"] = [t["price"] for t in ticks]
+    records["volume"] = [t["volume"] if "volume" in t else t.get("quantity", 0.0) for t in ticks]
+    records["symbol_id"] = [symbol_id(t["symbol"]) for t in ticks]
+    return records
+
+
+def signals_to_records(signals, seq_start: int = 0) -> np.ndarray:
+    records = np.zeros(len(signals), dtype=SIGNAL_DTYPE)
+    records["seq"] = np.arange(seq_start, seq_start + len(signals), dtype=np.uint64)
+    records["ts_ns"] = [to_ns(s.get("timestamp")) for s in signals]
+    records["price"] = [s.get("price", 0.0) for s in signals]
+    records["quantity"] = [s.get("quantity", 0.0) for s in signals]
+    records["symbol_id"] = [symbol_id(s["symbol"]) for s in signals]
+    records["action"] = [ACTIONS[s["action"].upper()] for s in signals]
+    return records
+
+
+def records_to_dicts(msg_type: int, records: np.ndarray, symbols: SymbolTable):
+    names = [symbols.name(sid) for sid in records["symbol_id"].tolist()]
+    seq = records["seq"].tolist()
+    ts = records["ts_ns"].tolist()
+    price = records["price"].tolist()
+    if msg_type == MSG_TICK:
+        return [
+            {"symbol": n, "price": p, "volume": v, "timestamp": t, "seq": q}
+            for n, p, v, t, q in zip(names, price, records["volume"].tolist(), ts, seq)
+        ]
+    actions = records["action"].tolist()
+    unknown = set(actions) - ACTION_NAMES.keys()
+    if unknown:
+        raise ValueError(f"Unknown signal action code(s) {sorted(unknown)}")
+    return [
+        {"action": ACTION_NAMES[a], "symbol": n, "price": p, "quantity": v, "timestamp": t, "seq": q}
+        for a, n, p, v, t, q in zip(actions, names, price, records["quantity"].tolist(), ts, seq)
+    ]
+
+
+class WireCodec:
+    # Encodes ticks and signals in one encoding; decodes either.
+    def __init__(self, encoding: str = ENCODING_JSON, symbols: SymbolTable | None = None, mtu: int = DEFAULT_MTU):
+        if encoding == "binary":
+            encoding = ENCODING_BINARY
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+        self.encoding = encoding
+        self.symbols = symbols or SymbolTable()
+        self.mtu = mtu
+        self._seq = {MSG_TICK: 0, MSG_SIGNAL: 0}
+
+    @property
+    def binary(self) -> bool:
+        return self.encoding == ENCODING_BINARY
+
+    def _next_seq(self, msg_type, n):
+        start = self._seq[msg_type]
+        self._seq[msg_type] = start + n
+        return start
+
+    def encode_ticks(self, ticks):
+        # :return: List of datagrams (one per tick for JSON, MTU-sized batches for binary).
+        if not self.binary:
+            return [json.dumps(t).encode("utf-8") for t in ticks]
+        for t in ticks:
+            self.symbols.register(t["symbol"])
+        records = ticks_to_records(ticks, self._next_seq(MSG_TICK, len(ticks)))
+        return pack_datagrams(MSG_TICK, records, self.mtu)
+
+    def encode_signals(self, signals):
+        if not self.binary:
+            return [json.dumps(s).encode("utf-8") for s in signals]
+        for s in signals:
+            self.symbols.register(s["symbol"])
+        records = signals_to_records(signals, self._next_seq(MSG_SIGNAL, len(signals)))
+        return pack_datagrams(MSG_SIGNAL, records, self.mtu)
+
+    def encode_tick_columns(self, ts_ns, symbol_ids, prices, volumes):
+        # Vectorised path for replay: build tick records straight from column arrays.
+        n = len(prices)
+        seq_start = self._next_seq(MSG_TICK, n)
+        records = np.zeros(n, dtype=TICK_DTYPE)
+        records["seq"] = np.arange(seq_start, seq_start + n, dtype=np.uint64)
+        records["ts_ns"] = ts_ns
+        records["price"] = prices
+        records["volume"] = volumes
+        records["symbol_id"] = symbol_ids
+        return pack_datagrams(MSG_TICK, records, self.mtu)
+
+    def decode(self, datagram: bytes):
+        # Decode any datagram (binary or JSON, single object or list) into a list of dicts.
+        if is_binary(datagram):
+            msg_type, records = unpack_records(datagram)
+            return records_to_dicts(msg_type, records, self.symbols)
+        message = json.loads(datagram.decode("utf-8"))
+        return message if isinstance(message, list) else [message]
+
+
+# Example usage
+if __name__ == "__main__":
+    ticks = [{"symbol": "BTCUSDT", "price": 42000.5 + i, "volume": 0.25, "timestamp": "2025-09-12 09:00:00"} for i in range(100)]
+
+    json_codec = WireCodec(ENCODING_JSON)
+    bin_codec = WireCodec(ENCODING_BINARY)
+
+    json_dgrams = json_codec.encode_ticks(ticks)
+    bin_dgrams = bin_codec.encode_ticks(ticks)
+    print(f"JSON:   {len(json_dgrams)} datagrams, {sum(map(len, json_dgrams))} bytes")
+    print(f"Binary: {len(bin_dgrams)} datagrams, {sum(map(len, bin_dgrams))} bytes")
+    print("Decoded:", bin_codec.decode(bin_dgrams[0])[0])
+
+    signal = bin_codec.encode_signals([{"action": "BUY", "symbol": "BTCUSDT", "quantity": 0.1}])[0]
+    print("Signal:", bin_codec.decode(signal))
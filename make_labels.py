@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+from data_feed.tick_store import load_frame
+from python_strategies.training.labeling import forward_returns, classify
 
 def make_labels(csv_path, threshold=0.00001):
     """
@@ -7,20 +9,11 @@ def make_labels(csv_path, threshold=0.00001):
     0 = SELL, 1 = HOLD, 2 = BUY
     threshold = relative change (%) to decide HOLD zone
     """
-    df = pd.read_csv(csv_path)
+    df = load_frame(csv_path)
 
     prices = df["price"].values
-    labels = []
-
-    for i in range(1, len(prices)):
-        delta = (prices[i] - prices[i-1]) / prices[i-1]
-
-        if delta > threshold:
-            labels.append(2)  # BUY
-        elif delta < -threshold:
-            labels.append(0)  # SELL
-        else:
-            labels.append(1)  # HOLD
+    # Row i is labeled by the move from the previous tick, i.e. the 1-tick forward return of row i-1
+    labels = classify(forward_returns(prices, (1,))[:-1, 0], threshold).astype(np.int64)
 
     # Align labels with dataframe length
     df = df.iloc[1:].copy()
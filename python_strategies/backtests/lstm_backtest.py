@@ -7,9 +7,10 @@ import numpy as np
 
 # Import your LSTM model
 from python_strategies.training.train_lstm import LSTMModel, TickDataset
+from data_feed.tick_store import load_frame
 
 def backtest_model(csv_path, model_path):
-    df = pd.read_csv(csv_path)
+    df = load_frame(csv_path)
     window_size = 20
 
     # Load trained model
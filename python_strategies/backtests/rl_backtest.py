@@ -4,6 +4,7 @@ import numpy as np
 from pathlib import Path
 from python_strategies.training.train_rl_agent import RLTrainer  # ensure class name matches your train_rl_agent.py
 from python_strategies.evaluation.backtest_report import BacktestReport
+from data_feed.tick_store import load_columns
 
 def backtest_model(csv_path=None, model_path=None):
     # Default paths
@@ -17,14 +18,14 @@ def backtest_model(csv_path=None, model_path=None):
     agent.model.load_state_dict(torch.load(model_path))
     agent.model.eval()
 
-    # Load dataset
-    df = pd.read_csv(csv_path)
-    prices = df["price"].values
-    volumes = df["volume"].values
+    # Load dataset (memory-mapped columns from the tick store)
+    cols = load_columns(csv_path)
+    prices = cols["price"]
+    volumes = cols["volume"]
 
     # Generate actions using RL agent
     actions = []
-    for i in range(len(df)):
+    for i in range(len(prices)):
         state = np.array([prices[i], volumes[i]], dtype=np.float32)
         action = agent.choose_action(state)
         actions.append(action)
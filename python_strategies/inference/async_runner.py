@@ -0,0 +1,123 @@
+# Runs strategies for many symbols on one asyncio event loop.
+# Ticks come from an AsyncTickSource (or anything with subscribe()/run()), each symbol
+# gets its own predictor and consumer task, and signals go out through an
+# AsyncDatagramEndpoint to the engine's signal port.
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from integration.wire_protocol import ACTION_NAMES
+
+
+def class_to_signal(prediction, tick, quantity=0.01):
+    # LSTM-style class (0 = SELL, 1 = HOLD, 2 = BUY) -> signal dict; None/HOLD -> no signal.
+    if prediction is None or prediction == 1:
+        return None
+    return {"action": ACTION_NAMES[int(prediction)], "symbol": tick["symbol"], "quantity": quantity,
+            "price": tick["price"]}
+
+
+class AsyncStrategyRunner:
+    def __init__(self, source, predictor_factory, endpoint, symbols=None, to_signal=class_to_signal,
+                 offload: bool = False, max_workers: int | None = None):
+        # :param predictor_factory: symbol -> object with predict(tick); one instance per symbol
+        #                           so stateful predictors keep separate buffers.
+        # :param endpoint: AsyncDatagramEndpoint (or anything with send_signal(dict)).
+        # :param to_signal: (prediction, tick) -> signal dict or None.
+        # :param offload: Run predict() in a thread pool so slow models don't stall the loop.
+        self.source = source
+        self.endpoint = endpoint
+        self.symbols = [s.upper() for s in (symbols or source.symbols)]
+        self.predictors = {s: predictor_factory(s) for s in self.symbols}
+        self.to_signal = to_signal
+        self.executor = ThreadPoolExecutor(max_workers) if offload else None
+        self.stats = {s: {"ticks": 0, "signals": 0, "errors": 0, "predict_ns": 0} for s in self.symbols}
+
+    async def _consume(self, symbol):
+        queue = self.source.subscribe(symbol)
+        predictor = self.predictors[symbol]
+        stats = self.stats[symbol]
+        loop = asyncio.get_running_loop()
+        while True:
+            tick = await queue.get()
+            # A failing tick is counted and skipped: a dead consumer would let its queue fill
+            # and then block the source's publish for every symbol.
+            try:
+                t0 = time.perf_counter_ns()
+                if self.executor is not None:
+                    prediction = await loop.run_in_executor(self.executor, predictor.predict, tick)
+                else:
+                    prediction = predictor.predict(tick)
+                stats["predict_ns"] += time.perf_counter_ns() - t0
+                stats["ticks"] += 1
+                signal = self.to_signal(prediction, tick)
+                if signal is not None:
+                    self.endpoint.send_signal(signal)
+                    stats["signals"] += 1
+            except Exception as exc:
+                stats["errors"] += 1
+                if stats["errors"] <= 10 or stats["errors"] % 1000 == 0:
+                    print(f"[ERROR] {symbol}: strategy failed on tick ({stats['errors']} failures so far): {exc!r}")
+
+    @staticmethod
+    def _on_consumer_done(task):
+        # Surface a consumer that died instead of leaving it to gather() at shutdown.
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Consumer {task.get_name()} stopped: {task.exception()!r}")
+
+    async def run(self):
+        # Run until the tick source finishes, then stop the consumers.
+        consumers = [asyncio.create_task(self._consume(s), name=f"consume-{s}") for s in self.symbols]
+        for task in consumers:
+            task.add_done_callback(self._on_consumer_done)
+        try:
+            await self.source.run()
+        finally:
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+
+    def report(self):
+        ticks = sum(s["ticks"] for s in self.stats.values())
+        signals = sum(s["signals"] for s in self.stats.values())
+        errors = sum(s["errors"] for s in self.stats.values())
+        predict_ns = sum(s["predict_ns"] for s in self.stats.values())
+        return {
+            "symbols": len(self.symbols),
+            "ticks": ticks,
+            "signals": signals,
+            "errors": errors,
+            "avg_predict_us": predict_ns / max(ticks, 1) / 1e3,
+        }
+
+
+# Example usage: 100 symbols, local stand-in feed, momentum toy predictor
+if __name__ == "__main__":
+    from data_feed.async_feed import AsyncTickSource, LocalFeedServer
+    from integration.async_ipc import signal_endpoint
+
+    class MomentumPredictor:
+        def __init__(self):
+            self.last = None
+
+        def predict(self, tick):
+            last, self.last = self.last, tick["price"]
+            if last is None:
+                return None
+            return 2 if tick["price"] > last else 0 if tick["price"] < last else 1
+
+    async def main():
+        symbols = [f"SYM{i:03d}USDT" for i in range(100)]
+        server = await LocalFeedServer(symbols, rate=10_000, duration=3.0).start()
+        source = AsyncTickSource(symbols, url=server.url)
+        endpoint = await signal_endpoint(encoding="binary")
+        runner = AsyncStrategyRunner(source, lambda s: MomentumPredictor(), endpoint)
+        await runner.run()
+        endpoint.close()
+        await server.stop()
+        print("[INFO] Runner report:", runner.report())
+
+    asyncio.run(main())
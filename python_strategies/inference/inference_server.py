@@ -0,0 +1,255 @@
+# Micro-batched inference service shared by many symbols and strategies.
+# Callers submit one input row and get a Future; a dispatcher thread per model
+# collects pending rows until max_batch_size is reached or the oldest request has
+# waited max_wait_ms, runs a single forward pass and resolves every Future.
+#
+#   server = InferenceServer(max_batch_size=64, max_wait_ms=2.0)
+#   lstm_endpoint(server)                       # registers "lstm"
+#   client = LSTMClient(server, "BTCUSDT")     # per-symbol window, same API as LSTMPredictor
+#   future = client.predict_async(tick)         # submit every symbol's tick, then wait on the futures
+#
+# Batching only pays off when requests overlap. A single thread calling the blocking
+# predict() (e.g. LiveDataLoader's default single dispatcher) submits one row at a time,
+# so every call waits the full max_wait_ms for a batch of 1; such callers should submit
+# with predict_async() and collect the futures, or call the model directly.
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+
+# Queueing-delay histogram bucket upper edges, microseconds
+DELAY_EDGES_US = np.array([10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000])
+
+
+class Histogram:
+    def __init__(self, edges):
+        self.edges = np.asarray(edges)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)   # last bucket: overflow
+
+    def record(self, values):
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side="left"), minlength=len(self.counts))
+
+    def percentile(self, q):
+        # Upper edge of the bucket holding the q-th percentile (inf for the overflow bucket).
+        total = self.counts.sum()
+        if total == 0:
+            return None
+        k = int(np.searchsorted(np.cumsum(self.counts), q / 100 * total, side="left"))
+        return float(self.edges[k]) if k < len(self.edges) else float("inf")
+
+    def to_dict(self):
+        labels = [f"<={e}" for e in self.edges.tolist()] + [f">{self.edges[-1]}"]
+        return {label: int(c) for label, c in zip(labels, self.counts) if c}
+
+
+class ModelEndpoint:
+    # One model behind a request queue and a dispatcher thread.
+    def __init__(self, name, model, max_batch_size, max_wait_ms, postprocess=None):
+        # :param model: Callable on a batched float32 tensor (B, ...) -> tensor (B, ...).
+        # :param postprocess: Batched output tensor -> per-row results (default: rows as numpy).
+        self.name = name
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ns = int(max_wait_ms * 1e6)
+        self.postprocess = postprocess
+        self.pending = deque()
+        self.cond = threading.Condition()
+        self.running = True
+        self.batch_sizes = Histogram(np.arange(1, max_batch_size + 1))
+        self.queue_delay = Histogram(DELAY_EDGES_US)
+        self.stats = {"requests": 0, "batches": 0, "errors": 0, "forward_ns": 0}
+        self.thread = threading.Thread(target=self._serve, name=f"inference-{name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, x) -> Future:
+        # Always copies x, so callers may reuse or overwrite their buffer right away.
+        future = Future()
+        x = np.array(x, dtype=np.float32, copy=True)
+        with self.cond:
+            if not self.running:
+                future.set_exception(RuntimeError(f"Endpoint {self.name} is stopped"))
+                return future
+            self.pending.append((x, future, time.perf_counter_ns()))
+            if len(self.pending) == 1 or len(self.pending) >= self.max_batch_size:
+                self.cond.notify()
+        return future
+
+    def _next_batch(self):
+        with self.cond:
+            while self.running and not self.pending:
+                self.cond.wait()
+            if not self.pending:
+                return None
+            # Wait for a full batch or the oldest request's deadline, whichever comes first
+            deadline = self.pending[0][2] + self.max_wait_ns
+            while self.running and len(self.pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter_ns()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining / 1e9)
+            n = min(len(self.pending), self.max_batch_size)
+            return [self.pending.popleft() for _ in range(n)]
+
+    def _serve(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.perf_counter_ns()
+            self.queue_delay.record([(started - t) / 1e3 for _, _, t in batch])
+            self.batch_sizes.record([len(batch)])
+            try:
+                with torch.no_grad():
+                    out = self.model(torch.from_numpy(np.stack([x for x, _, _ in batch])))
+                results = self.postprocess(out) if self.postprocess else out.numpy()
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as exc:
+                self.stats["errors"] += 1
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["forward_ns"] += time.perf_counter_ns() - started
+
+    def report(self):
+        batches = max(self.stats["batches"], 1)
+        return {
+            **self.stats,
+            "mean_batch": self.stats["requests"] / batches,
+            "mean_forward_us": self.stats["forward_ns"] / batches / 1e3,
+            "queue_delay_p50_us": self.queue_delay.percentile(50),
+            "queue_delay_p99_us": self.queue_delay.percentile(99),
+            "batch_size_hist": self.batch_sizes.to_dict(),
+            "queue_delay_hist_us": self.queue_delay.to_dict(),
+        }
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join()
+
+
+class InferenceServer:
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        # :param max_batch_size: Upper bound on rows per forward pass.
+        # :param max_wait_ms: Longest a request waits for the batch to fill.
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.endpoints = {}
+
+    def register(self, name, model, postprocess=None, max_batch_size=None, max_wait_ms=None):
+        self.endpoints[name] = ModelEndpoint(name, model, max_batch_size or self.max_batch_size,
+                                             self.max_wait_ms if max_wait_ms is None else max_wait_ms, postprocess)
+        return self.endpoints[name]
+
+    def submit(self, name, x) -> Future:
+        return self.endpoints[name].submit(x)
+
+    def report(self):
+        return {name: endpoint.report() for name, endpoint in self.endpoints.items()}
+
+    def stop(self):
+        for endpoint in self.endpoints.values():
+            endpoint.stop()
+
+
+def argmax_rows(out):
+    return out.argmax(dim=1).tolist()
+
+
+def lstm_endpoint(server: InferenceServer, model_path=None, name="lstm"):
+    from python_strategies.inference.predict_lstm import LSTMModel, MODEL_PATH
+    model = LSTMModel(input_size=2)
+    model.load_state_dict(torch.load(model_path or MODEL_PATH, map_location=torch.device("cpu")))
+    model.eval()
+    return server.register(name, model, postprocess=argmax_rows)
+
+
+def rl_endpoint(server: InferenceServer, model_path=None, name="rl"):
+    from python_strategies.inference.predict_rl import QNetwork, MODEL_PATH
+    model = QNetwork()
+    model.load_state_dict(torch.load(model_path or MODEL_PATH, map_location=torch.device("cpu")))
+    model.eval()
+    return server.register(name, model, postprocess=argmax_rows)
+
+
+class LSTMClient:
+    # Per-symbol LSTM predictor whose forward passes go through the server.
+    def __init__(self, server: InferenceServer, symbol: str, window_size: int = 20, endpoint: str = "lstm"):
+        self.server = server
+        self.symbol = symbol
+        self.endpoint = endpoint
+        self.window_size = window_size
+        # Same double-written ring as LSTMPredictor
+        self.ring = np.zeros((2 * window_size, 2), dtype=np.float32)
+        self.count = 0
+
+    def predict_async(self, tick) -> Future | None:
+        # Future of the signal (0 = SELL, 1 = HOLD, 2 = BUY), or None while the window fills.
+        i = self.count % self.window_size
+        self.ring[i] = self.ring[i + self.window_size] = (tick["price"], tick["volume"])
+        self.count += 1
+        if self.count < self.window_size:
+            return None
+        # submit() copies the window out of the ring, so later ticks can't change it
+        return self.server.submit(self.endpoint, self.ring[i + 1 : i + 1 + self.window_size])
+
+    def predict(self, tick):
+        # Blocking; only batches when several threads call it at once (see the header).
+        future = self.predict_async(tick)
+        return None if future is None else future.result()
+
+
+class RLClient:
+    # RLPredictor counterpart: action 0 = BUY, 1 = SELL, 2 = HOLD.
+    def __init__(self, server: InferenceServer, symbol: str, endpoint: str = "rl"):
+        self.server = server
+        self.symbol = symbol
+        self.endpoint = endpoint
+
+    def predict_async(self, tick) -> Future:
+        return self.server.submit(self.endpoint, (tick["price"], tick["volume"]))
+
+    def predict(self, tick):
+        # Blocking; only batches when several threads call it at once (see the header).
+        return self.predict_async(tick).result()
+
+
+# Example: 200 symbols, each tick's LSTM and RL signals through one server
+if __name__ == "__main__":
+    from concurrent.futures import wait
+
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i:03d}USDT" for i in range(200)]
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, (60, len(symbols))), axis=0))
+
+    server = InferenceServer(max_batch_size=128, max_wait_ms=2.0)
+    lstm_endpoint(server)
+    rl_endpoint(server)
+    lstm = {s: LSTMClient(server, s) for s in symbols}
+    rl = {s: RLClient(server, s) for s in symbols}
+
+    started = time.perf_counter()
+    requests = 0
+    for row in prices:
+        futures = []
+        for symbol, price in zip(symbols, row.tolist()):
+            tick = {"symbol": symbol, "price": price, "volume": 0.5}
+            futures.append(rl[symbol].predict_async(tick))
+            f = lstm[symbol].predict_async(tick)
+            if f is not None:
+                futures.append(f)
+        wait(futures)
+        requests += len(futures)
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] {requests:,} predictions in {elapsed:.2f}s ({requests / elapsed:,.0f}/sec)")
+    for name, report in server.report().items():
+        print(f"[INFO] {name}: {report}")
+    server.stop()
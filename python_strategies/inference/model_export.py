@@ -0,0 +1,222 @@
+# CPU inference variants of LSTMModel and QNetwork.
+# export_variants() writes, next to the trained state_dict:
+#   <stem>.ts.pt        TorchScript (traced) model
+#   <stem>.int8.ts.pt   dynamically int8-quantized (LSTM/Linear weights), traced
+#   <stem>.variants.json  per-variant latency and parity, measured at export (or first load) time
+# load_fastest() returns the fastest variant whose signals agree with the eager model
+# on recorded ticks, reusing the report's benchmark while it is current.
+
+import json
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from data_feed.tick_store import load_columns
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+MODEL_FILES = {"lstm": MODELS_DIR / "lstm_model.pt", "rl": MODELS_DIR / "rl_agent.pt"}
+RECORDED_TICKS = Path(__file__).resolve().parents[2] / "data_feed" / "raw_data" / "btc_usdt.csv"
+VARIANTS = ("int8", "script", "eager")   # preferred order when latencies tie
+LSTM_WINDOW = 20
+
+
+def variant_path(model_path, variant) -> Path:
+    model_path = Path(model_path)
+    suffix = {"script": ".ts.pt", "int8": ".int8.ts.pt"}[variant]
+    return model_path.with_name(model_path.stem + suffix)
+
+
+def load_eager(kind, model_path=None):
+    if kind == "lstm":
+        from python_strategies.inference.predict_lstm import LSTMModel
+        model = LSTMModel(input_size=2)
+    elif kind == "rl":
+        from python_strategies.training.train_rl_agent import QNetwork
+        model = QNetwork()
+    else:
+        raise ValueError(f"Unknown model kind: {kind}")
+    model.load_state_dict(torch.load(model_path or MODEL_FILES[kind], map_location=torch.device("cpu")))
+    return model.eval()
+
+
+def recorded_inputs(kind, csv_path=RECORDED_TICKS, window=LSTM_WINDOW) -> torch.Tensor:
+    # Model inputs built from recorded ticks: (N, window, 2) LSTM windows or (N, 2) RL states.
+    cols = load_columns(csv_path)
+    data = np.stack((cols["price"], cols["volume"]), axis=1).astype(np.float32)
+    if kind == "lstm":
+        data = np.ascontiguousarray(np.lib.stride_tricks.sliding_window_view(data, window, axis=0).swapaxes(1, 2))
+    return torch.from_numpy(data)
+
+
+def _quantize(model):
+    with warnings.catch_warnings():
+        # Eager dynamic quantization is deprecated in favour of torchao, which we don't ship
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def _trace(model, example):
+    return torch.jit.trace(model, example).eval()
+
+
+def _jit_load(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return torch.jit.load(str(path), map_location="cpu").eval()
+
+
+def measure_latency(model, example, warmup=20, iters=200) -> float:
+    # Median single-call latency in microseconds, after warm-up (first calls JIT-optimise).
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(example)
+        samples = np.empty(iters)
+        for i in range(iters):
+            t0 = time.perf_counter_ns()
+            model(example)
+            samples[i] = time.perf_counter_ns() - t0
+    return float(np.median(samples) / 1e3)
+
+
+def parity(model, reference, inputs) -> dict:
+    # Output deviation and argmax (signal) agreement against the eager model.
+    with torch.no_grad():
+        out, ref = model(inputs), reference(inputs)
+    return {
+        "max_abs_diff": float((out - ref).abs().max()),
+        "signal_agreement": float((out.argmax(dim=1) == ref.argmax(dim=1)).float().mean()),
+    }
+
+
+def export_variants(kind, model_path=None, csv_path=RECORDED_TICKS) -> dict:
+    model_path = Path(model_path or MODEL_FILES[kind])
+    eager = load_eager(kind, model_path)
+    inputs = recorded_inputs(kind, csv_path)
+    example = inputs[:1]
+
+    with warnings.catch_warnings():
+        # torch.jit is deprecated upstream but remains the portable CPU deployment format
+        warnings.simplefilter("ignore", FutureWarning)
+        torch.jit.save(torch.jit.freeze(_trace(eager, example)), str(variant_path(model_path, "script")))
+        torch.jit.save(_trace(_quantize(eager), example), str(variant_path(model_path, "int8")))
+
+    report = {"kind": kind, "source": model_path.name, "source_mtime_ns": model_path.stat().st_mtime_ns, "variants": {}}
+    for variant in VARIANTS:
+        model = eager if variant == "eager" else _jit_load(variant_path(model_path, variant))
+        report["variants"][variant] = {"latency_us": measure_latency(model, example), **parity(model, eager, inputs)}
+    _report_path(model_path).write_text(json.dumps(report, indent=2))
+    return report
+
+
+def _report_path(model_path) -> Path:
+    return model_path.with_name(model_path.stem + ".variants.json")
+
+
+def _fresh_report(model_path):
+    # Benchmark report (from export or an earlier load), if it was produced from the current state_dict.
+    path = _report_path(model_path)
+    if not path.exists():
+        return None
+    report = json.loads(path.read_text())
+    return report if report.get("source_mtime_ns") == model_path.stat().st_mtime_ns else None
+
+
+def _is_current(model_path, variant) -> bool:
+    # A variant file is usable only if it exists and was written after the state_dict.
+    if variant == "eager":
+        return True
+    path = variant_path(model_path, variant)
+    return path.exists() and path.stat().st_mtime_ns >= model_path.stat().st_mtime_ns
+
+
+def _example(kind) -> torch.Tensor:
+    # Single-row input for warm-up passes.
+    return torch.zeros((1, LSTM_WINDOW, 2) if kind == "lstm" else (1, 2))
+
+
+def _load(kind, variant, model_path):
+    return load_eager(kind, model_path) if variant == "eager" else _jit_load(variant_path(model_path, variant))
+
+
+def load_fastest(kind, model_path=None, csv_path=RECORDED_TICKS, min_agreement=0.99, verbose=True):
+    # (model, info): the lowest-latency variant whose signals agree with the eager model on
+    # at least min_agreement of the recorded ticks. Variants older than the state_dict are
+    # never used. The benchmark is cached in <stem>.variants.json: with a fresh report only
+    # the chosen variant is loaded and warmed up; otherwise every available variant is
+    # measured on the recorded ticks and the report is written for the next load.
+    model_path = Path(model_path or MODEL_FILES[kind])
+    started = time.perf_counter()
+    available = [v for v in ("eager", "script", "int8") if _is_current(model_path, v)]
+
+    report = _fresh_report(model_path)
+    if report is not None:
+        ranked = sorted((v for v in available if report["variants"].get(v, {}).get("signal_agreement", 0) >= min_agreement),
+                        key=lambda v: report["variants"][v]["latency_us"] or float("inf"))
+        for variant in ranked:
+            try:
+                model = _load(kind, variant, model_path)
+            except RuntimeError as exc:
+                print(f"[WARN] Could not load {variant_path(model_path, variant).name}: {exc}")
+                continue
+            measure_latency(model, _example(kind), iters=1)   # warm-up only
+            info = {"variant": variant, "load_seconds": time.perf_counter() - started,
+                    "candidates": report["variants"], "cached": True}
+            if verbose:
+                print(f"[INFO] Using {kind} variant '{variant}' (cached benchmark); "
+                      f"loaded and warmed up in {info['load_seconds']:.2f}s")
+            return model, info
+
+    eager = load_eager(kind, model_path)
+    inputs = recorded_inputs(kind, csv_path)
+    example = inputs[:1]
+    results, models = {}, {"eager": eager}
+    for variant in available:
+        try:
+            model = models.get(variant) or _jit_load(variant_path(model_path, variant))
+        except RuntimeError as exc:
+            print(f"[WARN] Could not load {variant_path(model_path, variant).name}: {exc}")
+            continue
+        # measure_latency doubles as the warm-up pass
+        results[variant] = {"latency_us": measure_latency(model, example), **parity(model, eager, inputs)}
+        models[variant] = model
+    _report_path(model_path).write_text(json.dumps(
+        {"kind": kind, "source": model_path.name, "source_mtime_ns": model_path.stat().st_mtime_ns,
+         "variants": results}, indent=2))
+
+    eligible = [v for v in results if results[v]["signal_agreement"] >= min_agreement] or ["eager"]
+    best = min(eligible, key=lambda v: results[v]["latency_us"])
+    info = {"variant": best, "load_seconds": time.perf_counter() - started, "candidates": results, "cached": False}
+    if verbose:
+        print(f"[INFO] Using {kind} variant '{best}' (agreement {results[best]['signal_agreement']:.3f}); "
+              f"loaded and warmed up in {info['load_seconds']:.2f}s")
+    return models[best], info
+
+
+def load_variant(kind, variant="auto", model_path=None):
+    # Model for a predictor: "auto" picks via load_fastest(), otherwise the named variant, warmed up.
+    # A named variant older than the state_dict is not used: the eager model is loaded instead.
+    if variant == "auto":
+        return load_fastest(kind, model_path)[0]
+    model_path = Path(model_path or MODEL_FILES[kind])
+    if not _is_current(model_path, variant):
+        print(f"[WARN] {variant_path(model_path, variant).name} is missing or older than {model_path.name}; "
+              f"using the eager model (re-run export_variants to refresh it)")
+        variant = "eager"
+    model = _load(kind, variant, model_path)
+    measure_latency(model, _example(kind), iters=1)
+    return model
+
+
+# Example Usage
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    for kind in ("lstm", "rl"):
+        report = export_variants(kind)
+        for variant, r in report["variants"].items():
+            print(f"[INFO] {kind:<4} {variant:<6} {r['latency_us']:8.1f} us | max |diff| {r['max_abs_diff']:.2e} | agreement {r['signal_agreement']:.3f}")
+        load_fastest(kind)
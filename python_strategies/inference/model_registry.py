@@ -0,0 +1,297 @@
+# Versioned model registry with hot swapping for live predictors.
+# Layout under python_strategies/models/registry:
+#   <kind>/v0001/model.pt      state_dict (plus .ts.pt / .int8.ts.pt if exported)
+#   <kind>/v0001/meta.json     version, digest, source, created, metrics, notes
+#   <kind>/LATEST.json         {"version": 1}; replaced atomically by publish() / rollback()
+#
+# A ModelWatcher polls LATEST.json in a background thread. When it points at a version
+# the predictor isn't running, the watcher loads and warms that model off the feed
+# thread and stages it on the predictor; the predictor installs it at the start of its
+# next predict() call, so the swap lands between ticks and the tick buffer is kept.
+#
+#   registry = ModelRegistry()
+#   registry.publish("lstm", "python_strategies/models/lstm_model.pt", metrics={"val_loss": 0.41})
+#   predictor = LSTMPredictor()
+#   ModelWatcher(predictor, "lstm").start()
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import torch
+
+from python_strategies.inference.model_export import (
+    MODELS_DIR, MODEL_FILES, export_variants, load_eager, load_variant, measure_latency, recorded_inputs,
+)
+
+REGISTRY_DIR = MODELS_DIR / "registry"
+MODEL_FILE = "model.pt"
+META = "meta.json"
+LATEST = "LATEST.json"
+
+
+def _digest(path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path, obj):
+    # Write-then-rename so readers never see a partial file.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(obj, indent=2, default=str))
+    os.replace(tmp, path)
+
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _kind_dir(self, kind) -> Path:
+        if kind not in MODEL_FILES:
+            raise ValueError(f"Unknown model kind: {kind}")
+        path = self.root / kind
+        path.mkdir(exist_ok=True)
+        return path
+
+    def path(self, kind, version) -> Path:
+        return self._kind_dir(kind) / f"v{int(version):04d}" / MODEL_FILE
+
+    def versions(self, kind) -> list[int]:
+        return sorted(int(p.name[1:]) for p in self._kind_dir(kind).glob("v[0-9]*") if (p / META).exists())
+
+    def meta(self, kind, version) -> dict:
+        return json.loads((self.path(kind, version).parent / META).read_text())
+
+    def latest(self, kind) -> int | None:
+        try:
+            return json.loads((self._kind_dir(kind) / LATEST).read_text())["version"]
+        except FileNotFoundError:
+            return None
+
+    def publish(self, kind, model_path, metrics=None, notes=None, export=False, make_latest=True) -> dict:
+        # Copy a trained state_dict into the next version and (by default) point LATEST at it.
+        # :param export: Also write the TorchScript / int8 variants next to it (see model_export).
+        model_path = Path(model_path)
+        load_eager(kind, model_path)   # refuse artifacts that don't load as this kind
+        kind_dir = self._kind_dir(kind)
+        tmp = Path(tempfile.mkdtemp(prefix=".staging-", dir=kind_dir))
+        try:
+            shutil.copy2(model_path, tmp / MODEL_FILE)
+            if export:
+                export_variants(kind, tmp / MODEL_FILE)
+            meta = {
+                "kind": kind,
+                "source": str(model_path),
+                "digest": _digest(tmp / MODEL_FILE),
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "metrics": metrics or {},
+                "notes": notes,
+            }
+            # Claim the next free version; a concurrent publisher just pushes us one further
+            while True:
+                version = max(self.versions(kind), default=0) + 1
+                meta["version"] = version
+                (tmp / META).write_text(json.dumps(meta, indent=2, default=str))
+                try:
+                    os.rename(tmp, self.path(kind, version).parent)
+                    break
+                except OSError:
+                    continue
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        if make_latest:
+            self.set_latest(kind, version)
+        print(f"[INFO] Published {kind} v{version} from {model_path}")
+        return meta
+
+    def set_latest(self, kind, version):
+        if not self.path(kind, version).exists():
+            raise FileNotFoundError(f"No {kind} v{version} in {self.root}")
+        _write_json(self._kind_dir(kind) / LATEST, {"version": int(version), "updated": time.time()})
+
+    def rollback(self, kind, version=None) -> int:
+        # Point LATEST at version (default: the one before the current latest).
+        if version is None:
+            older = [v for v in self.versions(kind) if v < (self.latest(kind) or 0)]
+            if not older:
+                raise ValueError(f"No {kind} version to roll back to")
+            version = older[-1]
+        self.set_latest(kind, version)
+        print(f"[INFO] {kind} LATEST -> v{version}")
+        return version
+
+    def prune(self, kind, keep=5):
+        # Delete all but the newest `keep` versions; the LATEST version is always kept.
+        latest = self.latest(kind)
+        for version in self.versions(kind)[:-keep] if keep else self.versions(kind):
+            if version != latest:
+                shutil.rmtree(self.path(kind, version).parent, ignore_errors=True)
+
+
+class SwappableModel:
+    # Mixin for predictors: a model staged by another thread is installed at the start of
+    # the next predict(), never in the middle of one.
+    staged = None
+    model_version = None
+    _swap_lock = threading.Lock()   # shared by all predictors; only taken when a model is staged
+
+    def stage_model(self, model, version=None):
+        with self._swap_lock:
+            self.staged = (model, version)
+
+    def install_staged(self) -> bool:
+        # Called from predict(); the fast path is a single attribute check.
+        if self.staged is None:
+            return False
+        with self._swap_lock:
+            (self.model, self.model_version), self.staged = self.staged, None
+        self.on_model_swap()
+        return True
+
+    def on_model_swap(self):
+        # Hook for model-dependent state (e.g. a carried LSTM hidden state).
+        pass
+
+
+class ModelWatcher:
+    def __init__(self, predictor: SwappableModel, kind, registry: ModelRegistry | None = None, variant=None,
+                 poll_s: float = 1.0, on_swap=None):
+        # :param predictor: LSTMPredictor / RLPredictor (anything with stage_model()).
+        # :param variant: None for the eager model, or "auto" / "script" / "int8" (see model_export).
+        # :param poll_s: Seconds between LATEST.json checks.
+        # :param on_swap: Called with the new version's meta after it is staged.
+        self.predictor = predictor
+        self.kind = kind
+        self.registry = registry or ModelRegistry()
+        # The stateful LSTM path steps model.lstm directly, so it needs the eager module
+        self.variant = None if getattr(predictor, "stateful", False) else variant
+        self.poll_s = poll_s
+        self.on_swap = on_swap
+        self.current = predictor.model_version
+        self.failed = set()
+        self.history = []
+        self.last_mtime = None
+        self.running = False
+        self.thread = None
+
+    def load(self, version):
+        # Load and warm up a version; raises if it doesn't produce sane outputs.
+        path = self.registry.path(self.kind, version)
+        model = load_variant(self.kind, self.variant, path) if self.variant else load_eager(self.kind, path)
+        example = recorded_inputs(self.kind)[:1]
+        latency_us = measure_latency(model, example, iters=20)
+        with torch.no_grad():
+            out = model(example)
+        if out.shape != (1, 3) or not torch.isfinite(out).all():
+            raise ValueError(f"unexpected output {tuple(out.shape)}")
+        return model, latency_us
+
+    def check(self) -> bool:
+        # One poll: stage the LATEST version if it differs from the running one.
+        latest_file = self.registry.root / self.kind / LATEST
+        try:
+            mtime = latest_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.last_mtime:
+            return False
+        self.last_mtime = mtime
+        version = self.registry.latest(self.kind)
+        if version is None or version == self.current or version in self.failed:
+            return False
+
+        started = time.perf_counter()
+        try:
+            model, latency_us = self.load(version)
+        except Exception as exc:
+            # Keep serving the current model; don't retry this version
+            self.failed.add(version)
+            print(f"[WARN] {self.kind} v{version} rejected, staying on v{self.current}: {exc}")
+            return False
+        self.predictor.stage_model(model, version)
+        event = {"from": self.current, "to": version, "load_seconds": time.perf_counter() - started,
+                 "warm_latency_us": latency_us, "staged_at": time.time()}
+        self.history.append(event)
+        self.current = version
+        print(f"[INFO] Staged {self.kind} v{version} ({event['load_seconds']:.2f}s to load and warm, "
+              f"{latency_us:.0f} us/call)")
+        if self.on_swap:
+            self.on_swap(self.registry.meta(self.kind, version))
+        return True
+
+    def _watch(self):
+        while self.running:
+            try:
+                self.check()
+            except Exception as exc:
+                print(f"[ERROR] Model watcher: {exc}")
+            time.sleep(self.poll_s)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._watch, name=f"model-watcher-{self.kind}", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+
+# Example Usage:
+#   python -m python_strategies.inference.model_registry publish lstm [path]
+#   python -m python_strategies.inference.model_registry rollback lstm [version]
+#   python -m python_strategies.inference.model_registry list
+#   python -m python_strategies.inference.model_registry          (hot-swap demo on recorded ticks)
+if __name__ == "__main__":
+    import sys
+    from data_feed.tick_store import load_columns
+    from python_strategies.inference.model_export import RECORDED_TICKS
+    from python_strategies.inference.predict_lstm import LSTMPredictor
+
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else "demo"
+    if command == "publish":
+        registry.publish(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else MODEL_FILES[sys.argv[2]])
+    elif command == "rollback":
+        registry.rollback(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    elif command == "list":
+        for kind in MODEL_FILES:
+            latest = registry.latest(kind)
+            for version in registry.versions(kind):
+                meta = registry.meta(kind, version)
+                print(f"{kind:<4} v{version:04d}{' *' if version == latest else '  '} {meta['created']} "
+                      f"{meta['digest'][:12]} {meta['metrics']}")
+    else:
+        if registry.latest("lstm") is None:
+            registry.publish("lstm", MODEL_FILES["lstm"], notes="seeded from lstm_model.pt")
+        predictor = LSTMPredictor(stateful=True, verbose=False)
+        watcher = ModelWatcher(predictor, "lstm", registry, poll_s=0.2)
+        watcher.check()   # start on the registry's latest version
+        watcher.start()
+
+        cols = load_columns(RECORDED_TICKS)
+        ticks = [{"price": p, "volume": v} for p, v in zip(cols["price"].tolist(), cols["volume"].tolist())]
+        # Simulate a retrain landing mid-stream from another thread
+        threading.Timer(1.0, registry.publish, ("lstm", MODEL_FILES["lstm"]), {"notes": "demo republish"}).start()
+        gaps, worst_us = 0, 0.0
+        for tick in ticks * 100:
+            t0 = time.perf_counter_ns()
+            signal = predictor.predict(tick)
+            worst_us = max(worst_us, (time.perf_counter_ns() - t0) / 1e3)
+            gaps += signal is None and predictor.count >= predictor.window_size
+            time.sleep(100e-6)
+        watcher.stop()
+        print(f"[INFO] Running v{predictor.model_version} | swaps {watcher.history} | "
+              f"missing signals after warm-up: {gaps} | worst predict {worst_us:.0f} us")
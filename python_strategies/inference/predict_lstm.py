@@ -4,9 +4,12 @@
 import torch
 import torch.nn as nn
 import numpy as np
+import sys
+import time
 from pathlib import Path
 from python_strategies.training.train_lstm import LSTMModel
 from data_feed.live_data_loader import LiveDataLoader 
+from python_strategies.inference.model_registry import SwappableModel
 
 # Path to saved model
 MODEL_PATH = Path(__file__).resolve().parent.parent / "models" / "lstm_model.pt"
@@ -24,47 +27,122 @@ class LSTMModel(nn.Module):
         return torch.softmax(out, dim=1)  # 3-class probabilities
 
 
-class LSTMPredictor:
-    def __init__(self, model_path=MODEL_PATH, window_size=20):
+class LSTMPredictor(SwappableModel):
+    def __init__(self, model_path=MODEL_PATH, window_size=20, stateful=False, resync_every=None, verbose=True,
+                 variant=None):
+        # :param stateful: Advance the LSTM one step per tick, carrying (h, c) between ticks,
+        #                  instead of rerunning the whole window every tick.
+        # :param resync_every: In stateful mode, rebuild the state from the full window every
+        #                      this many ticks (default: window_size) so it stays anchored
+        #                      to the same history the model was trained on.
+        # :param variant: "auto", "script", "int8" or "eager" to use an exported variant
+        #                 (see model_export); the stateful path always needs the eager LSTM.
         self.model = LSTMModel(input_size=2)
         self.model.load_state_dict(torch.load(model_path, map_location=torch.device("cpu")))
         self.model.eval()
+        if variant is not None and not stateful:
+            from python_strategies.inference.model_export import load_variant
+            self.model = load_variant("lstm", variant, model_path)
         self.window_size = window_size
-        self.buffer = []  # Rolling Window of ticks
+        # Rolling window of ticks: each row is written twice (i and i + window_size), so
+        # the latest window is always the contiguous slice ring[i + 1 : i + 1 + window_size]
+        self.ring = np.zeros((2 * window_size, 2), dtype=np.float32)
+        self.count = 0
+        self.stateful = stateful
+        self.resync_every = resync_every or window_size
+        self.state = None
+        self.steps_since_resync = 0
+        self.verbose = verbose
         print(f"[INFO] Loaded LSTM model from {model_path}")
 
+    def push(self, tick):
+        i = self.count % self.window_size
+        self.ring[i] = self.ring[i + self.window_size] = (tick["price"], tick["volume"])
+        self.count += 1
+
+    def window(self):
+        i = (self.count - 1) % self.window_size
+        return self.ring[i + 1 : i + 1 + self.window_size]
+
     def preprocess(self, tick): 
         # Append tick to buffer and prepare sequence.
-        self.buffer.append([tick["price"], tick["volume"]]) 
-        if len(self.buffer) < self.window_size: 
+        self.push(tick)
+        if self.count < self.window_size: 
             return None 
-        seq = np.array(self.buffer[-self.window_size:], dtype=np.float32) 
-        return torch.tensor(seq, dtype=torch.float32).unsqueeze(0) 
+        return torch.from_numpy(self.window()).unsqueeze(0)
+
+    def _run(self, seq, state=None):
+        # LSTM over seq from state (zeros if None) -> (probs, new state).
+        out, state = self.model.lstm(seq, state)
+        return torch.softmax(self.model.fc(out[:, -1, :]), dim=1), state
     
+    def on_model_swap(self):
+        # The carried (h, c) belongs to the old weights; the next tick rebuilds it from the window
+        self.state = None
+
     def predict(self, tick): 
         # Run inference on live tick stream.
+        self.install_staged()
         seq = self.preprocess(tick) 
         if seq is None: 
             return None 
         with torch.no_grad(): 
-            probs = self.model(seq).squeeze().numpy()  # [p_sell, p_hold, p_buy]
-            signal = int(np.argmax(probs))             # 0, 1, or 2
-        print(f"[LSTM] Tick={tick} | Probs={probs} | Signal={signal}") 
+            if not self.stateful:
+                probs = self.model(seq)
+            elif self.state is None or self.steps_since_resync >= self.resync_every:
+                probs, self.state = self._run(seq)
+                self.steps_since_resync = 0
+            else:
+                probs, self.state = self._run(seq[:, -1:, :], self.state)
+                self.steps_since_resync += 1
+            probs = probs.squeeze().numpy()   # [p_sell, p_hold, p_buy]
+            signal = int(np.argmax(probs))    # 0, 1, or 2
+        if self.verbose:
+            print(f"[LSTM] Tick={tick} | Probs={probs} | Signal={signal}") 
         return signal
 
 
+def latency_report(ticks, model_path=MODEL_PATH, window_size=20, resync_every=None):
+    # Per-tick predict() latency of the full-window and stateful paths on the same ticks,
+    # plus how often their signals agree.
+    results = {}
+    signals = {}
+    for name, stateful in (("window", False), ("stateful", True)):
+        predictor = LSTMPredictor(model_path, window_size, stateful=stateful, resync_every=resync_every, verbose=False)
+        latencies = np.empty(len(ticks))
+        out = []
+        for k, tick in enumerate(ticks):
+            t0 = time.perf_counter_ns()
+            out.append(predictor.predict(tick))
+            latencies[k] = time.perf_counter_ns() - t0
+        latencies = latencies[window_size:] / 1e3   # steady state only, in us
+        results[name] = {"p50_us": float(np.percentile(latencies, 50)), "p99_us": float(np.percentile(latencies, 99))}
+        signals[name] = np.array(out[window_size:])
+    results["speedup_p50"] = results["window"]["p50_us"] / results["stateful"]["p50_us"]
+    results["signal_agreement"] = float((signals["window"] == signals["stateful"]).mean())
+    return results
+
+
 # Example live integration 
 if __name__ == "__main__": 
-    predictor = LSTMPredictor() 
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        # python -m python_strategies.inference.predict_lstm bench
+        torch.set_num_threads(1)
+        rng = np.random.default_rng(0)
+        prices = 26000 * np.exp(np.cumsum(rng.normal(0, 1e-4, 5000)))
+        ticks = [{"symbol": "BTCUSDT", "price": p, "volume": v} for p, v in zip(prices, rng.uniform(0.01, 1.0, 5000))]
+        print("[INFO] Latency report:", latency_report(ticks))
+        sys.exit(0)
+
+    predictor = LSTMPredictor(stateful=True) 
     
     def handle_tick(tick): 
         predictor.predict(tick) 
     
-    loader = LiveDataLoader(symbol="btcusdt") 
+    loader = LiveDataLoader(symbols=["btcusdt"]) 
     loader.register_callback(handle_tick) 
     loader.start() 
     
-    import time
     time.sleep(10)
     loader.stop()
     print("[INFO] Stopped after 10 seconds")
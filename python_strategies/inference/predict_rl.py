@@ -5,22 +5,29 @@ import numpy as np
 from pathlib import Path
 from python_strategies.training.train_rl_agent import QNetwork
 from data_feed.live_data_loader import LiveDataLoader
+from python_strategies.inference.model_registry import SwappableModel
 
 MODEL_PATH = Path(__file__).resolve().parent.parent / "models" / "rl_agent.pt"
 
-class RLPredictor:
-    def __init__(self, model_path = MODEL_PATH):
-        self.model = QNetwork()
-        self.model.load_state_dict(torch.load(model_path, map_location= torch.device("cpu")))
-        self.model.eval()
+class RLPredictor(SwappableModel):
+    def __init__(self, model_path = MODEL_PATH, variant=None):
+        # :param variant: "auto", "script", "int8" or "eager" to use an exported variant (see model_export).
+        if variant is not None:
+            from python_strategies.inference.model_export import load_variant
+            self.model = load_variant("rl", variant, model_path)
+        else:
+            self.model = QNetwork()
+            self.model.load_state_dict(torch.load(model_path, map_location= torch.device("cpu")))
+            self.model.eval()
         print(f"[INFO] Loaded RL agent from {model_path}")
         
     def preprocess(self, tick: dict):
-        return torch.tensor([tick["price"], tick["volume"]], dtype=torch.float32)
+        return torch.tensor([[tick["price"], tick["volume"]]], dtype=torch.float32)
     
     def predict(self, tick: dict) -> int:
         # Run inference on a single tick.
         # Returns action: 0 = BUY, 1= SELL, 2= HOLD
+        self.install_staged()
         state = self.preprocess(tick)
         with torch.no_grad():
             q_values = self.model(state)
@@ -30,12 +37,12 @@ class RLPredictor:
     
 # Example
 if __name__ == "__main__":
-    predictor = RLPredictor()
+    predictor = RLPredictor(variant="auto")
     
     def handle_tick(tick): 
         predictor.predict(tick) 
     
-    loader = LiveDataLoader(symbol="btcusdt") 
+    loader = LiveDataLoader(symbols=["btcusdt"]) 
     loader.register_callback(handle_tick) 
     loader.start() 
     
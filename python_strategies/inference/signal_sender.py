@@ -1,18 +1,19 @@
 # Emulates trade signal generation and sends them to the C++ HFT engine via UDP.
 
 import socket
-import json
 import random
 import time
+from integration.wire_protocol import WireCodec, ENCODING_JSON
 
 SIGNAL_PORT = 9001
 HOST = "127.0.01"
 
 class SignalSender:
-    def __init__(self, host: str = HOST, port: int = SIGNAL_PORT):
+    def __init__(self, host: str = HOST, port: int = SIGNAL_PORT, encoding: str = ENCODING_JSON):
         self.host = host
         self.port = port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.codec = WireCodec(encoding)
         
     def send_signal(self, action: str, symbol: str, quantity: float):
         # Send a trade signal to the C++ engine.
@@ -21,8 +22,8 @@ class SignalSender:
         # :param quantity: Trade quantity
         
         signal = {"action": action, "symbol": symbol, "quantity": quantity}
-        message = json.dumps(signal).encode("utf-8")
-        self.sock.sendto(message, (self.host, self.port))
+        for message in self.codec.encode_signals([signal]):
+            self.sock.sendto(message, (self.host, self.port))
         print(f"[SIGNAL] Sent: {signal}")
         
     def random_signal(self, symbol: str = "BTCUSDT"):
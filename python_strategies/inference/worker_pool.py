@@ -0,0 +1,310 @@
+# Out-of-process inference for the live feed.
+# Each worker is a separate process with its own GIL running the LSTM or RL model on
+# its shard of symbols. The model weights are loaded once in the parent and moved to
+# shared memory (Module.share_memory()), so workers map the same pages instead of
+# each holding a copy. Ticks go to a worker through a SharedMemoryIPC ring of
+# TICK_DTYPE records; signals come back on a second ring of SIGNAL_DTYPE records and a
+# collector thread in the parent hands them to the registered callbacks.
+#
+#   pool = InferenceWorkerPool("lstm", workers=2)
+#   pool.register_callback(on_signal)     # signal dicts, as records_to_dicts(MSG_SIGNAL, ...)
+#   pool.attach(loader)                   # LiveDataLoader callback; submit() never blocks on a model
+#   ...
+#   pool.report(); pool.stop()
+#
+# submit() only copies one record into a ring, so model latency no longer delays the
+# feed thread. When a worker falls behind and its ring is full the tick is dropped and
+# counted rather than stalling the feed.
+
+import os
+import threading
+import time
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from integration.shared_memory import SharedMemoryIPC
+from integration.wire_protocol import TICK_DTYPE, SIGNAL_DTYPE, MSG_SIGNAL, ACTIONS, symbol_id, to_ns, records_to_dicts
+from python_strategies.inference.inference_server import Histogram, DELAY_EDGES_US
+from python_strategies.inference.model_export import load_eager
+
+# Model output class -> wire action code
+ACTION_CODES = {
+    "lstm": np.array([ACTIONS["SELL"], ACTIONS["HOLD"], ACTIONS["BUY"]], dtype=np.uint8),
+    "rl": np.array([ACTIONS["BUY"], ACTIONS["SELL"], ACTIONS["HOLD"]], dtype=np.uint8),  # 0 = BUY, 1 = SELL, 2 = HOLD
+}
+
+# Shared per-worker counters (int64 slots of the stats array)
+STAT_TICKS, STAT_SIGNALS, STAT_BATCHES, STAT_BUSY_NS = range(4)
+
+
+class _Windows:
+    # Per-symbol double-written rings (as in LSTMPredictor) inside a worker.
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self.rings = {}
+        self.counts = {}
+
+    def push(self, sid, price, volume):
+        # Latest window for sid as a view, or None while it fills.
+        ring = self.rings.get(sid)
+        if ring is None:
+            ring = self.rings[sid] = np.zeros((2 * self.window_size, 2), dtype=np.float32)
+            self.counts[sid] = 0
+        i = self.counts[sid] % self.window_size
+        ring[i] = ring[i + self.window_size] = (price, volume)
+        self.counts[sid] += 1
+        if self.counts[sid] < self.window_size:
+            return None
+        return ring[i + 1 : i + 1 + self.window_size]
+
+
+def _serve(kind, model, tick_ring, signal_ring, window_size, max_batch, stats, ready, stop, torch_threads, poll_s):
+    # Worker process main loop: drain ticks, one forward pass per drained batch, publish signals.
+    torch.set_num_threads(torch_threads)
+    ticks_in = SharedMemoryIPC(tick_ring, dtype=TICK_DTYPE)
+    signals_out = SharedMemoryIPC(signal_ring, dtype=SIGNAL_DTYPE)
+    codes = ACTION_CODES[kind]
+    windows = _Windows(window_size) if kind == "lstm" else None
+    batch = np.empty((max_batch, window_size, 2), dtype=np.float32) if windows else None
+    with torch.no_grad():
+        # Warm-up pass so the first live tick doesn't pay for lazy initialisation
+        model(torch.zeros((1, window_size, 2) if windows else (1, 2)))
+    ready.set()
+
+    with torch.no_grad():
+        while not stop.is_set():
+            if not ticks_in.wait(timeout=0.1, strategy="sleep", sleep_s=poll_s):
+                continue
+            ticks = ticks_in.read_batch(max_batch)
+            started = time.perf_counter_ns()
+            if windows is not None:
+                rows = []
+                for k, (sid, price, volume) in enumerate(zip(ticks["symbol_id"].tolist(), ticks["price"].tolist(),
+                                                             ticks["volume"].tolist())):
+                    window = windows.push(sid, price, volume)
+                    if window is not None:
+                        batch[len(rows)] = window
+                        rows.append(k)
+                scored = ticks[rows]
+                inputs = batch[:len(rows)]
+            else:
+                scored = ticks
+                inputs = np.stack((ticks["price"], ticks["volume"]), axis=1).astype(np.float32)
+
+            if len(scored):
+                actions = model(torch.from_numpy(inputs)).argmax(dim=1).numpy()
+                out = np.zeros(len(scored), dtype=SIGNAL_DTYPE)
+                for field in ("seq", "ts_ns", "price", "symbol_id"):
+                    out[field] = scored[field]
+                out["action"] = codes[actions]
+                # Signals carry no size; position sizing is left to the strategy
+                written = 0
+                while written < len(out) and not stop.is_set():
+                    written += signals_out.write_batch(out[written:])
+                    if written < len(out):
+                        time.sleep(poll_s)   # signal ring full: the collector is draining it
+            stats[STAT_TICKS] += len(ticks)
+            stats[STAT_SIGNALS] += len(scored)
+            stats[STAT_BATCHES] += 1
+            stats[STAT_BUSY_NS] += time.perf_counter_ns() - started
+
+    ticks_in.close()
+    signals_out.close()
+
+
+class InferenceWorkerPool:
+    def __init__(self, kind: str = "lstm", workers: int = 2, model_path=None, window_size: int = 20,
+                 capacity: int = 8192, max_batch: int = 256, torch_threads: int = 1, poll_us: float = 50.0,
+                 start_timeout: float = 60.0):
+        # :param kind: "lstm" or "rl".
+        # :param workers: Worker processes; symbols are sharded across them by symbol id.
+        # :param capacity: Slots in each tick / signal ring (ticks in flight per worker).
+        # :param max_batch: Most ticks a worker takes per forward pass.
+        # :param torch_threads: Intra-op threads per worker; keep workers * threads <= cores.
+        # :param poll_us: Idle poll interval of workers and the collector.
+        # :param start_timeout: Seconds to wait for every worker to load and warm up.
+        self.kind = kind
+        self.workers = workers
+        self.poll_s = poll_us / 1e6
+        self.callbacks = []
+        self.names = {}
+
+        # Weights live in shared memory; workers receive handles, not copies
+        self.model = load_eager(kind, model_path)
+        self.model.share_memory()
+
+        ctx = mp.get_context("spawn")
+        self.stop_event = ctx.Event()
+        prefix = f"hft_pool_{os.getpid()}_{id(self) & 0xffff:x}"
+        self.tick_rings, self.signal_rings, self.stats, self.ready, self.processes = [], [], [], [], []
+        for w in range(workers):
+            self.tick_rings.append(SharedMemoryIPC(f"{prefix}_t{w}", capacity=capacity, dtype=TICK_DTYPE))
+            self.signal_rings.append(SharedMemoryIPC(f"{prefix}_s{w}", capacity=capacity, dtype=SIGNAL_DTYPE))
+            self.stats.append(ctx.RawArray("q", 4))
+            self.ready.append(ctx.Event())
+            self.processes.append(ctx.Process(
+                target=_serve, name=f"inference-worker-{w}", daemon=True,
+                args=(kind, self.model, self.tick_rings[w].name, self.signal_rings[w].name, window_size,
+                      max_batch, self.stats[w], self.ready[w], self.stop_event, torch_threads, self.poll_s)))
+        for p in self.processes:
+            p.start()
+
+        # Send time of every in-flight tick, by per-worker sequence number. Ticks in flight are
+        # bounded by the two rings, so 2 * capacity slots are never overwritten too early.
+        ring_capacity = self.tick_rings[0].capacity
+        self.seq = [0] * workers
+        self.sent_ns = np.zeros((workers, 2 * ring_capacity), dtype=np.int64)
+        self.sent_mask = 2 * ring_capacity - 1
+        self.dropped = [0] * workers
+        # Each tick ring has one producer side, but submit() may be called from several feed
+        # threads (e.g. LiveDataLoader's per-symbol dispatchers); a per-worker lock serialises
+        # the staging slot, the sequence number and the ring write for that worker
+        self.records = [np.zeros(1, dtype=TICK_DTYPE) for _ in range(workers)]
+        self.locks = [threading.Lock() for _ in range(workers)]
+        self.lag = [Histogram(DELAY_EDGES_US) for _ in range(workers)]
+        self.running = True
+        self.collector = threading.Thread(target=self._collect, name="inference-collector", daemon=True)
+        self.collector.start()
+        # Spawned workers re-import torch; don't hand out the pool until they can take ticks
+        for w, ready in enumerate(self.ready):
+            if not ready.wait(timeout=start_timeout):
+                self.stop()
+                raise RuntimeError(f"Inference worker {w} did not start within {start_timeout}s")
+        self.started = time.perf_counter()
+        print(f"[INFO] Started {workers} {kind} inference workers (shared weights, ring capacity {ring_capacity})")
+
+    def register_callback(self, callback):
+        # callback(signal) with signal = {"action", "symbol", "price", "quantity", "timestamp", "seq"}.
+        self.callbacks.append(callback)
+
+    def attach(self, loader):
+        loader.register_callback(self.submit)
+        return self
+
+    def submit(self, tick) -> bool:
+        # Hand one tick to its symbol's worker; False if that worker's ring is full (tick dropped).
+        # Safe to call from several threads.
+        sid = symbol_id(tick["symbol"])
+        if sid not in self.names:
+            self.names[sid] = tick["symbol"].upper()
+        w = sid % self.workers
+        fields = (to_ns(tick.get("timestamp")), tick["price"],
+                  tick["volume"] if "volume" in tick else tick.get("quantity", 0.0), sid, 0)
+        with self.locks[w]:
+            record = self.records[w]
+            seq = self.seq[w]
+            record[0] = (seq, *fields)
+            self.sent_ns[w, seq & self.sent_mask] = time.perf_counter_ns()
+            if self.tick_rings[w].write_batch(record) == 0:
+                self.dropped[w] += 1
+                return False
+            self.seq[w] = seq + 1
+        return True
+
+    def _collect(self):
+        # Parent-side thread: drain signal rings, record lag, run callbacks.
+        symbols = self.signal_rings[0].symbols
+        while self.running:
+            idle = True
+            for w, ring in enumerate(self.signal_rings):
+                records = ring.read_batch()
+                if len(records) == 0:
+                    continue
+                idle = False
+                now = time.perf_counter_ns()
+                sent = self.sent_ns[w, records["seq"].astype(np.int64) & self.sent_mask]
+                self.lag[w].record((now - sent) / 1e3)
+                if not self.callbacks:
+                    continue
+                symbols.names.update(self.names)
+                for signal in records_to_dicts(MSG_SIGNAL, records, symbols):
+                    for callback in self.callbacks:
+                        try:
+                            callback(signal)
+                        except Exception as exc:
+                            print(f"[ERROR] Signal callback failed: {exc}")
+            if idle:
+                time.sleep(self.poll_s)
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        # Wait until every submitted tick has been processed and its signal collected.
+        deadline = time.perf_counter() + timeout
+        while any(len(r) for r in self.tick_rings + self.signal_rings) or \
+                any(s[STAT_TICKS] < seq for s, seq in zip(self.stats, self.seq)):
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(1e-3)
+        return True
+
+    def report(self):
+        # Per-worker throughput, backlog and submit-to-signal lag.
+        elapsed = time.perf_counter() - self.started
+        report = {}
+        for w in range(self.workers):
+            ticks, signals, batches, busy_ns = self.stats[w][:]
+            report[f"worker-{w}"] = {
+                "alive": self.processes[w].is_alive(),
+                "submitted": self.seq[w],
+                "dropped": self.dropped[w],
+                "ticks": ticks,
+                "signals": signals,
+                "backlog": len(self.tick_rings[w]),
+                "ticks_per_sec": ticks / elapsed,
+                "mean_batch": ticks / max(batches, 1),
+                "utilisation": busy_ns / 1e9 / elapsed,
+                "lag_p50_us": self.lag[w].percentile(50),
+                "lag_p99_us": self.lag[w].percentile(99),
+                "lag_hist_us": self.lag[w].to_dict(),
+            }
+        return report
+
+    def stop(self):
+        self.stop_event.set()
+        for p in self.processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self.running = False
+        self.collector.join()
+        for ring in self.tick_rings + self.signal_rings:
+            ring.close()
+            ring.unlink()
+        print("[INFO] Inference workers stopped")
+
+
+# Example: 50 symbols through two LSTM workers, then the live feed
+if __name__ == "__main__":
+    import sys
+    from collections import Counter
+    from data_feed.live_data_loader import LiveDataLoader
+
+    kind = sys.argv[1] if len(sys.argv) > 1 else "lstm"
+    pool = InferenceWorkerPool(kind, workers=2)
+    actions = Counter()
+    pool.register_callback(lambda signal: actions.update([signal["action"]]))
+
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i:02d}USDT" for i in range(50)]
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, (400, len(symbols))), axis=0))
+    started = time.perf_counter()
+    for row in prices:
+        for symbol, price in zip(symbols, row.tolist()):
+            pool.submit({"symbol": symbol, "price": price, "volume": 0.5})
+    submit_s = time.perf_counter() - started
+    pool.drain()
+    total_s = time.perf_counter() - started
+    print(f"[INFO] {prices.size:,} ticks submitted in {submit_s:.2f}s "
+          f"({submit_s / prices.size * 1e6:.1f} us/tick on the feed thread), processed in {total_s:.2f}s")
+    print(f"[INFO] Signals: {dict(actions)}")
+    for worker, stats in pool.report().items():
+        print(f"[INFO] {worker}: {stats}")
+
+    loader = LiveDataLoader(symbols=["btcusdt", "ethusdt"])
+    pool.attach(loader)
+    pool.register_callback(lambda signal: print(f"[SIGNAL] {signal}"))
+    loader.start()
+    time.sleep(10)
+    loader.stop()
+    pool.stop()
@@ -0,0 +1,90 @@
+# Benchmark: DQN training steps/sec with the previous deque replay buffer and
+# per-sample Bellman loop versus the array-backed buffer and batched target.
+# Usage: python -m python_strategies.training.bench_replay [steps]
+
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import torch
+
+from python_strategies.training.train_rl_agent import RLTrainer
+
+
+class DequeReplayBuffer:
+    # Previous implementation, kept here only as the benchmark baseline.
+    def __init__(self, capacity=50000):
+        self.buffer = deque(maxlen=capacity)
+
+    def push(self, state, action, reward, next_state):
+        self.buffer.append((state, action, reward, next_state))
+
+    def sample(self, batch_size):
+        batch = random.sample(self.buffer, batch_size)
+        states, actions, rewards, next_states = zip(*batch)
+        return (
+            torch.from_numpy(np.array(states, dtype=np.float32)),
+            torch.tensor(actions, dtype=torch.long),
+            torch.tensor(rewards, dtype=torch.float32),
+            torch.from_numpy(np.array(next_states, dtype=np.float32))
+        )
+
+    def __len__(self):
+        return len(self.buffer)
+
+
+class LoopTrainer(RLTrainer):
+    # RLTrainer with the previous per-sample Bellman target loop.
+    def __init__(self):
+        super().__init__()
+        self.buffer = DequeReplayBuffer()
+
+    def train_step(self):
+        if len(self.buffer) < self.batch_size:
+            return None
+        states, actions, rewards, next_states = self.buffer.sample(self.batch_size)
+        q_values = self.model(states)
+        next_q_values = self.target_model(next_states)
+        q_target = q_values.clone()
+        for i in range(self.batch_size):
+            q_target[i, actions[i]] = rewards[i] + self.gamma * torch.max(next_q_values[i])
+        loss = self.loss_fn(q_values, q_target.detach())
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+        return loss.item()
+
+
+def run(trainer, prices, volumes, batch_size):
+    # Same loop as RLTrainer.train without logging; returns steps/sec.
+    trainer.batch_size = batch_size
+    started = time.perf_counter()
+    for i in range(len(prices) - 1):
+        state = np.array([prices[i], volumes[i]], dtype=np.float32)
+        next_state = np.array([prices[i + 1], volumes[i + 1]], dtype=np.float32)
+        action = trainer.choose_action(state)
+        reward = trainer.compute_reward(prices[i], prices[i + 1], action)
+        trainer.buffer.push(state, action, reward, next_state)
+        trainer.train_step()
+        if i % 200 == 0:
+            trainer.update_target_network()
+        if trainer.epsilon > trainer.epsilon_min:
+            trainer.epsilon *= trainer.epsilon_decay
+    return (len(prices) - 1) / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = np.random.default_rng(0)
+    prices = 100 + np.cumsum(rng.normal(0, 0.05, steps + 1))
+    volumes = rng.uniform(0.01, 2.0, steps + 1)
+
+    for batch_size in (16, 256):
+        before = run(LoopTrainer(), prices, volumes, batch_size)
+        after = run(RLTrainer(), prices, volumes, batch_size)
+        prioritized = run(RLTrainer(prioritized=True), prices, volumes, batch_size)
+        print(f"[BENCH] batch={batch_size:>3}: deque + loop {before:,.0f} steps/sec | "
+              f"ring + batched {after:,.0f} steps/sec ({after / before:.1f}x) | prioritized {prioritized:,.0f} steps/sec")
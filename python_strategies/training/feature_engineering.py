@@ -1,24 +1,42 @@
 # Transforms raw market ticks into ML-ready feature vectors.
 # Used by noth LSTM training and RL agent training.
 
+import json
+import math
+from collections import deque
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
+FEATURE_COLUMNS = ["price", "quantity", "log_return", "volatility", "volume_pressure", "price_change"]
+STATE_VERSION = 1
+# Bump whenever feature definitions change, so cached features are recomputed
+FEATURE_VERSION = 1
+
+
+def feature_state_path(model_path) -> Path:
+    # Fitted feature state lives next to the model: lstm_model.pt -> lstm_model.features.json
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.stem + ".features.json")
+
+
 class FeatureEngineer:
-    def __init__(self, window: int = 20):
+    def __init__(self, window: int = 20, scaler: dict | None = None):
         # :param window: Number of past ticks to compute rolling features.
+        # :param scaler: Frozen min-max parameters {column: [min, max]} (see fit()).
+        #                Without it, normalize() uses the min/max of the frame it is given.
         self.window = window
+        self.scaler = scaler
         
     def add_returns(self, df: pd.DataFrame):
         # Add to returns.
-        df["log_return"] = np.log(df["price"] / df["price"].shift(1))
-        df["log_return"].fillna(0, inplace=True)
+        df["log_return"] = np.log(df["price"] / df["price"].shift(1)).fillna(0)
         return df
     
     def add_volatility(self, df: pd.DataFrame):
         # Rolling volatility
-        df["volatility"] = df["log_return"].rolling(self.window).std()
-        df["volatility"].fillna(0, inplace=True)
+        df["volatility"] = df["log_return"].rolling(self.window).std().fillna(0)
         return df
     
     def add_volume_pressure(self, df: pd.DataFrame):
@@ -37,48 +55,206 @@ class FeatureEngineer:
         return df
     
     def normalize(self, df: pd.DataFrame, columns=None):
-        # Min-max normalization.
+        # Min-max normalization (frozen parameters if fitted).
         if columns is None:
-            columns = ["price", "quantity", "log_return", "volatility", "volume_pressure", "price_change"]
+            columns = FEATURE_COLUMNS
         
         for col in columns:
             if col in df.columns:
-                min_val = df[col].min()
-                max_val = df[col].max()
+                if self.scaler is not None and col in self.scaler:
+                    min_val, max_val = self.scaler[col]
+                else:
+                    min_val = df[col].min()
+                    max_val = df[col].max()
                 df[col] = (df[col] - min_val) / (max_val - min_val + 1e-9)
             
         return df
     
-    def build_features(self, df: pd.DataFrame):
-        # Full feature pipeline.
-        # Input: Raw dataframe with columns [timestamp, price, quantity]
-        # Output: ML-ready dataframe with engineered features.
+    def raw_features(self, df: pd.DataFrame):
+        # Feature pipeline without normalization.
         df = df.copy()
+        if "quantity" not in df.columns and "volume" in df.columns:
+            df["quantity"] = df["volume"]
         
         df = self.add_returns(df)
         df = self.add_volatility(df)
         df = self.add_volume_pressure(df)
         df = self.add_price_change(df)
-        df = self.normalize(df)
-        
         return df
     
-    def to_sequences(self, df: pd.DataFrame, seq_len: int = 20):
+    def build_features(self, df: pd.DataFrame):
+        # Full feature pipeline.
+        # Input: Raw dataframe with columns [timestamp, price, quantity]
+        # Output: ML-ready dataframe with engineered features.
+        return self.normalize(self.raw_features(df))
+    
+    def config(self) -> dict:
+        # Everything that determines build_features output (used as a cache key).
+        return {"engineer": type(self).__name__, "version": FEATURE_VERSION, "window": self.window, "scaler": self.scaler}
+    
+    def fit(self, df: pd.DataFrame):
+        # Freeze normalization parameters on training data, so later frames (and the
+        # online engine) are scaled exactly as the model saw them.
+        raw = self.raw_features(df)
+        self.scaler = {col: [float(raw[col].min()), float(raw[col].max())] for col in FEATURE_COLUMNS}
+        return self
+    
+    def save_state(self, path):
+        # Write the fitted state (pass feature_state_path(model_path) to keep it next to the model).
+        if self.scaler is None:
+            raise ValueError("FeatureEngineer is not fitted; call fit() first")
+        state = {"version": STATE_VERSION, "window": self.window, "columns": FEATURE_COLUMNS, "scaler": self.scaler}
+        Path(path).write_text(json.dumps(state, indent=2))
+    
+    @classmethod
+    def load_state(cls, path):
+        state = json.loads(Path(path).read_text())
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported feature state version: {state.get('version')}")
+        return cls(window=state["window"], scaler=state["scaler"])
+    
+    def online(self, resync_every: int = 10_000):
+        # Streaming engine producing the same (normalized) features tick by tick.
+        if self.scaler is None:
+            raise ValueError("FeatureEngineer is not fitted; call fit() first")
+        return OnlineFeatureEngineer(self.window, self.scaler, resync_every)
+    
+    def to_sequences(self, df: pd.DataFrame, seq_len: int = 20, dtype=None, copy: bool = False):
         # Convert dataframe into LSTM sequences.
         # Returns X (features) and y (labels).
-        
-        feature_cols = ["price", "quantity", "log_return", "volatility", "volume_pressure", "price_change"]
-        
-        X, y = [], []
-        data = df[feature_cols].values
-        labels = (df["price"].shift(-1) > df["price"]).astype(int).values # 1 = upward
-        
-        for i in range(len(df) - seq_len - 1):
-            X.append(data[i:i + seq_len])
-            y.append(labels[i + seq_len])
-            
-        return np.array(X), np.array(y)
+        # X is a read-only strided view over the feature matrix (no per-window copies);
+        # pass copy=True for a contiguous array, dtype=np.float32/np.float16 to shrink storage.
+        windows = self.windows(df, seq_len, dtype)
+        if copy:
+            return np.ascontiguousarray(windows.X), windows.y.copy()
+        return windows.X, windows.y
+    
+    def windows(self, df: pd.DataFrame, seq_len: int = 20, dtype=None):
+        # Lazy, indexable sequence windows over the feature columns of df.
+        data = df[FEATURE_COLUMNS].to_numpy(dtype=dtype)
+        price = df["price"].to_numpy()
+        # Window i covers rows [i, i + seq_len); its label is whether the next price goes up
+        labels = (price[seq_len + 1:] > price[seq_len:-1]).astype(np.int64)  # 1 = upward
+        return SequenceWindows(data, seq_len, labels)
     
+
+def sliding_windows(data: np.ndarray, seq_len: int) -> np.ndarray:
+    # Read-only view of shape (len(data) - seq_len + 1, seq_len, n_features); window i is data[i:i + seq_len].
+    data = np.asarray(data)
+    if len(data) < seq_len:
+        return np.empty((0, seq_len) + data.shape[1:], dtype=data.dtype)
+    view = np.lib.stride_tricks.sliding_window_view(data, seq_len, axis=0)
+    # sliding_window_view appends the window axis last; move it next to the window index
+    return np.moveaxis(view, -1, 1)
+
+
+class SequenceWindows:
+    # Sequence windows over a feature matrix without materializing them.
+    # Indexing returns views: windows[i] -> (seq_len, n_features), windows[a:b] -> (b - a, seq_len, n_features).
+    def __init__(self, data: np.ndarray, seq_len: int, labels: np.ndarray):
+        self.data = data
+        self.seq_len = seq_len
+        self.y = labels
+        self.X = sliding_windows(data, seq_len)[:len(labels)]
+
+    def __len__(self):
+        return len(self.y)
+
+    def __getitem__(self, index):
+        return self.X[index], self.y[index]
+
+    @property
+    def nbytes(self):
+        # Memory actually held (the underlying matrix), not the size of the virtual X.
+        return self.data.nbytes + self.y.nbytes
+
+    def batches(self, batch_size: int = 4096, indices=None):
+        # Yield contiguous (X, y) batches, in order or for the given indices.
+        if indices is None:
+            for start in range(0, len(self), batch_size):
+                yield np.ascontiguousarray(self.X[start:start + batch_size]), self.y[start:start + batch_size]
+        else:
+            indices = np.asarray(indices)
+            for start in range(0, len(indices), batch_size):
+                idx = indices[start:start + batch_size]
+                yield self.X[idx], self.y[idx]
+
+
+class OnlineFeatureEngineer:
+    # Incremental counterpart of FeatureEngineer.build_features: O(1) work per tick.
+    # Rolling volatility keeps a running mean / sum of squared deviations over the
+    # window (sliding Welford update), recomputed from the window every resync_every
+    # ticks so floating-point drift can't accumulate over a long session.
+    def __init__(self, window: int, scaler: dict, resync_every: int = 10_000):
+        self.window = window
+        self.resync_every = resync_every
+        mins = np.array([scaler[c][0] for c in FEATURE_COLUMNS])
+        maxs = np.array([scaler[c][1] for c in FEATURE_COLUMNS])
+        self._min = mins
+        self._scale = 1.0 / (maxs - mins + 1e-9)
+        self.reset()
+
+    def reset(self):
+        self._last_price = None
+        self._returns = deque(maxlen=self.window)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ticks = 0
+
+    def _push_return(self, r):
+        n = len(self._returns)
+        if n < self.window:
+            self._returns.append(r)
+            delta = r - self._mean
+            self._mean += delta / (n + 1)
+            self._m2 += delta * (r - self._mean)
+        else:
+            old = self._returns[0]
+            self._returns.append(r)
+            mean = self._mean + (r - old) / self.window
+            self._m2 += (r - old) * (r - mean + old - self._mean)
+            self._mean = mean
+        self._ticks += 1
+        if self._ticks % self.resync_every == 0:
+            values = np.fromiter(self._returns, dtype=float)
+            self._mean = float(values.mean())
+            self._m2 = float(((values - self._mean) ** 2).sum())
+
+    def update_raw(self, price: float, quantity: float):
+        # Unnormalized feature vector for one tick (FEATURE_COLUMNS order).
+        last = self._last_price
+        self._last_price = price
+        if last is None:
+            log_return, change = 0.0, 0.0
+        else:
+            log_return = math.log(price / last)
+            change = price - last
+        self._push_return(log_return)
+        if len(self._returns) < self.window:
+            volatility = 0.0
+        else:
+            volatility = math.sqrt(max(self._m2, 0.0) / (self.window - 1)) if self.window > 1 else 0.0
+        pressure = quantity if change > 0 else -quantity
+        return np.array([price, quantity, log_return, volatility, pressure, change])
+
+    def update(self, price: float, quantity: float):
+        # Normalized feature vector for one tick, scaled with the frozen training parameters.
+        return (self.update_raw(price, quantity) - self._min) * self._scale
+
+    def update_tick(self, tick: dict):
+        return self.update(tick["price"], tick.get("quantity", tick.get("volume", 0.0)))
+
+
+def stream_parity(fe: FeatureEngineer, df: pd.DataFrame) -> dict:
+    # Max absolute difference per feature between build_features and the online engine
+    # fed the same ticks one by one.
+    batch = fe.build_features(df)[FEATURE_COLUMNS].to_numpy()
+    online = fe.online()
+    quantity = df["quantity"] if "quantity" in df.columns else df["volume"]
+    stream = np.array([online.update(p, q) for p, q in zip(df["price"].tolist(), quantity.tolist())])
+    return dict(zip(FEATURE_COLUMNS, np.abs(batch - stream).max(axis=0).tolist()))
+
+
 # Example Usage
 if __name__ == "__main__":
     # Load sample data
@@ -94,4 +270,17 @@ if __name__ == "__main__":
 
     X, y = fe.to_sequences(df_features, seq_len=3)
     print("X shape:", X.shape)
-    print("y shape:", y.shape)
\ No newline at end of file
+    print("y shape:", y.shape)
+
+    # Streaming parity on a longer random walk, with parameters frozen on the first half
+    rng = np.random.default_rng(0)
+    n = 20_000
+    ticks = pd.DataFrame({
+        "timestamp": np.arange(n),
+        "price": 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n))),
+        "quantity": rng.uniform(0.01, 2.0, n),
+    })
+    fe = FeatureEngineer(window=20).fit(ticks.iloc[: n // 2])
+    errors = stream_parity(fe, ticks)
+    print("Max abs error per feature:", errors)
+    assert max(errors.values()) < 1e-6, "online features diverge from build_features"
\ No newline at end of file
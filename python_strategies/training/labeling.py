@@ -0,0 +1,78 @@
+# Vectorised SELL / HOLD / BUY labeling shared by train_lstm and make_labels.
+# Forward returns are computed once for every horizon; thresholds come from a
+# target HOLD share (quantile of |return|) or from the balanced-threshold search,
+# and chunked input can be labeled without loading the full price series.
+
+import numpy as np
+
+SELL, HOLD, BUY = 0, 1, 2
+NO_LABEL = -1  # rows whose horizon runs past the end of the data
+
+
+def forward_returns(prices, horizons=(1,)) -> np.ndarray:
+    # (n, len(horizons)) relative returns r[i, k] = (p[i + h_k] - p[i]) / p[i]; NaN where i + h_k >= n.
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full((len(prices), len(horizons)), np.nan)
+    for k, h in enumerate(horizons):
+        if h < len(prices):
+            out[:len(prices) - h, k] = (prices[h:] - prices[:-h]) / prices[:-h]
+    return out
+
+
+def classify(returns, threshold) -> np.ndarray:
+    # BUY above threshold, SELL below -threshold, HOLD in between, NO_LABEL for NaN.
+    # threshold may be a scalar or one value per horizon (last axis).
+    returns = np.asarray(returns)
+    threshold = np.asarray(threshold)
+    labels = np.full(returns.shape, HOLD, dtype=np.int8)
+    labels[returns > threshold] = BUY
+    labels[returns < -threshold] = SELL
+    labels[np.isnan(returns)] = NO_LABEL
+    return labels
+
+
+def quantile_threshold(returns, hold_fraction: float = 1 / 3) -> np.ndarray:
+    # Threshold per horizon such that hold_fraction of the rows fall in the HOLD band.
+    returns = np.asarray(returns)
+    return np.nanquantile(np.abs(returns), hold_fraction, axis=0)
+
+
+def balanced_threshold(returns, start=0.00001, end=0.001, step=0.00001):
+    # Smallest threshold on the grid start, start + step, ... (< end) at which all three
+    # classes occur, or None. All classes are present exactly when
+    # min|r| <= th < min(max r, -min r), so the whole grid is checked at once.
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[~np.isnan(returns)]
+    if len(returns) == 0:
+        return None
+    grid = np.array([start + i * step for i in range(int((end - start) / step))])
+    ok = (np.abs(returns).min() <= grid) & (grid < returns.max()) & (-grid > returns.min())
+    hits = np.flatnonzero(ok)
+    return float(grid[hits[0]]) if len(hits) else None
+
+
+def label_prices(prices, horizons=(1,), threshold=None, hold_fraction: float | None = None):
+    # One-pass labels for several horizons: returns (labels (n, H) int8, thresholds (H,)).
+    returns = forward_returns(prices, horizons)
+    if threshold is None:
+        threshold = quantile_threshold(returns, 1 / 3 if hold_fraction is None else hold_fraction)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), (len(horizons),))
+    return classify(returns, threshold), threshold
+
+
+def label_chunks(price_chunks, horizons=(1,), threshold=0.00001):
+    # Stream labels over an iterable of price arrays (e.g. CSV chunks).
+    # Yields (n, H) label arrays in input order; concatenated they line up row for row
+    # with the concatenated prices. A row is emitted once max(horizons) later prices have
+    # been seen, so only the end of the stream gets NO_LABEL.
+    lag = max(horizons)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), (len(horizons),))
+    carry = np.empty(0)
+    for chunk in price_chunks:
+        prices = np.concatenate((carry, np.asarray(chunk, dtype=np.float64)))
+        labels = classify(forward_returns(prices, horizons), threshold)
+        ready = max(len(prices) - lag, 0)
+        yield labels[:ready]
+        carry = prices[ready:]
+    if len(carry):
+        yield classify(forward_returns(carry, horizons), threshold)
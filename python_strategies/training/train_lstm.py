@@ -4,8 +4,16 @@ import torch.nn as nn
 from torch.utils.data import DataLoader, Dataset
 from pathlib import Path
 from collections import Counter
-import sys
+import os, sys
+import time
 import random
+import numpy as np
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from data_feed.tick_store import load_frame
+from python_strategies.training.labeling import forward_returns, classify, balanced_threshold
 
 # Dataset
 class TickDataset(Dataset):
@@ -14,22 +22,16 @@ class TickDataset(Dataset):
         self.window = window_size
         self.threshold = threshold
         self.inject_hold = inject_hold
+        # Label of window idx: next-tick return after its last row (0 = SELL, 1 = HOLD, 2 = BUY)
+        self.returns = window_returns(df, window_size)
+        self.labels = classify(self.returns, threshold)
         
     def __len__(self):
         return len(self.data) - self.window
     
     def __getitem__(self, idx):
         x = self.data[idx : idx + self.window]
-        next_price = self.data[idx + self.window][0]
-        current_price = self.data[idx + self.window - 1][0]
-        delta = (next_price - current_price) / current_price
-        
-        if delta > self.threshold:
-            y = 2  # BUY
-        elif delta < -self.threshold:
-            y = 0  # SELL
-        else:
-            y = 1  # HOLD
+        y = int(self.labels[idx])
 
         # Optional synthetic HOLD injection for balance
         if self.inject_hold and random.random() < 0.1:
@@ -37,6 +39,58 @@ class TickDataset(Dataset):
 
         return (torch.tensor(x, dtype=torch.float32), torch.tensor(y, dtype=torch.long))
 
+# Batch-level dataset: each item is a whole (x, y) batch
+class TickBatchDataset(Dataset):
+    # Windows are strided views (Tensor.unfold) over one float32 tensor built once, so a
+    # batch costs one gather instead of batch_size numpy slices and tensor constructions.
+    # Use with DataLoader(dataset, batch_size=None, num_workers=...); call set_epoch()
+    # before each epoch to reshuffle.
+    def __init__(self, df, window_size=20, threshold=0.001, batch_size=32, shuffle=True,
+                 inject_hold=False, seed=0):
+        self.data = torch.tensor(df[["price", "volume"]].to_numpy(np.float32))
+        # Tensor storage moves to shared memory, so worker processes read it without copying
+        self.data.share_memory_()
+        self.window = window_size
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.inject_hold = inject_hold
+        self.seed = seed
+        n = max(len(self.data) - window_size, 0)
+        # (n, window, features) view: windows[i] == data[i : i + window]
+        if n:
+            self.windows = self.data.unfold(0, window_size, 1).transpose(1, 2)[:n]
+        else:
+            self.windows = self.data.new_empty((0, window_size, self.data.shape[1]))
+        self.labels = torch.from_numpy(classify(window_returns(df, window_size), threshold).astype(np.int64))
+        self.order = None
+        self.set_epoch(0)
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+        if self.shuffle:
+            gen = torch.Generator().manual_seed(self.seed + epoch)
+            self.order = torch.randperm(len(self.labels), generator=gen)
+
+    def num_samples(self):
+        return len(self.labels)
+
+    def __len__(self):
+        return -(-len(self.labels) // self.batch_size)
+
+    def __getitem__(self, b):
+        lo, hi = b * self.batch_size, min((b + 1) * self.batch_size, len(self.labels))
+        if self.order is None:
+            x, y = self.windows[lo:hi], self.labels[lo:hi]
+        else:
+            idx = self.order[lo:hi]
+            x, y = self.windows[idx], self.labels[idx]
+
+        # Optional synthetic HOLD injection for balance
+        if self.inject_hold:
+            gen = torch.Generator().manual_seed(self.seed + self.epoch * 1_000_003 + b)
+            y = torch.where(torch.rand(len(y), generator=gen) < 0.1, 1, y)
+        return x, y
+
 # LSTM Model
 class LSTMModel(nn.Module):
     def __init__(self, input_size=2, hidden_size=64, num_layers=2, output_size=3):
@@ -54,29 +108,31 @@ class LSTMModel(nn.Module):
         out = self.fc(hn[-1])
         return out
 
+def window_returns(df, window_size=20):
+    # Next-tick return after the last row of every window (one per TickDataset item).
+    return forward_returns(df["price"].values, (1,))[window_size - 1:-1, 0]
+
 # Auto-balance threshold finder
 def find_balanced_threshold(df, window_size=20, start=0.00001, end=0.001, step=0.00001):
-    for th in [start + i*step for i in range(int((end-start)/step))]:
-        dataset = TickDataset(df, window_size=window_size, threshold=th)
-        labels = [dataset[i][1].item() for i in range(len(dataset))]
-        dist = Counter(labels)
-        if len(dist) == 3:  # all classes present
-            print(f"[INFO] Balanced threshold found: {th}, distribution={dist}")
-            return th
+    returns = window_returns(df, window_size)
+    th = balanced_threshold(returns, start, end, step)
+    if th is not None:  # all classes present
+        dist = Counter(classify(returns, th).tolist())
+        print(f"[INFO] Balanced threshold found: {th}, distribution={dist}")
+        return th
     print("[WARN] No balanced threshold found, falling back to synthetic HOLD injection")
     return start
 
 # Training Function
-def train_model(csv_path, model_path):
-    df = pd.read_csv(csv_path)
+def train_model(csv_path, model_path, batch_size=32, num_epochs=50, num_workers=0):
+    df = load_frame(csv_path)
 
     # Try to auto-balance threshold
     threshold = find_balanced_threshold(df, window_size=20)
-    dataset = TickDataset(df, window_size=20, threshold=threshold, inject_hold=True)
-    loader = DataLoader(dataset, batch_size=32, shuffle=True)
+    dataset = TickBatchDataset(df, window_size=20, threshold=threshold, batch_size=batch_size, inject_hold=True)
+    loader = DataLoader(dataset, batch_size=None, shuffle=False, num_workers=num_workers)
 
-    labels = [dataset[i][1].item() for i in range(len(dataset))]
-    print("[INFO] Final Label Distribution:", Counter(labels))
+    print("[INFO] Final Label Distribution:", Counter(dataset.labels.tolist()))
 
     model = LSTMModel()
     optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
@@ -84,9 +140,10 @@ def train_model(csv_path, model_path):
 
     print("[INFO] Starting LSTM training...")
 
-    num_epochs = 50
     for epoch in range(num_epochs):
+        dataset.set_epoch(epoch)
         total_loss = 0.0
+        started = time.perf_counter()
         for x, y in loader:
             optimizer.zero_grad()
             output = model(x)
@@ -94,7 +151,8 @@ def train_model(csv_path, model_path):
             loss.backward()
             optimizer.step()
             total_loss += loss.item()
-        print(f"[EPOCH {epoch+1}/{num_epochs}], Loss: {total_loss/len(loader): .4f}")
+        rate = dataset.num_samples() / (time.perf_counter() - started)
+        print(f"[EPOCH {epoch+1}/{num_epochs}], Loss: {total_loss/len(loader): .4f}, {rate:,.0f} samples/sec")
 
     torch.save(model.state_dict(), model_path)
     print(f"[INFO] Model saved to {model_path}")
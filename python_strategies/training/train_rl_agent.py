@@ -4,11 +4,18 @@
 import random
 import numpy as np
 import pandas as pd
-from collections import deque
+import time
 from pathlib import Path
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import os, sys
+
+# Ensure project root is in path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from data_feed.tick_store import load_frame
+from python_strategies.training.vec_env import VecTradingEnv
 
 # Q-Network
 class QNetwork(nn.Module):
@@ -27,30 +34,118 @@ class QNetwork(nn.Module):
     def forward(self, x):
         return self.net(x)
     
+# Sum tree over priorities (array-backed, vectorised updates and sampling)
+class SumTree:
+    def __init__(self, capacity):
+        self.leaves = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.leaves.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)  # node k has children 2k, 2k+1; root = 1
+        
+    def total(self):
+        return self.tree[1]
+    
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices) + self.leaves
+        self.tree[nodes] = priorities
+        # Recompute the affected parents one level at a time (duplicate parents just
+        # get the same sum written twice)
+        for _ in range(self.depth):
+            nodes = nodes >> 1
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            
+    def find(self, values):
+        # Leaf index for each cumulative priority value (descends all values together).
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            right = values > self.tree[left]
+            values -= np.where(right, self.tree[left], 0.0)
+            nodes = left + right
+        return nodes - self.leaves
+    
 # Replay Buffer
 class ReplayBuffer:
-    def __init__(self, capacity=50000):
-        self.buffer = deque(maxlen=capacity)
+    # Preallocated ring buffer of transitions. With prioritized=True, sampling follows
+    # proportional prioritized replay (priority^alpha, importance weights with beta).
+    def __init__(self, capacity=50000, state_dim=2, prioritized=False, alpha=0.6, beta=0.4, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.pos = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.tree = SumTree(capacity) if prioritized else None
+        self.max_priority = 1.0
         
     def push(self, state, action, reward, next_state):
-        self.buffer.append((state, action, reward, next_state))
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        if self.tree is not None:
+            # New transitions get the current max priority so they are replayed at least once
+            self.tree.update([i], [self.max_priority])
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        
+    def push_batch(self, states, actions, rewards, next_states):
+        # Append many transitions at once (e.g. one step of a vectorised environment).
+        n = len(actions)
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        if self.tree is not None:
+            self.tree.update(idx, np.full(n, self.max_priority))
+        self.pos = int((self.pos + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
         
     def sample(self, batch_size):
-        batch = random.sample(self.buffer, batch_size)
-        states, actions, rewards, next_states = zip(*batch)
-        return (
-            torch.from_numpy(np.array(states, dtype=np.float32)),
-            torch.tensor(actions, dtype=torch.long),
-            torch.tensor(rewards, dtype=torch.float32),
-            torch.from_numpy(np.array(next_states, dtype=np.float32))
+        # Uniform: (states, actions, rewards, next_states).
+        # Prioritized: the same plus (indices, importance weights) for update_priorities().
+        if self.tree is None:
+            idx = self.rng.integers(0, self.size, batch_size)
+        else:
+            # Stratified: one draw from each of batch_size equal slices of the total priority
+            total = self.tree.total()
+            values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+            idx = np.minimum(self.tree.find(values), self.size - 1)
+        batch = (
+            torch.from_numpy(self.states[idx]),
+            torch.from_numpy(self.actions[idx]),
+            torch.from_numpy(self.rewards[idx]),
+            torch.from_numpy(self.next_states[idx])
         )
+        if self.tree is None:
+            return batch
+        probs = self.tree.tree[idx + self.tree.leaves] / self.tree.total()
+        weights = (self.size * probs) ** -self.beta
+        return batch + (idx, torch.from_numpy((weights / weights.max()).astype(np.float32)))
+    
+    def update_priorities(self, indices, td_errors, eps=1e-6):
+        priorities = (np.abs(td_errors) + eps) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
     
     def __len__(self):
-        return len(self.buffer)
+        return self.size
     
 # RL Trainer
 class RLTrainer:
-    def __init__(self):
+    def __init__(self, prioritized=False, seed=None):
+        # :param seed: Seeds network init, exploration and replay sampling for reproducible runs.
+        if seed is not None:
+            torch.manual_seed(seed)
+            random.seed(seed)
+        self.rng = np.random.default_rng(seed)
         self.gamma = 0.99
         self.lr = 0.0005
         self.batch_size = 16
@@ -62,7 +157,7 @@ class RLTrainer:
         self.target_model.load_state_dict(self.model.state_dict())
         self.optimizer = optim.Adam(self.model.parameters(), lr=self.lr)
         self.loss_fn = nn.MSELoss()
-        self.buffer = ReplayBuffer()
+        self.buffer = ReplayBuffer(prioritized=prioritized, seed=seed)
         self.model_path = Path(__file__).resolve().parent.parent / "models" / "rl_agent.pt"
     
     def choose_action(self, state):
@@ -73,6 +168,13 @@ class RLTrainer:
             q_values = self.model(torch.tensor(state, dtype=torch.float32))
             return torch.argmax(q_values).item()
     
+    def choose_actions(self, states):
+        # Batched epsilon-greedy: one forward pass for all K environments.
+        with torch.no_grad():
+            greedy = self.model(torch.from_numpy(states)).argmax(dim=1).numpy()
+        explore = self.rng.random(len(states)) < self.epsilon
+        return np.where(explore, self.rng.integers(0, 3, len(states)), greedy)
+    
     def compute_reward(self, current_price, next_price, action):
         # Reward based on price movement.
         if action == 0: # BUY
@@ -87,16 +189,25 @@ class RLTrainer:
         if len(self.buffer) < self.batch_size:
             return None
         
-        states, actions, rewards, next_states = self.buffer.sample(self.batch_size)
+        batch = self.buffer.sample(self.batch_size)
+        states, actions, rewards, next_states = batch[:4]
         
         q_values = self.model(states)
-        next_q_values = self.target_model(next_states)
+        with torch.no_grad():
+            next_q_values = self.target_model(next_states)
         
-        q_target = q_values.clone()
-        for i in range(self.batch_size):
-            q_target[i, actions[i]] = rewards[i] + self.gamma * torch.max(next_q_values[i])
+        # Bellman target for the taken actions, all samples at once
+        q_target = q_values.detach().clone()
+        rows = torch.arange(len(actions))
+        q_target[rows, actions] = rewards + self.gamma * next_q_values.max(dim=1).values
         
-        loss = self.loss_fn(q_values, q_target.detach())
+        if self.buffer.prioritized:
+            indices, weights = batch[4:]
+            per_sample = ((q_values - q_target) ** 2).mean(dim=1)
+            loss = (per_sample * weights).mean()
+            self.buffer.update_priorities(indices, (q_target[rows, actions] - q_values[rows, actions]).detach().numpy())
+        else:
+            loss = self.loss_fn(q_values, q_target)
         
         self.optimizer.zero_grad()
         loss.backward()
@@ -142,11 +253,44 @@ class RLTrainer:
         
         torch.save(self.model.state_dict(), self.model_path)
         print(f"[INFO] RL agent saved to {self.model_path}")
+    
+    def train_vectorized(self, env: VecTradingEnv, steps, updates_per_step=1, target_every=200, log_every=100, save=True):
+        # Train on K environments in lockstep: each step adds K transitions with one
+        # forward pass and runs updates_per_step gradient steps.
+        print(f"[INFO] Starting vectorised RL training ({env.num_envs} envs)... ")
+        states = env.reset()
+        started = time.perf_counter()
+        loss = None
+        for i in range(steps):
+            actions = self.choose_actions(states)
+            next_states, rewards, _ = env.step(actions)
+            self.buffer.push_batch(states, actions, rewards, next_states)
+            for _ in range(updates_per_step):
+                loss = self.train_step()
+            states = env.states()
+            
+            if log_every and i % log_every == 0:
+                print(f"[STEP {i}] epsilon = {self.epsilon: 0.3f}, mean_reward = {rewards.mean(): 0.4f}, buffer_size = {len(self.buffer)}, loss = {loss}")
+            
+            # Update taget network periodically
+            if i % target_every == 0:
+                self.update_target_network()
+                
+            # Epsilon decay
+            if self.epsilon > self.epsilon_min:
+                self.epsilon *= self.epsilon_decay
+        
+        elapsed = time.perf_counter() - started
+        print(f"[INFO] {steps * env.num_envs:,} transitions in {elapsed:.2f}s ({steps * env.num_envs / elapsed:,.0f} ticks/sec)")
+        if save:
+            torch.save(self.model.state_dict(), self.model_path)
+            print(f"[INFO] RL agent saved to {self.model_path}")
+        return loss
 
 # Main
 if __name__ == "__main__":
     data_path = Path(__file__).resolve().parents[2] / "data_feed" / "raw_Data" / "btc_usdt.csv"
-    df = pd.read_csv(data_path)
+    df = load_frame(data_path)
     
     trainer = RLTrainer()
     trainer.train(df)
\ No newline at end of file
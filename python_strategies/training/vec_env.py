@@ -0,0 +1,73 @@
+# Vectorised trading environment for DQN training.
+# Steps K independent walks over the tick history in lockstep: either K contiguous
+# slices of one price series or one series per symbol. States, actions and rewards
+# are (K, ...) arrays, so one network forward and one replay push cover K ticks.
+
+import numpy as np
+
+BUY, SELL, HOLD = 0, 1, 2  # RLTrainer action convention
+
+
+def trading_rewards(current_prices, next_prices, actions):
+    # Vectorised RLTrainer.compute_reward: +move for BUY, -move for SELL, 0 for HOLD, clipped to [-1, 1].
+    move = np.asarray(next_prices) - np.asarray(current_prices)
+    sign = np.select([actions == BUY, actions == SELL], [1.0, -1.0], 0.0)
+    return np.clip(sign * move, -1.0, 1.0).astype(np.float32)
+
+
+class VecTradingEnv:
+    def __init__(self, prices, volumes, num_envs: int | None = None, random_start: bool = False, seed: int | None = None):
+        # :param prices, volumes: One 1-D series (split into num_envs contiguous slices) or
+        #                         a list of series, one env per series (e.g. per symbol).
+        # :param random_start: Start each episode at a random offset inside its slice.
+        # :param seed: Seeds the start offsets; same seed -> same trajectory.
+        if isinstance(prices, (list, tuple)):
+            series_p = [np.asarray(p, dtype=np.float64) for p in prices]
+            series_v = [np.asarray(v, dtype=np.float64) for v in volumes]
+        else:
+            num_envs = num_envs or 1
+            bounds = np.linspace(0, len(prices), num_envs + 1).astype(np.int64)
+            series_p = [np.asarray(prices[a:b], dtype=np.float64) for a, b in zip(bounds[:-1], bounds[1:])]
+            series_v = [np.asarray(volumes[a:b], dtype=np.float64) for a, b in zip(bounds[:-1], bounds[1:])]
+        if min(len(p) for p in series_p) < 2:
+            raise ValueError("Every environment needs at least two ticks")
+
+        # One flat copy of all series; env k walks [start[k], end[k])
+        lengths = np.array([len(p) for p in series_p])
+        self.start = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self.end = self.start + lengths
+        self.prices = np.concatenate(series_p)
+        self.volumes = np.concatenate(series_v)
+        self.num_envs = len(series_p)
+        self.random_start = random_start
+        self.rng = np.random.default_rng(seed)
+        self.pos = self.start.copy()
+        self.episodes = np.zeros(self.num_envs, dtype=np.int64)
+
+    def _starts(self, envs):
+        if not self.random_start:
+            return self.start[envs]
+        # Leave at least one step in the episode
+        return self.start[envs] + self.rng.integers(0, self.end[envs] - self.start[envs] - 1)
+
+    def states(self) -> np.ndarray:
+        # (K, 2) float32 [price, volume] at each env's current tick.
+        return np.stack((self.prices[self.pos], self.volumes[self.pos]), axis=1).astype(np.float32)
+
+    def reset(self) -> np.ndarray:
+        self.pos = self._starts(np.arange(self.num_envs))
+        return self.states()
+
+    def step(self, actions):
+        # Apply one action per env. Returns (next_states, rewards, dones); envs that reached
+        # the end of their slice are reset, so states() is ready for the next step.
+        actions = np.asarray(actions)
+        rewards = trading_rewards(self.prices[self.pos], self.prices[self.pos + 1], actions)
+        self.pos = self.pos + 1
+        next_states = self.states()
+        dones = self.pos + 1 >= self.end
+        if dones.any():
+            envs = np.flatnonzero(dones)
+            self.pos[envs] = self._starts(envs)
+            self.episodes[envs] += 1
+        return next_states, rewards, dones
@@ -0,0 +1,275 @@
+# Walk-forward training orchestrator.
+# Rolls train/test windows over a symbol in the tick store, crosses them with a
+# parameter grid, and runs each (split, params) train+evaluate job in a process pool.
+# Every finished job is checkpointed to <out_dir>/jobs/<job_id>.json, so rerunning the
+# same sweep skips completed jobs; summary.csv collects all results.
+#
+# Usage:
+#   sweep = WalkForward("lstm", symbol="BTCUSDT", train="4h", test="1h", step="1h",
+#                       grid={"hidden_size": [32, 64], "epochs": [5]})
+#   summary = sweep.run("python_strategies/models/walk_forward/lstm")
+
+import hashlib
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import torch
+
+from data_feed.tick_store import TickStore, DEFAULT_STORE_ROOT
+
+# Defaults per model kind; grid values override them
+DEFAULT_PARAMS = {
+    "lstm": {"window": 20, "hidden_size": 64, "num_layers": 2, "lr": 0.001, "epochs": 10, "batch_size": 256,
+             "threshold": None, "seed": 0},
+    "rl": {"envs": 16, "steps": 2000, "lr": 0.0005, "batch_size": 64, "prioritized": False, "seed": 0},
+}
+
+
+def walk_forward_splits(timestamps_ns, train, test, step=None, anchored=False):
+    # [{fold, train_start, train_end, test_start, test_end}] (ns) covering the data range.
+    # :param train, test, step: Window lengths (pandas offsets like "4h" or ns); step defaults to test.
+    # :param anchored: Expanding train window starting at the first tick instead of a rolling one.
+    to_ns = lambda v: v if isinstance(v, (int, np.integer)) else pd.Timedelta(v).value
+    train, test = to_ns(train), to_ns(test)
+    step = test if step is None else to_ns(step)
+    first, last = int(timestamps_ns[0]), int(timestamps_ns[-1])
+    splits = []
+    start = first
+    while start + train < last:
+        train_end = start + train
+        splits.append({
+            "fold": len(splits),
+            "train_start": first if anchored else start,
+            "train_end": train_end,
+            "test_start": train_end,
+            "test_end": min(train_end + test, last + 1),
+        })
+        start += step
+    return splits
+
+
+def param_grid(grid: dict):
+    # Cartesian product of {name: [values]} -> list of {name: value}.
+    if not grid:
+        return [{}]
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def job_id(job: dict) -> str:
+    return hashlib.blake2b(json.dumps(job, sort_keys=True, default=str).encode(), digest_size=8).hexdigest()
+
+
+def score_positions(positions, returns) -> dict:
+    # Metrics of holding position (+1 long, -1 short, 0 flat) over each next-tick return.
+    pnl = positions * returns
+    traded = positions != 0
+    std = pnl.std() if len(pnl) > 1 else 0.0
+    return {
+        "pnl": float(pnl.sum()),
+        "sharpe": float(pnl.mean() / std) if std > 0 else None,
+        "win_rate": float((pnl[traded] > 0).mean()) if traded.any() else 0.0,
+        "trades": int(traded.sum()),
+    }
+
+
+def train_eval_lstm(train_df, test_df, params, model_path):
+    from torch.utils.data import DataLoader
+    from python_strategies.training.train_lstm import LSTMModel, TickBatchDataset, find_balanced_threshold, window_returns
+    from python_strategies.training.labeling import classify
+
+    torch.manual_seed(params["seed"])
+    window = params["window"]
+    threshold = params["threshold"] or find_balanced_threshold(train_df, window_size=window)
+    dataset = TickBatchDataset(train_df, window_size=window, threshold=threshold,
+                               batch_size=params["batch_size"], seed=params["seed"])
+    model = LSTMModel(hidden_size=params["hidden_size"], num_layers=params["num_layers"])
+    optimizer = torch.optim.Adam(model.parameters(), lr=params["lr"])
+    loss_fn = torch.nn.CrossEntropyLoss(weight=torch.tensor([1.0, 0.5, 1.0]))
+    loss = None
+    for epoch in range(params["epochs"]):
+        dataset.set_epoch(epoch)
+        for x, y in DataLoader(dataset, batch_size=None):
+            optimizer.zero_grad()
+            loss = loss_fn(model(x), y)
+            loss.backward()
+            optimizer.step()
+    torch.save(model.state_dict(), model_path)
+
+    # Out-of-sample: predicted class per test window, traded on the next tick
+    test_set = TickBatchDataset(test_df, window_size=window, threshold=threshold, batch_size=4096, shuffle=False)
+    model.eval()
+    with torch.no_grad():
+        preds = np.concatenate([model(x).argmax(dim=1).numpy() for x, _ in DataLoader(test_set, batch_size=None)]) \
+            if len(test_set.labels) else np.empty(0, dtype=np.int64)
+    returns = window_returns(test_df, window)
+    positions = np.select([preds == 2, preds == 0], [1.0, -1.0], 0.0)
+    metrics = score_positions(positions, returns)
+    metrics["accuracy"] = float((preds == classify(returns, threshold)).mean()) if len(preds) else None
+    metrics["train_loss"] = None if loss is None else float(loss.item())
+    metrics["threshold"] = threshold
+    return metrics
+
+
+def train_eval_rl(train_df, test_df, params, model_path):
+    from python_strategies.training.train_rl_agent import RLTrainer
+    from python_strategies.training.vec_env import VecTradingEnv
+
+    trainer = RLTrainer(prioritized=params["prioritized"], seed=params["seed"])
+    trainer.batch_size = params["batch_size"]
+    for group in trainer.optimizer.param_groups:
+        group["lr"] = params["lr"]
+    trainer.model_path = model_path
+    env = VecTradingEnv(train_df["price"].values, train_df["volume"].values, params["envs"],
+                        random_start=True, seed=params["seed"])
+    loss = trainer.train_vectorized(env, params["steps"], log_every=0)
+
+    # Out-of-sample: greedy action on each test tick (0 = BUY, 1 = SELL, 2 = HOLD)
+    prices = test_df["price"].to_numpy()
+    states = torch.tensor(test_df[["price", "volume"]].to_numpy(np.float32)[:-1])
+    with torch.no_grad():
+        actions = trainer.model(states).argmax(dim=1).numpy()
+    returns = (prices[1:] - prices[:-1]) / prices[:-1]
+    positions = np.select([actions == 0, actions == 1], [1.0, -1.0], 0.0)
+    metrics = score_positions(positions, returns)
+    metrics["train_loss"] = loss
+    return metrics
+
+
+TRAINERS = {"lstm": train_eval_lstm, "rl": train_eval_rl}
+
+
+def _init_worker(torch_threads):
+    # Keep each worker's intra-op pool small so jobs don't oversubscribe the cores
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed if the parent used torch before forking
+        pass
+
+
+def _run_job(job, store_root, out_dir):
+    started = time.perf_counter()
+    store = TickStore(store_root)
+    split = job["split"]
+    result = {"job_id": job["id"], **job}
+    try:
+        train_df = store.to_frame(job["symbol"], split["train_start"], split["train_end"])
+        test_df = store.to_frame(job["symbol"], split["test_start"], split["test_end"])
+        model_path = Path(out_dir) / "models" / f"{job['id']}.pt"
+        metrics = TRAINERS[job["model"]](train_df, test_df, job["params"], model_path)
+        result.update(status="ok", metrics=metrics, train_ticks=len(train_df), test_ticks=len(test_df),
+                      model_path=str(model_path))
+    except Exception as exc:
+        result.update(status="error", error=f"{type(exc).__name__}: {exc}", traceback=traceback.format_exc())
+    result["seconds"] = time.perf_counter() - started
+
+    # Atomic checkpoint: a crash mid-write never leaves a half-written result
+    path = Path(out_dir) / "jobs" / f"{job['id']}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(result, indent=2, default=str))
+    os.replace(tmp, path)
+    return result
+
+
+class WalkForward:
+    def __init__(self, model: str, symbol: str, train, test, step=None, grid=None, anchored=False,
+                 start=None, end=None, store: TickStore | None = None,
+                 workers: int | None = None, torch_threads: int = 1):
+        # :param model: "lstm" or "rl".
+        # :param grid: {param: [values]} swept on top of DEFAULT_PARAMS[model].
+        # :param workers: Pool size (default: cores // torch_threads).
+        # :param torch_threads: torch intra-op threads per worker.
+        if model not in TRAINERS:
+            raise ValueError(f"Unknown model kind: {model}")
+        self.model = model
+        self.symbol = symbol.upper()
+        self.store = store or TickStore(DEFAULT_STORE_ROOT)
+        self.grid = grid or {}
+        self.torch_threads = torch_threads
+        self.workers = workers or max(1, (os.cpu_count() or 1) // torch_threads)
+        timestamps = self.store.read(self.symbol, start, end)["timestamp"]
+        if len(timestamps) == 0:
+            raise ValueError(f"No ticks for {self.symbol} in the tick store")
+        self.splits = walk_forward_splits(timestamps, train, test, step, anchored)
+
+    def jobs(self):
+        jobs = []
+        for params in param_grid(self.grid):
+            for split in self.splits:
+                job = {"model": self.model, "symbol": self.symbol, "split": split,
+                       "params": {**DEFAULT_PARAMS[self.model], **params}}
+                jobs.append({"id": job_id(job), **job})
+        return jobs
+
+    def run(self, out_dir) -> pd.DataFrame:
+        out_dir = Path(out_dir)
+        (out_dir / "jobs").mkdir(parents=True, exist_ok=True)
+        (out_dir / "models").mkdir(parents=True, exist_ok=True)
+
+        jobs = self.jobs()
+        results = {}
+        for job in jobs:
+            path = out_dir / "jobs" / f"{job['id']}.json"
+            if path.exists():
+                result = json.loads(path.read_text())
+                if result.get("status") == "ok":
+                    results[job["id"]] = result
+        pending = [job for job in jobs if job["id"] not in results]
+        print(f"[INFO] Walk-forward {self.model}: {len(jobs)} jobs ({len(self.splits)} splits x "
+              f"{len(param_grid(self.grid))} param sets), {len(results)} already done, {len(pending)} to run "
+              f"on {self.workers} workers")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.torch_threads,)) as pool:
+                futures = [pool.submit(_run_job, job, self.store.root, out_dir) for job in pending]
+                for done, future in enumerate(as_completed(futures), 1):
+                    result = future.result()
+                    results[result["job_id"]] = result
+                    status = result["status"] if result["status"] != "ok" else f"pnl={result['metrics']['pnl']:.5f}"
+                    print(f"[JOB {done}/{len(pending)}] {result['job_id']} fold={result['split']['fold']} "
+                          f"params={result['params']} {status} ({result['seconds']:.1f}s)")
+
+        summary = self.summarize([results[job["id"]] for job in jobs if job["id"] in results])
+        summary.to_csv(out_dir / "summary.csv", index=False)
+        print(f"[INFO] Summary written to {out_dir / 'summary.csv'}")
+        return summary
+
+    def summarize(self, results) -> pd.DataFrame:
+        # One row per job: swept params, fold, test window and metrics.
+        rows = []
+        for r in results:
+            row = {"job_id": r["job_id"], "fold": r["split"]["fold"],
+                   "test_start": pd.Timestamp(r["split"]["test_start"]), "status": r["status"]}
+            row.update({k: r["params"][k] for k in sorted(self.grid)})
+            row.update(r.get("metrics", {}))
+            rows.append(row)
+        summary = pd.DataFrame(rows)
+        if self.grid and "pnl" in summary:
+            by_params = summary.groupby(sorted(self.grid))[["pnl", "sharpe", "win_rate"]].mean()
+            print("[INFO] Mean out-of-sample metrics per parameter set:")
+            print(by_params.sort_values("pnl", ascending=False).to_string())
+        return summary
+
+
+# Example Usage
+if __name__ == "__main__":
+    TickStore(DEFAULT_STORE_ROOT).ensure_csv("data_feed/raw_data/btc_usdt.csv")
+    out = Path(__file__).resolve().parent.parent / "models" / "walk_forward"
+
+    sweep = WalkForward("lstm", "BTCUSDT", train="25s", test="10s", step="10s",
+                        grid={"hidden_size": [16, 32], "epochs": [3], "window": [5]})
+    print(sweep.run(out / "lstm").to_string())
+
+    sweep = WalkForward("rl", "BTCUSDT", train="25s", test="10s", step="10s",
+                        grid={"envs": [4, 8], "steps": [50]})
+    print(sweep.run(out / "rl").to_string())
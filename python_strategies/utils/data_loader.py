@@ -3,6 +3,8 @@
 
 import pandas as pd
 from pathlib import Path
+from data_feed.tick_store import load_frame, to_ns
+from data_feed.bars import build_bars
 
 class DataLoader:
     def __init__(self, required_columns=None):
@@ -12,13 +14,15 @@ class DataLoader:
         
         self.required_columns = required_columns
     
-    def load_csv(self, path: str | Path) -> pd.DataFrame:
+    def load_csv(self, path: str | Path, symbol: str | None = None, start=None, end=None) -> pd.DataFrame:
         # Load a CSV file and validate required columns.
+        # Tick CSVs are read through the columnar tick store (parsed once, memory-mapped after),
+        # optionally restricted to one symbol and a [start, end) time range.
         path = Path(path)
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {path}")
         
-        df = pd.read_csv(path)
+        df = load_frame(path, symbol=symbol, start=start, end=end)
         
         # Validate columns
         for col in self.required_columns:
@@ -31,12 +35,21 @@ class DataLoader:
         
         return df
     
-    def downsample(self, df: pd.Dataframe, step: int = 1) -> pd.DataFrame:
+    def downsample(self, df: pd.DataFrame, step: int = 1) -> pd.DataFrame:
         # Downsample tick data (e.g., take every Nth row).
         if step <= 1:
             return df
         return df.iloc[::step].reset_index(drop=True)
     
+    def to_bars(self, df: pd.DataFrame, kind: str = "time", threshold=1_000_000_000) -> pd.DataFrame:
+        # Aggregate ticks into time/tick/volume/dollar bars (see data_feed.bars).
+        # The bar close is exposed as "price" and its end time as "timestamp", so bars
+        # can be fed anywhere ticks are.
+        bars = build_bars(to_ns(df["timestamp"]), df["price"].to_numpy(), df["volume"].to_numpy(), kind, threshold)
+        bars["timestamp"] = pd.to_datetime(bars["end_ts"])
+        bars["price"] = bars["close"]
+        return bars
+    
     def normalize(self, df: pd.DataFrame, columns=None) -> pd.DataFrame:
         # Min-Max noramlize selected columns.
         if columns is None:
@@ -0,0 +1,168 @@
+# Content-addressed on-disk cache for engineered features.
+# Entries are keyed on a hash of the input frame's contents plus the engineer's
+# config()/version, so any process computing the same features from the same data
+# reuses one copy. Columns are stored as .npy files and loaded memory-mapped.
+# Frames returned by the cache are always backed by those read-only memory maps, on a
+# hit and on a miss alike, so callers see the same behaviour either way; assigning a
+# column (df[col] = ...) is fine, writing into the arrays in place is not.
+#
+# Layout:
+#   <root>/<key>/meta.json       columns, row count, config; its mtime is the LRU clock
+#   <root>/<key>/<n>.npy         one array per column
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "feature_cache"
+META = "meta.json"
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    # Hash of column names, dtypes and values (row order matters, index does not).
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def cache_key(df: pd.DataFrame, config: dict) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(frame_digest(df).encode())
+    h.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    values = np.array(values)
+    values.setflags(write=False)
+    return values
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class FeatureCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes: int = 2 * 1024 ** 3):
+        # :param max_bytes: Total size bound; least recently used entries are evicted past it.
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "bytes_written": 0}
+
+    def _entry(self, key):
+        return self.root / key
+
+    def load(self, key: str) -> pd.DataFrame | None:
+        entry = self._entry(key)
+        try:
+            meta = json.loads((entry / META).read_text())
+            columns = {name: np.load(entry / f"{i}.npy", mmap_mode="r") for i, name in enumerate(meta["columns"])}
+            # Touch meta.json: it is the LRU clock shared by every process using the cache
+            os.utime(entry / META)
+        except (FileNotFoundError, ValueError):
+            # Missing, partial, or evicted by another process while we were reading it
+            return None
+        return pd.DataFrame(columns, copy=False)
+
+    def store(self, key: str, df: pd.DataFrame, config: dict | None = None):
+        # Write to a staging directory, then rename into place, so readers never see a
+        # partial entry and concurrent writers of the same key are harmless.
+        tmp = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+        try:
+            for i, name in enumerate(df.columns):
+                values = df[name].to_numpy()
+                if values.dtype == object:
+                    values = values.astype(str)
+                np.save(tmp / f"{i}.npy", values, allow_pickle=False)
+            meta = {"columns": [str(c) for c in df.columns], "rows": len(df), "config": config}
+            (tmp / META).write_text(json.dumps(meta, default=str))
+            size = _dir_size(tmp)
+            try:
+                os.rename(tmp, self._entry(key))
+            except OSError:
+                # Another process stored the same key first
+                return
+            self.stats["writes"] += 1
+            self.stats["bytes_written"] += size
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def get_or_compute(self, key: str, compute, config: dict | None = None) -> pd.DataFrame:
+        df = self.load(key)
+        if df is not None:
+            self.stats["hits"] += 1
+            return df
+        self.stats["misses"] += 1
+        df = compute()
+        self.store(key, df, config)
+        cached = self.load(key)
+        if cached is None:
+            # Evicted straight away (entry larger than max_bytes): hand back the same kind of frame
+            cached = pd.DataFrame({name: _read_only(df[name].to_numpy()) for name in df.columns}, copy=False)
+        return cached
+
+    def features(self, engineer, df: pd.DataFrame) -> pd.DataFrame:
+        # engineer.build_features(df), reused whenever the data and engineer config match.
+        config = engineer.config()
+        return self.get_or_compute(cache_key(df, config), lambda: engineer.build_features(df), config)
+
+    def entries(self):
+        # (key, size in bytes, last used) for every complete entry, oldest first.
+        out = []
+        for entry in self.root.iterdir():
+            if entry.is_dir() and not entry.name.startswith(".") and (entry / META).exists():
+                out.append((entry.name, _dir_size(entry), (entry / META).stat().st_mtime))
+        return sorted(out, key=lambda e: e[2])
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits in max_bytes.
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        entries = self.entries()
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+        }
+
+
+# Example Usage
+if __name__ == "__main__":
+    import time
+    from python_strategies.training.feature_engineering import FeatureEngineer
+    from python_strategies.utils.data_loader import DataLoader
+
+    df = DataLoader().load_csv("data_feed/raw_data/btc_usdt.csv")
+    cache = FeatureCache()
+    fe = FeatureEngineer(window=5)
+    for attempt in range(2):
+        t0 = time.perf_counter()
+        features = cache.features(fe, df)
+        print(f"[INFO] Attempt {attempt + 1}: {len(features)} rows in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+    print("[INFO] Cache report:", cache.report())
@@ -0,0 +1,52 @@
+import json
+import threading
+
+from data_feed.live_data_loader import LiveDataLoader
+
+
+def _frame(i, symbol="BTCUSDT"):
+    return json.dumps({"stream": f"{symbol.lower()}@trade",
+                       "data": {"s": symbol, "p": str(100 + i), "q": "0.5", "T": 1_700_000_000_000 + i}})
+
+
+def _feed(loader, frames, timeout=5.0):
+    # Push frames the way the websocket thread does; True if every put returned.
+    feeder = threading.Thread(target=lambda: [loader._on_message(None, f) for f in frames], daemon=True)
+    feeder.start()
+    feeder.join(timeout)
+    return not feeder.is_alive()
+
+
+def test_raising_callback_does_not_stall_pipeline():
+    loader = LiveDataLoader(symbols=["btcusdt"], raw_queue_size=16, dispatch_queue_size=16)
+    seen = []
+    done = threading.Event()
+
+    def flaky(tick):
+        if len(seen) == 0 or tick["price"] % 7 == 0:
+            seen.append(None)
+            raise RuntimeError("boom")
+        seen.append(tick["price"])
+        if tick["price"] == 299:
+            done.set()
+
+    loader.register_callback(flaky)
+    loader._start_pipeline()
+    assert _feed(loader, [_frame(i) for i in range(200)])
+    assert done.wait(5.0)
+    loader.stop()
+    assert loader.callback_errors == len([x for x in seen if x is None])
+    assert loader.metrics()["callback_errors"] > 1
+
+
+def test_non_dict_frames_are_counted_and_skipped():
+    loader = LiveDataLoader(symbols=["btcusdt"])
+    ticks = []
+    done = threading.Event()
+    loader.register_callback(lambda tick: (ticks.append(tick), done.set()))
+    loader._start_pipeline()
+    assert _feed(loader, ["[1, 2]", '"text"', '{"data": 5}', "not json", _frame(1)])
+    assert done.wait(5.0)
+    loader.stop()
+    assert loader.decode_errors == 4
+    assert [t["price"] for t in ticks] == [101.0]